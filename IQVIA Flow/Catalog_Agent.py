@@ -1,10 +1,28 @@
 import pandas as pd
 import os
-import spacy
 import re
+from concurrent.futures import ProcessPoolExecutor
+from entity_detection import EntityDetector
+from column_profiler import profile_file, catalog_dtype
+from inclusion_dependencies import InclusionDependencyFinder
+from candidate_keys import CandidateKeyMiner
+from catalog_manifest import CatalogManifest
+from file_sniffer import FileFormatManifest
+from typed_reader import catalog_column_types
+from column_similarity import SimilarColumnMatcher
 
-# Load pre-trained spaCy model for Named Entity Recognition (NER)
-nlp = spacy.load("en_core_web_sm")
+# Rows per chunk when streaming files through the column profiler
+profile_chunksize = 100_000
+
+# Batch size and worker processes for spaCy's nlp.pipe
+nlp_batch_size = 1000
+nlp_processes = max(1, (os.cpu_count() or 1) - 1)
+
+# Worker processes profiling files in parallel (1 runs every file in this process)
+catalog_workers = os.cpu_count() or 1
+
+# Load the spaCy model when each catalog worker starts rather than on first use
+preload_nlp_model = True
 
 # Path to the main directory containing subfolders
 main_folder_path = (
@@ -14,68 +32,51 @@ main_folder_path = (
 # Load the source mapping Excel file (update the file path accordingly)
 source_mapping_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Source Master Mapping/Source_master.xlsx"
 
-# Load the Excel file into a DataFrame
-source_mapping_df = pd.read_excel(source_mapping_file)
+# Metadata catalog written by this script
+schema_master_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Metadata/schemaMaster.csv"
+
+# Incremental mode: only new or changed files are profiled again, unchanged
+# files keep their catalog rows (and any manual edits made in Feed_Agnent.py)
+incremental_catalog = True
+catalog_manifest_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Metadata/catalog_manifest.json"
+profile_cache_dir = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Metadata/Profiles"
 
-# Debugging: print the first few rows of the source mapping to verify contents
-print("Source Mapping DataFrame:")
-print(source_mapping_df.head())
 
-# Dictionary to map Source Name to Source ID, Source Type, and File Type
-source_mapping = {
-    row["Source Name"]: {
-        "Source ID": row["Source Id"],
-        "Source Type": row["Source Type"],
-        "File Type": row["File Type"],
+# Build a dictionary mapping Source Name to Source ID, Source Type, and File Type
+def load_source_mapping(mapping_file):
+    # Load the Excel file into a DataFrame
+    source_mapping_df = pd.read_excel(mapping_file)
+
+    # Debugging: print the first few rows of the source mapping to verify contents
+    print("Source Mapping DataFrame:")
+    print(source_mapping_df.head())
+
+    source_mapping = {
+        row["Source Name"]: {
+            "Source ID": row["Source Id"],
+            "Source Type": row["Source Type"],
+            "File Type": row["File Type"],
+        }
+        for _, row in source_mapping_df.iterrows()
     }
-    for _, row in source_mapping_df.iterrows()
-}
 
-# Debugging: print the source mapping dictionary keys
-print("Available Source Names in Mapping:")
-print(source_mapping.keys())
+    # Debugging: print the source mapping dictionary keys
+    print("Available Source Names in Mapping:")
+    print(source_mapping.keys())
+    return source_mapping
 
 
 # Function to get source information (ID, Type, and File Type) from the mapping
-def get_source_info(source_name):
+def get_source_info(source_name, source_mapping):
     # Normalize the case to title case for comparison
     normalized_source_name = source_name.strip()  # Normalize to Title Case
     print(f"Normalized Source Name: {normalized_source_name}")
     return source_mapping.get(normalized_source_name, None)
 
 
-# Initialize a dictionary to store data by file
-file_data = []
-
-# Dictionary to track column names and their sources for comparison
-column_sources = {}
-
 # List of common default values (you can expand this list as needed)
 default_values = ["yes", "no", "true", "false", "1", "0"]
 
-# List of common currency symbols
-currency_symbols = ["$", "€", "£", "¥", "₹"]
-
-# List of common measurement units
-measurement_units = ["kg", "lbs", "m", "cm", "inches", "ft", "meter", "km", "mile"]
-
-
-# Function to calculate maximum length or max value for each column
-def get_column_length_and_max_value(column_data):
-    if pd.api.types.is_string_dtype(column_data):
-        # For string columns, calculate the max length of values
-        return column_data.apply(
-            lambda x: len(str(x))
-        ).max(), None  # return length info
-    elif pd.api.types.is_numeric_dtype(column_data):
-        # For numeric columns, calculate the max value
-        return None, column_data.max()  # return value info
-    return (
-        "No Data",
-        None,
-    )  # Return a default value for non-string and non-numeric columns (if any)
-
-
 # Function to check for Sensitive data (simple pattern check for common sensitive data)
 def is_sensitive(column_data):
     sensitive_patterns = [
@@ -100,100 +101,12 @@ def is_encrypted(column_data):
     return "No"
 
 
-# Function to check for Currency data (columns with currency symbols)
-def is_currency(column_data):
-    if not pd.api.types.is_string_dtype(
-        column_data
-    ) and not pd.api.types.is_numeric_dtype(column_data):
-        return "No"
-
-    column_data_str = column_data.astype(str)
-
-    # Use spaCy to detect monetary entities
-    for value in column_data_str:
-        doc = nlp(value)
-        for ent in doc.ents:
-            if ent.label_ == "MONEY":  # spaCy's label for monetary entities
-                return "Yes"
-
-    # Check each value in the column for the presence of any currency symbols
-    for value in column_data_str:
-        for symbol in currency_symbols:
-            if symbol in value:
-                return "Yes"
-    return "No"
-
-
-# Function to check for Measurements (using NLP and regex to identify units)
-def is_measurement(column_data):
-    if not pd.api.types.is_string_dtype(
-        column_data
-    ) and not pd.api.types.is_numeric_dtype(column_data):
-        return "No"
-
-    column_data_str = column_data.astype(str).str.lower()
-
-    # Process each entry in the column using spaCy NLP
-    for value in column_data_str:
-        doc = nlp(value)  # Process the text with spaCy's NLP model
-
-        # Check if any measurement units are found by spaCy's NER model
-        for ent in doc.ents:
-            if ent.text in measurement_units:
-                return "Yes"
-
-        # Check for the presence of measurement units using regex (for variations)
-        for unit in measurement_units:
-            if re.search(r"\b" + unit + r"\b", value):
-                return "Yes"
-    return "No"
-
-
-# Function to check for Auto Gen: Check if column contains a sequential pattern
-def is_auto_gen(column_data):
-    if pd.api.types.is_numeric_dtype(column_data):
-        diff = column_data.diff().dropna()
-        if diff.nunique() == 1 and diff.iloc[0] == 1:
-            return "Yes"
-    return "No"
-
-
 # Function to check for Default: Check if column contains default values
 def is_default(column_data):
     column_data_lower = column_data.astype(str).str.lower()
     return "Yes" if column_data_lower.isin(default_values).any() else "No"
 
 
-def get_column_data_type(column_data):
-    """Map the pandas dtype to a user-friendly description, with distinction between datetime and date."""
-    dtype = column_data.dtype
-
-    if pd.api.types.is_string_dtype(dtype):
-        # Attempt to convert the column to datetime if it contains date-like strings
-        try:
-            # Try parsing date-like strings, assuming the date format is "DD-MM-YYYY"
-            if pd.to_datetime(column_data, errors="coerce").notnull().all():
-                return "date"  # Treat as date if conversion is successful
-        except Exception:
-            pass
-        return "string"  # For string/text columns
-    elif pd.api.types.is_numeric_dtype(dtype):
-        if pd.api.types.is_integer_dtype(dtype):
-            return "int"  # For integer columns
-        elif pd.api.types.is_float_dtype(dtype):
-            return "float"  # For float columns
-    elif pd.api.types.is_datetime64_any_dtype(dtype):
-        # If the column is already in datetime format
-        if column_data.dt.time.isnull().all():  # No time part
-            return "date"  # For date-only columns
-        return "datetime"  # For datetime columns with time information
-    elif pd.api.types.is_timedelta64_dtype(dtype):
-        return "timedelta"  # For timedelta columns
-    elif pd.api.types.is_bool_dtype(dtype):
-        return "boolean"  # For boolean columns
-    return "unknown"  # In case we can't map the dtype
-
-
 # Function to handle non-serializable pandas types
 def default_serializer(obj):
     if isinstance(obj, pd.Timestamp):
@@ -209,144 +122,368 @@ def default_serializer(obj):
     return str(obj)  # For other types, convert to string if they are not serializable
 
 
-# Walk through the subfolders and files in the main folder
-for subdir, dirs, files in os.walk(main_folder_path):
-    # Skip the main folder itself and only process subfolders
-    if subdir == main_folder_path:
-        continue
+# Per-process Currency/Measurement detector, set up by init_catalog_worker
+worker_entity_detector = None
 
-    # Extract the Source Name from the subfolder name and normalize it (e.g., title case)
-    source_name = os.path.basename(subdir).strip()  # Normalize case
 
-    # Debugging: print the extracted source name
-    print(f"Extracted Source Name: {source_name}")
+def init_catalog_worker(n_process=1, preload=False):
+    """Create this process's entity detector, optionally loading spaCy up front"""
+    global worker_entity_detector
+    # Tiered Currency/Measurement detection; spaCy is only loaded if a column
+    # reaches the NLP tier (or here, when preloading)
+    worker_entity_detector = EntityDetector(
+        batch_size=nlp_batch_size, n_process=n_process
+    )
+    if preload:
+        worker_entity_detector.nlp
 
-    # Get the Source ID, Source Type, and File Type from the source_mapping dictionary
-    source_info = get_source_info(source_name)
 
-    if source_info is None:
-        print(
-            f"Warning: Source Name '{source_name}' not found in the mapping. Skipping."
-        )
-        continue
+# Walk the source folders and list the files to catalog, with their File IDs
+def collect_catalog_tasks(source_mapping):
+    tasks = []
+    for subdir, dirs, files in os.walk(main_folder_path):
+        # Skip the main folder itself and only process subfolders
+        if subdir == main_folder_path:
+            continue
 
-    source_id = source_info["Source ID"]
-    source_type = source_info["Source Type"]
-    file_type = source_info["File Type"]
+        # Extract the Source Name from the subfolder name and normalize it (e.g., title case)
+        source_name = os.path.basename(subdir).strip()  # Normalize case
 
-    file_id_counter = 1
+        # Debugging: print the extracted source name
+        print(f"Extracted Source Name: {source_name}")
 
-    for file_name in files:
-        print(
-            f"Processing file: {file_name}"
-        )  # Debugging: print file names being processed
+        # Get the Source ID, Source Type, and File Type from the source_mapping dictionary
+        source_info = get_source_info(source_name, source_mapping)
 
-        # Skip if the file is not CSV or Excel
-        if not (file_name.endswith(".csv") or file_name.endswith(".xlsx")):
+        if source_info is None:
+            print(
+                f"Warning: Source Name '{source_name}' not found in the mapping. Skipping."
+            )
             continue
 
-        file_path = os.path.join(subdir, file_name)
-        file_name_without_extension = os.path.splitext(file_name)[
-            0
-        ]  # File name without extension
-
-        file_id = file_id_counter
-        file_id_counter += 1
-
-        if file_name.endswith(".csv"):
-            df = pd.read_csv(file_path, nrows=100)
-        elif file_name.endswith(".xlsx"):
-            df = pd.read_excel(file_path, nrows=100)
-
-        for index, column in enumerate(
-            df.columns, 1
-        ):  # enumerate to get column index starting from 1
-            if column not in column_sources:
-                column_sources[column] = []
-            column_sources[column].append(
+        file_id_counter = 1
+
+        for file_name in files:
+            # Skip if the file is not CSV or Excel
+            if not (file_name.endswith(".csv") or file_name.endswith(".xlsx")):
+                continue
+
+            tasks.append(
                 {
-                    "source": source_name,
-                    "file_name": file_name_without_extension,
-                    "file_id": file_id,
-                    "column_sequence": index,
+                    "source_name": source_name,
+                    "source_id": source_info["Source ID"],
+                    "source_type": source_info["Source Type"],
+                    "file_type": source_info["File Type"],
+                    "file_id": file_id_counter,
+                    "file_path": os.path.join(subdir, file_name),
+                    # File name without extension
+                    "file_name": os.path.splitext(file_name)[0],
                 }
             )
+            file_id_counter += 1
+    return tasks
+
+
+# Catalog fields that come from the file's task rather than its contents
+def task_fields(task):
+    return {
+        "Source ID": int(task["source_id"]),
+        "Source Name": str(task["source_name"]),
+        "Source Type": str(task["source_type"]),
+        "File Type": str(task["file_type"]),
+        "File ID": int(task["file_id"]),
+        "File Name": str(task["file_name"]),
+    }
 
-            column_length, max_value = get_column_length_and_max_value(df[column])
-            data_type = get_column_data_type(df[column])  # Get the actual data type
 
-            is_primary_key = (
-                "Yes"
-                if df[column].nunique() == len(df[column])
-                and df[column].notnull().all()
-                else "No"
-            )
-            is_foreign_key = "No"
-            for other_column in df.columns:
-                if column != other_column:
-                    if df[column].isin(df[other_column]).any():
-                        is_foreign_key = "Yes"
-                        break
-
-            auto_gen = is_auto_gen(df[column])
-            default = is_default(df[column])
-            sensitive = is_sensitive(df[column])
-            encrypted = is_encrypted(df[column])
-            currency = is_currency(df[column])
-            measurement = is_measurement(df[column])
-
-            column_data = {
-                "Source ID": int(source_id),
-                "Source Name": str(source_name),
-                "Source Type": str(source_type),
-                "File Type": str(file_type),
-                "File ID": int(file_id),
-                "File Name": str(file_name_without_extension),
+# Profile one file and build its catalog rows (runs in a worker process)
+def catalog_file(task):
+    file_path = task["file_path"]
+    print(f"Processing file: {file_path}")  # Debugging: print files being processed
+
+    # Stream the whole file through per-column accumulators
+    profiles = profile_file(
+        file_path,
+        chunksize=profile_chunksize,
+        value_checks={
+            "Default": is_default,
+            "Sensitive": is_sensitive,
+            "Encrypted": is_encrypted,
+        },
+        file_format=task.get("file_format"),
+        column_types=task.get("column_types"),
+    )
+
+    # Currency/Measurement flags for every column, cheapest tier first,
+    # from a bounded sample of each column's distinct values
+    entity_flags = worker_entity_detector.detect(
+        {column: profile.sample for column, profile in profiles.items()}
+    )
+
+    # Keys are mined from the file read as it was profiled
+    key_miner = CandidateKeyMiner()
+    candidate_keys = key_miner.find_keys(
+        file_path,
+        profiles,
+        task.get("file_format"),
+        catalog_dtype(file_path, task.get("file_format"), task.get("column_types")),
+    )
+    primary_key = key_miner.primary_key(candidate_keys, list(profiles))
+    print(f"Candidate keys for {task['file_name']}: {candidate_keys}")
+    print(f"Primary key for {task['file_name']}: {primary_key}")
+
+    rows = []
+    for index, (column, profile) in enumerate(
+        profiles.items(), 1
+    ):  # enumerate to get column index starting from 1
+        rows.append(
+            {
+                **task_fields(task),
                 "Column Name": str(column),
                 "Column Sequence": int(index),
                 "Similar Columns": "",
                 "Similar Columns File ID": "",
-                "Data Type": data_type,  # Store the actual data type here
-                "Is Numeric": "Yes"
-                if pd.api.types.is_numeric_dtype(df[column])
-                else "No",
-                "Is Mandatory": "Yes" if df[column].isnull().sum() == 0 else "No",
-                "Is Unique": "Yes" if df[column].nunique() == len(df[column]) else "No",
-                "Is Primary Key": "",  # is_primary_key,
-                "Is Foreign Key": "",  # is_foreign_key,
+                "Similar Column Names": "",
+                "Similarity Scores": "",
+                "Data Type": profile.data_type(),  # Store the actual data type here
+                "Is Numeric": "Yes" if profile.is_numeric() else "No",
+                "Is Mandatory": "Yes" if profile.is_mandatory() else "No",
+                "Is Unique": "Yes" if profile.is_unique() else "No",
+                "Is Primary Key": "Yes" if column in primary_key else "No",
+                "Is Foreign Key": "",
                 "Lookup Column": "",
-                "Auto Gen": auto_gen,
-                "Default": default,
-                "Sensitive": sensitive,
-                "Encrypted": encrypted,
-                "Currency": currency,
-                "Measurement": measurement,
+                "Auto Gen": "Yes" if profile.is_auto_gen() else "No",
+                "Default": profile.check_results["Default"],
+                "Sensitive": profile.check_results["Sensitive"],
+                "Encrypted": profile.check_results["Encrypted"],
+                "Currency": entity_flags[column]["Currency"],
+                "Measurement": entity_flags[column]["Measurement"],
+                "Currency Detected By": entity_flags[column]["Currency Detected By"],
+                "Measurement Detected By": entity_flags[column][
+                    "Measurement Detected By"
+                ],
             }
-            # "Column Length": column_length if column_length else max_value,
+        )
+        # The check functions live in this module and are not sent back
+        profile.value_checks = {}
+
+    return {"task": task, "rows": rows, "profiles": profiles}
+
+
+# Catalog every file, across a pool of worker processes when configured
+def run_catalog_tasks(tasks, workers):
+    if workers <= 1 or len(tasks) <= 1:
+        init_catalog_worker(n_process=nlp_processes)
+        return [catalog_file(task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        initializer=init_catalog_worker,
+        initargs=(1, preload_nlp_model),
+    ) as executor:
+        # map keeps the walk order, so the merged catalog matches a serial run
+        return list(executor.map(catalog_file, tasks))
+
+
+# Catalog rows of the current schemaMaster.csv, grouped by (Source Name, File Name)
+def load_existing_catalog(catalog_file):
+    if not os.path.exists(catalog_file):
+        return {}
+    existing_df = pd.read_csv(catalog_file, dtype=str, keep_default_na=False)
+    existing_rows = {}
+    for row in existing_df.to_dict(orient="records"):
+        existing_rows.setdefault((row["Source Name"], row["File Name"]), []).append(row)
+    return existing_rows
+
+
+# Keep values edited by hand: wherever the saved catalog differs from what was
+# generated for the file last time, the saved value wins
+def apply_user_overrides(rows, previous_rows, saved_rows):
+    previous_by_column = {row["Column Name"]: row for row in previous_rows}
+    saved_by_column = {row["Column Name"]: row for row in saved_rows}
+    for row in rows:
+        previous = previous_by_column.get(row["Column Name"])
+        saved = saved_by_column.get(row["Column Name"])
+        if previous is None or saved is None:
+            continue
+        for field, value in row.items():
+            if field in ["Source ID", "File ID", "Column Sequence"]:
+                continue
+            if field in saved and saved[field] != str(previous.get(field, "")):
+                row[field] = saved[field]
+
+
+def main():
+    source_mapping = load_source_mapping(source_mapping_file)
+
+    tasks = collect_catalog_tasks(source_mapping)
+
+    # Reuse the rows and profiles of files unchanged since the last run
+    manifest = None
+    cached_results = {}
+    existing_catalog = {}
+    if incremental_catalog:
+        manifest = CatalogManifest(catalog_manifest_file, profile_cache_dir)
+        existing_catalog = load_existing_catalog(schema_master_file)
+        for task in tasks:
+            cached = manifest.load_cached(task["file_path"])
+            if cached is not None and (
+                (task["source_name"], task["file_name"]) in existing_catalog
+            ):
+                cached_results[task["file_path"]] = cached
+
+    changed_tasks = [task for task in tasks if task["file_path"] not in cached_results]
+    print(
+        f"Cataloging {len(changed_tasks)} new or changed files, "
+        f"reusing {len(cached_results)} unchanged files"
+    )
+
+    # Sniff the encoding and delimiter of each CSV once, shared with later stages.
+    # A changed file already in the catalog is read with its numeric column
+    # types from last time; text and dates are still inferred from the values.
+    file_formats = FileFormatManifest()
+    for task in changed_tasks:
+        if task["file_path"].endswith(".csv"):
+            task["file_format"] = file_formats.format_of(task["file_path"])
+            saved_rows = existing_catalog.get((task["source_name"], task["file_name"]))
+            if saved_rows:
+                task["column_types"] = {
+                    column: data_type
+                    for column, data_type in catalog_column_types(
+                        [row["Column Name"] for row in saved_rows],
+                        [row.get("Data Type") for row in saved_rows],
+                    ).items()
+                    if data_type in ["int", "float"]
+                }
+    file_formats.save()
+    new_results = {
+        result["task"]["file_path"]: result
+        for result in run_catalog_tasks(changed_tasks, catalog_workers)
+    }
+
+    results = []
+    for task in tasks:
+        if task["file_path"] in new_results:
+            results.append(new_results[task["file_path"]])
+            continue
+        cached = cached_results[task["file_path"]]
+        # Source and file fields from this run's task, as if profiled again
+        rows = [dict(row, **task_fields(task)) for row in cached["rows"]]
+        results.append(
+            {
+                "task": task,
+                "rows": rows,
+                "profiles": cached["profiles"],
+                "previous_rows": cached["rows"],
+            }
+        )
+
+    # Initialize a dictionary to store data by file
+    file_data = []
+
+    # Name and value signatures of every column, for similar column matching
+    similarity_matcher = SimilarColumnMatcher()
+    file_ids = {}
+
+    # Column profiles of every file, for cross-file foreign key discovery
+    dependency_finder = InclusionDependencyFinder()
+
+    # Reduce the per-file results in walk order
+    for result in results:
+        task = result["task"]
+        file_ids[(task["source_name"], task["file_name"])] = task["file_id"]
+        for column_data in result["rows"]:
+            column = column_data["Column Name"]
+            similarity_matcher.add_column(
+                (task["source_name"], task["file_name"], column),
+                column,
+                result["profiles"].get(column),
+            )
             file_data.append(column_data)
+        dependency_finder.add_file(
+            task["source_name"], task["file_name"], result["profiles"]
+        )
 
-# After collecting all data, identify similar columns and update the new columns
-for column_info in file_data:
-    column_name = column_info["Column Name"]
-    if column_name in column_sources and len(column_sources[column_name]) > 1:
-        column_info["Similar Columns"] = "Yes"
-        similar_sources = column_sources[column_name]
-        similar_sources_info = [f"{source['file_id']}" for source in similar_sources]
-        column_info["Similar Columns File ID"] = "; ".join(similar_sources_info)
-    else:
-        column_info["Similar Columns"] = "No"
-        column_info["Similar Columns File ID"] = "None"
-
-# Convert the collected data into a DataFrame
-df_all_data = pd.DataFrame(file_data)
-
-# Save all the data into a single CSV file
-df_all_data.to_csv(
-    "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Metadata/schemaMaster.csv",
-    index=False,
-    encoding="utf-8",
-)
-print("Metadata catalog has been saved")
+    # After collecting all data, identify similar columns by name and by values
+    similar_columns = similarity_matcher.find()
+    for column_info in file_data:
+        matches = similar_columns.get(
+            (
+                column_info["Source Name"],
+                column_info["File Name"],
+                column_info["Column Name"],
+            ),
+            [],
+        )
+        if matches:
+            column_info["Similar Columns"] = "Yes"
+            similar_file_ids = []
+            for (source, file_name, _), _ in matches:
+                file_id = str(file_ids[(source, file_name)])
+                if file_id not in similar_file_ids:
+                    similar_file_ids.append(file_id)
+            column_info["Similar Columns File ID"] = "; ".join(similar_file_ids)
+            column_info["Similar Column Names"] = "; ".join(
+                f"{source}.{file_name}.{column}"
+                for (source, file_name, column), _ in matches
+            )
+            column_info["Similarity Scores"] = "; ".join(
+                str(score) for _, score in matches
+            )
+        else:
+            column_info["Similar Columns"] = "No"
+            column_info["Similar Columns File ID"] = "None"
+            column_info["Similar Column Names"] = ""
+            column_info["Similarity Scores"] = ""
+
+    # Foreign keys: columns whose values are all found in a column of any file
+    dependencies = dependency_finder.find()
+    for column_info in file_data:
+        lookups = dependencies.get(
+            (
+                column_info["Source Name"],
+                column_info["File Name"],
+                column_info["Column Name"],
+            ),
+            [],
+        )
+        column_info["Is Foreign Key"] = "Yes" if lookups else "No"
+        column_info["Lookup Column"] = "; ".join(
+            f"{source}.{file_name}.{column}" for source, file_name, column in lookups
+        )
 
-# Print the first few rows of the DataFrame for a sample file
-print(df_all_data.head())
+    if manifest is not None:
+        # Cache what was generated for every file, then restore manual edits
+        for result in results:
+            task = result["task"]
+            manifest.store(
+                task["file_path"],
+                [dict(row) for row in result["rows"]],
+                result["profiles"],
+            )
+            if "previous_rows" in result:
+                apply_user_overrides(
+                    result["rows"],
+                    result["previous_rows"],
+                    existing_catalog[(task["source_name"], task["file_name"])],
+                )
+
+    # Convert the collected data into a DataFrame
+    df_all_data = pd.DataFrame(file_data)
+
+    # Save all the data into a single CSV file
+    df_all_data.to_csv(
+        schema_master_file,
+        index=False,
+        encoding="utf-8",
+    )
+    if manifest is not None:
+        manifest.save()
+    print("Metadata catalog has been saved")
+
+    # Print the first few rows of the DataFrame for a sample file
+    print(df_all_data.head())
+
+
+if __name__ == "__main__":
+    main()
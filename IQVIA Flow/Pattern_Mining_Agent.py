@@ -4,14 +4,69 @@ import glob
 from datetime import datetime
 import numpy as np
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from value_patterns import ValuePatternMiner
+from column_stats import ColumnStatsPlan
+from column_correlations import CorrelationFinder, matrix_correlations
+from streaming_profile import StreamingFileProfile
+from metadata_index import MetadataIndex
+from report_rendering import write_html_report, write_json_sidecar
+from file_sniffer import (
+    FileFormatManifest,
+    sniff_file,
+    read_options,
+    fallback_encodings,
+)
+from typed_reader import read_typed_csv, typed_read_options
+from currency_checks import (
+    check_currency,
+    currency_stat,
+    merge_currency_counts,
+)
+from column_checks import (
+    check_column,
+    null_like_count,
+    sensitive_count,
+    encrypted_count,
+)
+
+# Read as missing in every column, on top of the pandas defaults
+null_values = ["NA", "NaN", "null", "NULL", "None", ""]
+
+# Worker processes profiling files in parallel (1 runs every file in this process)
+dq_workers = os.cpu_count() or 1
+
+# Trees profiled in one run, in order. A file found at the same relative path
+# in an earlier tree is its baseline: the Curated report of a file gets a
+# before/after section against its RAW report, showing what Repair_Agent changed.
+dq_targets = {
+    "RAW": {
+        "source_root_dir": "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/RAW",
+        "output_dir": "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Reports/RAW DQ",
+    },
+    "Curated": {
+        "source_root_dir": "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Curated",
+        "output_dir": "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Reports/Curated DQ",
+    },
+}
 
 
 class DataProfiler:
-    def __init__(self):
-        """Initialize the DataProfiler"""
+    def __init__(
+        self,
+        output_dir=None,
+        correlation_method="pearson",
+        correlation_sample_rows=None,
+    ):
+        """
+        Initialize the DataProfiler. Strong correlations use correlation_method
+        ("pearson", "spearman" or "kendall"); set correlation_sample_rows to
+        correlate a random sample of very tall files.
+        """
         try:
             self.report_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.output_dir = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Reports/RAW DQ"
+            self.output_dir = output_dir or dq_targets["RAW"]["output_dir"]
 
             # Initialize currency validation patterns and indicators
             self.currency_patterns = {
@@ -44,6 +99,26 @@ class DataProfiler:
                 "inr",
             ]
 
+            # Value shape miner for the format check
+            self.pattern_miner = ValuePatternMiner()
+
+            self.correlation_finder = CorrelationFinder(
+                method=correlation_method, sample_rows=correlation_sample_rows
+            )
+
+            # Fused null/sensitive/encrypted counts of the file being processed
+            self.column_checks = {}
+
+            # Numeric column statistics of the file being processed
+            self.stats_plans = {}
+
+            # Sniffed format of each data file, filled from the shared manifest
+            self.file_formats = {}
+
+            # Files larger than this are profiled chunk by chunk
+            self.streaming_file_size = 512 * 1024 * 1024  # bytes
+            self.stream_chunksize = 100_000
+
             # Create output directory if it doesn't exist
             if not os.path.exists(self.output_dir):
                 os.makedirs(self.output_dir)
@@ -82,8 +157,8 @@ class DataProfiler:
 
                     # Map variations of "Yes" to standardized form
                     yes_variations = ["YES", "Y", "TRUE", "1"]
-                    metadata_df[col] = metadata_df[col].apply(
-                        lambda x: "YES" if x.upper() in yes_variations else "NO"
+                    metadata_df[col] = np.where(
+                        metadata_df[col].isin(yes_variations), "YES", "NO"
                     )
 
             # Clean up Column Name values
@@ -95,6 +170,7 @@ class DataProfiler:
             )
 
             self.metadata_df = metadata_df
+            self.metadata_index = MetadataIndex(metadata_df)
 
             # Debug print to verify the cleaning
             print("\nUnique values after cleaning:")
@@ -109,6 +185,18 @@ class DataProfiler:
         """
         Determine if a column should be included in numerical analysis
         """
+        if self.has_identifier_name(column_name):
+            return False
+
+        # Check if dtype is numeric before counting distinct values
+        if not np.issubdtype(df[column_name].dtype, np.number):
+            return False
+
+        # Additional checks for specific data patterns
+        return df[column_name].nunique() != len(df)  # Unique values = row count
+
+    def has_identifier_name(self, column_name):
+        """Columns named like IDs, codes or dates are never analyzed as numbers"""
         # Convert column name to lowercase for easier checking
         col_lower = column_name.lower()
 
@@ -131,7 +219,7 @@ class DataProfiler:
         # Check business-specific ID patterns
         for pattern in business_id_patterns:
             if pattern in col_lower:
-                return False
+                return True
 
         # Technical patterns to exclude
         technical_patterns = [
@@ -160,14 +248,9 @@ class DataProfiler:
         # Check technical patterns
         for pattern in technical_patterns:
             if pattern in col_lower:
-                return False
-
-        # Additional checks for specific data patterns
-        if df[column_name].nunique() == len(df):  # Unique values = row count
-            return False
+                return True
 
-        # Check if dtype is numeric
-        return np.issubdtype(df[column_name].dtype, np.number)
+        return False
 
     def check_duplicates(self, df, column):
         """Count duplicates in a column"""
@@ -180,45 +263,18 @@ class DataProfiler:
             print(f"Error checking duplicates for column {column}: {str(e)}")
             return 0, 0
 
+    def get_column_checks(self, df, column):
+        """Null-like, sensitive and encrypted counts of a column, computed once per file"""
+        key = (id(df), column)
+        if key not in self.column_checks:
+            self.column_checks[key] = check_column(df[column])
+        return self.column_checks[key]
+
     def check_null(self, df, column):
         """Count null values in a column"""
         try:
-            # Check for various types of null values
-            null_count = df[column].isnull().sum()  # Standard null
-            empty_count = (
-                (df[column] == "").sum() if df[column].dtype == object else 0
-            )  # Empty string
-            space_count = (
-                df[column].astype(str).str.isspace()
-            ).sum()  # Only whitespace
-            na_count = (
-                (df[column] == "NA").sum() if df[column].dtype == object else 0
-            )  # 'NA' string
-            nan_count = (
-                (df[column] == "NaN").sum() if df[column].dtype == object else 0
-            )  # 'NaN' string
-            none_count = (df[column].astype(str) == "None").sum()  # 'None' string
-
-            # Total null-like values
-            total_null_count = (
-                null_count
-                + empty_count
-                + space_count
-                + na_count
-                + nan_count
-                + none_count
-            )
-
-            print(f"Debug - Null check for {column}:")
-            print(f"  - Null: {null_count}")
-            print(f"  - Empty: {empty_count}")
-            print(f"  - Space: {space_count}")
-            print(f"  - NA: {na_count}")
-            print(f"  - NaN: {nan_count}")
-            print(f"  - None: {none_count}")
-            print(f"  - Total: {total_null_count}")
-
-            return total_null_count
+            # Standard nulls plus empty, whitespace-only, 'NA', 'NaN' and 'None' strings
+            return null_like_count(self.get_column_checks(df, column))
         except Exception as e:
             print(f"Error checking nulls for column {column}: {str(e)}")
             return 0
@@ -226,38 +282,8 @@ class DataProfiler:
     def check_sensitive(self, df, column):
         """Count sensitive data (e.g., emails, credit cards) in a column"""
         try:
-            if df[column].dtype == object:
-                # Email pattern
-                email_count = (
-                    df[column]
-                    .str.contains(
-                        r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}",
-                        na=False,
-                        regex=True,
-                    )
-                    .sum()
-                )
-
-                # Credit card pattern (simplified)
-                cc_count = (
-                    df[column]
-                    .str.contains(
-                        r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b", na=False, regex=True
-                    )
-                    .sum()
-                )
-
-                # Phone number pattern (simplified)
-                phone_count = (
-                    df[column]
-                    .str.contains(
-                        r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b", na=False, regex=True
-                    )
-                    .sum()
-                )
-
-                return email_count + cc_count + phone_count
-            return 0
+            # Email, credit card and phone number matches
+            return sensitive_count(self.get_column_checks(df, column))
         except Exception as e:
             print(f"Error checking sensitive data for column {column}: {str(e)}")
             return 0
@@ -265,47 +291,52 @@ class DataProfiler:
     def check_encrypted(self, df, column):
         """Check for potentially encrypted values"""
         try:
-            if df[column].dtype == object:
-                # Check for hex-like strings
-                hex_pattern = r"^[A-Fa-f0-9]{32,}$"
-                hex_count = (
-                    df[column].str.contains(hex_pattern, na=False, regex=True).sum()
-                )
-
-                # Check for base64-like strings
-                base64_pattern = r"^[A-Za-z0-9+/]{32,}={0,2}$"
-                base64_count = (
-                    df[column].str.contains(base64_pattern, na=False, regex=True).sum()
-                )
-
-                return hex_count + base64_count
-            return 0
+            # Hex-like and base64-like strings
+            return encrypted_count(self.get_column_checks(df, column))
         except Exception as e:
             print(f"Error checking encryption for column {column}: {str(e)}")
             return 0
 
-    def calculate_descriptive_stats(self, df):
-        """Calculate descriptive statistics for appropriate numeric columns"""
-        try:
-            stats = {}
-            # Filter numeric columns and exclude ID-like columns
+    def check_value_patterns(self, df):
+        """Flag values whose shape (e.g. A999, 99-99-9999) differs from their column's format"""
+        pattern_stats = []
+        total_rows = len(df)
+        for col in df.columns:
+            try:
+                result = self.pattern_miner.check_column(df[col])
+                if result is not None:
+                    pattern_stats.append(self.pattern_stat(col, result, total_rows))
+            except Exception as e:
+                print(f"Error checking value patterns for column {col}: {str(e)}")
+        return pattern_stats
+
+    def pattern_stat(self, col, result, total_rows):
+        count = result["violation_count"]
+        return {
+            "column": col,
+            "count": count,
+            "percentage": round((count / total_rows) * 100, 2) if total_rows > 0 else 0,
+            "total_records": total_rows,
+            "detail": f"(expected {result['dominant_pattern']}, found "
+            f"{', '.join(result['violation_patterns'])}; e.g. "
+            f"{', '.join(result['examples'])})",
+        }
+
+    def get_stats_plan(self, df):
+        """Column classification and numeric statistics of a file, built once"""
+        key = id(df)
+        if key not in self.stats_plans:
             numeric_columns = [
                 col for col in df.columns if self.is_analyzable_numeric(col, df)
             ]
-
             print(f"\nAnalyzing numeric columns: {numeric_columns}")
+            self.stats_plans[key] = ColumnStatsPlan.from_frame(df, numeric_columns)
+        return self.stats_plans[key]
 
-            for col in numeric_columns:
-                stats[col] = {
-                    "mean": round(df[col].mean(), 2),
-                    "median": round(df[col].median(), 2),
-                    "std": round(df[col].std(), 2),
-                    "min": round(df[col].min(), 2),
-                    "max": round(df[col].max(), 2),
-                    "q1": round(df[col].quantile(0.25), 2),
-                    "q3": round(df[col].quantile(0.75), 2),
-                }
-            return stats
+    def calculate_descriptive_stats(self, df):
+        """Calculate descriptive statistics for appropriate numeric columns"""
+        try:
+            return self.get_stats_plan(df).descriptive_stats()
         except Exception as e:
             print(f"Error calculating descriptive statistics: {str(e)}")
             return {}
@@ -313,68 +344,43 @@ class DataProfiler:
     def detect_outliers(self, df):
         """Detect outliers using IQR method for appropriate numeric columns"""
         try:
-            outliers = {}
-            numeric_columns = [
-                col for col in df.columns if self.is_analyzable_numeric(col, df)
-            ]
-
-            for col in numeric_columns:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-
-                outliers[col] = {
-                    "count": len(df[(df[col] < lower_bound) | (df[col] > upper_bound)]),
-                    "percentage": round(
-                        len(df[(df[col] < lower_bound) | (df[col] > upper_bound)])
-                        / len(df)
-                        * 100,
-                        2,
-                    ),
-                    "lower_bound": round(lower_bound, 2),
-                    "upper_bound": round(upper_bound, 2),
-                }
-            return outliers
+            return self.summarize_outliers(self.get_stats_plan(df))
         except Exception as e:
             print(f"Error detecting outliers: {str(e)}")
             return {}
 
+    def summarize_outliers(self, plan):
+        counts, lower_bounds, upper_bounds = plan.outlier_counts()
+
+        outliers = {}
+        for i, col in enumerate(plan.numeric_columns):
+            outliers[col] = {
+                "count": int(counts[i]),
+                "percentage": round(int(counts[i]) / plan.row_count * 100, 2),
+                "lower_bound": round(lower_bounds[i], 2),
+                "upper_bound": round(upper_bounds[i], 2),
+            }
+        return outliers
+
     def analyze_correlations(self, df):
         """Calculate correlations between appropriate numeric columns"""
         try:
-            numeric_columns = [
-                col for col in df.columns if self.is_analyzable_numeric(col, df)
-            ]
+            plan = self.get_stats_plan(df)
 
-            if len(numeric_columns) < 2:
+            if len(plan.numeric_columns) < 2:
                 return []
 
-            numeric_df = df[numeric_columns]
-            corr_matrix = numeric_df.corr()
-
-            strong_correlations = []
-            for i in range(len(corr_matrix.columns)):
-                for j in range(i + 1, len(corr_matrix.columns)):
-                    correlation = corr_matrix.iloc[i, j]
-                    if abs(correlation) > 0.7:
-                        strong_correlations.append(
-                            {
-                                "column1": corr_matrix.columns[i],
-                                "column2": corr_matrix.columns[j],
-                                "correlation": round(correlation, 2),
-                            }
-                        )
-            return strong_correlations
+            return self.correlation_finder.find(plan.block, plan.numeric_columns)
         except Exception as e:
             print(f"Error analyzing correlations: {str(e)}")
             return []
 
+    def strong_correlations(self, corr_matrix):
+        return matrix_correlations(corr_matrix, self.correlation_finder.threshold)
+
     def calculate_column_stats(self, df, columns, check_type):
         """Calculate statistics for specified columns"""
-        column_stats = []
-        total_rows = len(df)
+        column_counts = {}
 
         for col in columns:
             if col in df.columns:
@@ -394,26 +400,34 @@ class DataProfiler:
                     else:
                         continue
 
-                    percentage = (count / total_rows) * 100 if total_rows > 0 else 0
-
-                    column_stats.append(
-                        {
-                            "column": col,
-                            "count": count,
-                            "percentage": round(percentage, 2),
-                            "total_records": total_rows,
-                            "detail": detail,
-                        }
-                    )
-
-                    print(f"Processed {check_type} check for column {col}:")
-                    print(f"  - Count: {count}")
-                    print(f"  - Percentage: {percentage:.2f}%")
-                    print(f"  - Detail: {detail}")
+                    column_counts[col] = (count, detail)
 
                 except Exception as e:
                     print(f"Error processing column {col}: {str(e)}")
 
+        return self.format_column_stats(column_counts, len(df), check_type)
+
+    def format_column_stats(self, column_counts, total_rows, check_type):
+        """Turn {column: (count, detail)} into report rows"""
+        column_stats = []
+        for col, (count, detail) in column_counts.items():
+            percentage = (count / total_rows) * 100 if total_rows > 0 else 0
+
+            column_stats.append(
+                {
+                    "column": col,
+                    "count": count,
+                    "percentage": round(percentage, 2),
+                    "total_records": total_rows,
+                    "detail": detail,
+                }
+            )
+
+            print(f"Processed {check_type} check for column {col}:")
+            print(f"  - Count: {count}")
+            print(f"  - Percentage: {percentage:.2f}%")
+            print(f"  - Detail: {detail}")
+
         return column_stats
 
     def generate_recommendations(self, stats, outliers, correlations):
@@ -619,58 +633,54 @@ class DataProfiler:
 
         return recommendations
 
-    def process_file(self, file_path):
-        """Process a single file and generate statistics"""
+    def process_file(self, file_path, output_dir=None, baseline=None):
+        """
+        Process a single file and generate statistics. The report goes to
+        output_dir (default self.output_dir); with the report data of the
+        same file from an earlier stage as baseline, it gets a delta section.
+        """
         try:
             print(f"\nProcessing file: {file_path}")
+            self.column_checks = {}
+            self.stats_plans = {}
             file_name = os.path.basename(file_path)
             file_name_without_ext = os.path.splitext(file_name)[0]
 
-            # Debug print to show all unique file names in metadata
-            print("\nAvailable files in metadata:")
-            print(self.metadata_df["File Name"].unique())
+            # Metadata for this specific file, from the index built by set_metadata
+            file_metadata = self.metadata_index.lookup(file_path)
 
-            # Filter metadata for this specific file
-            file_metadata = self.metadata_df[
-                self.metadata_df["File Name"].str.strip().str.lower()
-                == file_name_without_ext.lower()
-            ]
-
-            if file_metadata.empty:
+            if file_metadata is None:
                 print(f"\nWarning: No metadata found for file {file_name_without_ext}")
                 print(
                     "Please check if the file name matches exactly with the metadata."
                 )
+                print("\nAvailable files in metadata:")
+                print(self.metadata_index.file_names())
                 return None
 
             print(f"\nFound metadata for file: {file_name_without_ext}")
             print(f"Number of metadata rows: {len(file_metadata)}")
 
-            # Read CSV with all potential null values
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    low_memory=False,
-                    na_values=["NA", "NaN", "null", "NULL", "None", ""],
-                    keep_default_na=True,
-                    encoding="utf-8",
-                )
-            except UnicodeDecodeError:
-                df = pd.read_csv(
-                    file_path,
-                    low_memory=False,
-                    na_values=["NA", "NaN", "null", "NULL", "None", ""],
-                    keep_default_na=True,
-                    encoding="latin1",
+            if os.path.getsize(file_path) > self.streaming_file_size:
+                return self.process_file_streaming(
+                    file_path, file_metadata, output_dir, baseline
                 )
 
+            # Read CSV with all potential null values, in its sniffed format
+            # and with the column types recorded in the catalog
+            file_format = self.file_format(file_path)
+            df = self.read_csv(file_path, file_format, file_metadata.data_types)
+
             # Calculate basic statistics
             total_rows = len(df)
             total_columns = len(df.columns)
             unique_columns = len(df.columns.unique())
 
             # Clean up column names in the data file
-            df.columns = df.columns.str.strip().str.replace("\s+", " ", regex=True)
+            if file_format["header_whitespace"]:
+                df.columns = df.columns.str.strip().str.replace(
+                    "\s+", " ", regex=True
+                )
 
             # Remove duplicate columns from DataFrame
             df = df.loc[:, ~df.columns.duplicated()]
@@ -681,44 +691,14 @@ class DataProfiler:
 
             # Debug print columns in metadata for this file
             print("\nColumns in metadata for this file:")
-            print(file_metadata["Column Name"].tolist())
-
-            # Filter only 'Yes' values and existing columns for this specific file
-            mandatory_columns = (
-                file_metadata[
-                    (file_metadata["Is Mandatory"].str.upper() == "YES")
-                    & (file_metadata["Column Name"].isin(df.columns))
-                ]["Column Name"]
-                .unique()
-                .tolist()
-            )
+            print(file_metadata.rows["Column Name"].tolist())
 
-            unique_columns_check = (
-                file_metadata[
-                    (file_metadata["Is Unique"].str.upper() == "YES")
-                    & (file_metadata["Column Name"].isin(df.columns))
-                ]["Column Name"]
-                .unique()
-                .tolist()
-            )
-
-            sensitive_columns = (
-                file_metadata[
-                    (file_metadata["Sensitive"].str.upper() == "YES")
-                    & (file_metadata["Column Name"].isin(df.columns))
-                ]["Column Name"]
-                .unique()
-                .tolist()
-            )
-
-            encrypted_columns = (
-                file_metadata[
-                    (file_metadata["Encrypted"].str.upper() == "YES")
-                    & (file_metadata["Column Name"].isin(df.columns))
-                ]["Column Name"]
-                .unique()
-                .tolist()
-            )
+            # Only 'Yes' columns that exist in this specific file
+            mandatory_columns = file_metadata.flagged("mandatory", df.columns)
+            unique_columns_check = file_metadata.flagged("unique", df.columns)
+            sensitive_columns = file_metadata.flagged("sensitive", df.columns)
+            encrypted_columns = file_metadata.flagged("encrypted", df.columns)
+            currency_columns = file_metadata.flagged("currency", df.columns)
 
             # Calculate advanced statistics
             desc_stats = self.calculate_descriptive_stats(df)
@@ -726,7 +706,7 @@ class DataProfiler:
             correlations = self.analyze_correlations(df)
 
             # Get all columns from the metadata for this specific file
-            expected_columns = file_metadata["Column Name"].unique().tolist()
+            expected_columns = file_metadata.expected_columns
             actual_columns = df.columns.tolist()
 
             # Calculate missing and additional columns
@@ -762,6 +742,10 @@ class DataProfiler:
                 "encrypted_stats": self.calculate_column_stats(
                     df, encrypted_columns, "encrypted"
                 ),
+                "pattern_stats": self.check_value_patterns(df),
+                "currency_stats": self.calculate_currency_stats(
+                    df, currency_columns
+                ),
                 "descriptive_stats": desc_stats,
                 "outliers": outliers,
                 "correlations": correlations,
@@ -770,461 +754,372 @@ class DataProfiler:
                 "additional_columns": additional_columns,
             }
 
-            # Calculate data quality score
-            quality_score = self.calculate_data_quality_score(report_data)
-            report_data["quality_score"] = quality_score
-
-            # Generate individual report
-            self.generate_individual_report(report_data)
-            return report_data
+            return self.finish_report(report_data, output_dir, baseline)
 
         except Exception as e:
             print(f"Error processing file {file_path}: {str(e)}")
             return None
 
-    def generate_html_table(self, data, section_type):
-        """Generate HTML table from data"""
-        if not data:
-            return "<p class='no-data'>No data available for this section</p>"
-
-        html = """
-        <table class='data-table'>
-            <tr>
-                <th>Column Name</th>
-                <th>Total Records</th>
-                <th>Count</th>
-                <th>Percentage</th>
-                <th>Details</th>
-            </tr>
-        """
+    def finish_report(self, report_data, output_dir=None, baseline=None):
+        """Score the report, compare it with its baseline and write it"""
+        report_data["output_dir"] = output_dir or self.output_dir
+
+        # Calculate data quality score
+        quality_score = self.calculate_data_quality_score(report_data)
+        report_data["quality_score"] = quality_score
+
+        if baseline is not None:
+            report_data["baseline_file"] = baseline["file_path"]
+            report_data["delta"] = self.calculate_delta(baseline, report_data)
+
+        # Generate individual report
+        self.generate_individual_report(report_data)
+        return report_data
+
+    def calculate_delta(self, before, after):
+        """Metrics that differ between two reports of the same file, e.g. RAW vs Curated"""
+        delta = []
+
+        def add(metric, column, old, new):
+            if pd.isna(old) and pd.isna(new):
+                return
+            if old == new:
+                return
+            change = ""
+            if isinstance(old, (int, float, np.number)) and isinstance(
+                new, (int, float, np.number)
+            ):
+                change = round(new - old, 2)
+            delta.append(
+                {
+                    "metric": metric,
+                    "column": column,
+                    "before": old,
+                    "after": new,
+                    "change": change,
+                }
+            )
 
-        for row in data:
-            html += f"""
-            <tr>
-                <td>{row['column']}</td>
-                <td>{row['total_records']:,}</td>
-                <td>{row['count']:,}</td>
-                <td>{row['percentage']:.2f}%</td>
-                <td>{row['detail']}</td>
-            </tr>
-            """
-        html += "</table>"
-        return html
-
-    def generate_stats_table(self, stats):
-        """Generate HTML table for descriptive statistics"""
-        if not stats:
-            return "<p class='no-data'>No numeric columns available for analysis</p>"
-
-        html = """
-        <table class='data-table'>
-            <tr>
-                <th>Column</th>
-                <th>Mean</th>
-                <th>Median</th>
-                <th>Std Dev</th>
-                <th>Min</th>
-                <th>Max</th>
-                <th>Q1</th>
-                <th>Q3</th>
-            </tr>
-        """
+        add("Total Rows", "", before["total_rows"], after["total_rows"])
+        before_score = before.get("quality_score") or {}
+        after_score = after.get("quality_score") or {}
+        if before_score and after_score:
+            add(
+                "Quality Score",
+                "",
+                before_score["overall_score"],
+                after_score["overall_score"],
+            )
+            for metric, score in after_score["component_scores"].items():
+                add(
+                    f"{metric.title()} Score",
+                    "",
+                    before_score["component_scores"].get(metric),
+                    score,
+                )
 
-        for col, stat in stats.items():
-            html += f"""
-            <tr>
-                <td>{col}</td>
-                <td>{stat['mean']}</td>
-                <td>{stat['median']}</td>
-                <td>{stat['std']}</td>
-                <td>{stat['min']}</td>
-                <td>{stat['max']}</td>
-                <td>{stat['q1']}</td>
-                <td>{stat['q3']}</td>
-            </tr>
-            """
-        html += "</table>"
-        return html
-
-    def generate_outliers_table(self, outliers):
-        """Generate HTML table for outlier analysis"""
-        if not outliers:
-            return "<p class='no-data'>No numeric columns available for outlier analysis</p>"
-
-        html = """
-        <table class='data-table'>
-            <tr>
-                <th>Column</th>
-                <th>Outlier Count</th>
-                <th>Percentage</th>
-                <th>Lower Bound</th>
-                <th>Upper Bound</th>
-            </tr>
+        column_sections = [
+            ("mandatory_stats", "Null Values"),
+            ("unique_stats", "Duplicate Rows"),
+            ("sensitive_stats", "Sensitive Values"),
+            ("encrypted_stats", "Encrypted Values"),
+            ("pattern_stats", "Format Violations"),
+        ]
+        for key, metric in column_sections:
+            old_counts = {row["column"]: row["count"] for row in before.get(key, [])}
+            new_counts = {row["column"]: row["count"] for row in after.get(key, [])}
+            for col in list(old_counts) + [c for c in new_counts if c not in old_counts]:
+                add(metric, col, old_counts.get(col, 0), new_counts.get(col, 0))
+
+        old_currency = {row["column"]: row for row in before.get("currency_stats", [])}
+        for row in after.get("currency_stats", []):
+            if row["column"] in old_currency:
+                for check, metric in [
+                    ("invalid_format", "Invalid Currency"),
+                    ("negative_values", "Negative Amounts"),
+                    ("zero_values", "Zero Amounts"),
+                ]:
+                    add(
+                        metric,
+                        row["column"],
+                        old_currency[row["column"]][check],
+                        row[check],
+                    )
+
+        old_outliers = before.get("outliers", {})
+        new_outliers = after.get("outliers", {})
+        for col in old_outliers:
+            if col in new_outliers:
+                add(
+                    "Outliers",
+                    col,
+                    old_outliers[col]["count"],
+                    new_outliers[col]["count"],
+                )
+
+        old_stats = before.get("descriptive_stats", {})
+        new_stats = after.get("descriptive_stats", {})
+        for col in old_stats:
+            if col in new_stats:
+                for stat in ["mean", "std", "min", "max"]:
+                    add(
+                        stat.title() if stat != "std" else "Std Dev",
+                        col,
+                        old_stats[col][stat],
+                        new_stats[col][stat],
+                    )
+
+        return delta
+
+    def file_format(self, file_path):
+        """Sniffed format of a file, from the manifest when main() loaded it"""
+        if file_path not in self.file_formats:
+            self.file_formats[file_path] = sniff_file(file_path)
+        return self.file_formats[file_path]
+
+    def read_csv(self, file_path, file_format, column_types=None):
         """
+        Read a whole CSV in its sniffed format, typed from the catalog. The
+        sniffer only sees the start of the file, so a UTF-8 guess can still
+        fail further in; only then is the file read again as latin1.
+        """
+        encodings = fallback_encodings(file_format)
+        for encoding in encodings:
+            try:
+                return read_typed_csv(
+                    file_path,
+                    {**file_format, "encoding": encoding},
+                    column_types,
+                    low_memory=False,
+                    na_values=null_values,
+                    keep_default_na=True,
+                )
+            except UnicodeDecodeError:
+                if encoding == encodings[-1]:
+                    raise
+                print(f"Re-reading {os.path.basename(file_path)} as latin1")
+
+    def read_csv_chunks(
+        self, file_path, file_format, encoding, usecols=None, typed=None
+    ):
+        """Chunks of a CSV, read with typed_read_options when given"""
+        return pd.read_csv(
+            file_path,
+            chunksize=self.stream_chunksize,
+            keep_default_na=True,
+            usecols=usecols,
+            **(typed or {"na_values": null_values}),
+            **{**read_options(file_format), "encoding": encoding},
+        )
 
-        for col, data in outliers.items():
-            html += f"""
-            <tr>
-                <td>{col}</td>
-                <td>{data['count']}</td>
-                <td>{data['percentage']}%</td>
-                <td>{data['lower_bound']}</td>
-                <td>{data['upper_bound']}</td>
-            </tr>
-            """
-        html += "</table>"
-        return html
-
-    def generate_correlations_table(self, correlations):
-        """Generate HTML table for correlation analysis"""
-        if not correlations:
-            return "<p class='no-data'>No significant correlations found</p>"
-
-        html = """
-        <table class='data-table'>
-            <tr>
-                <th>Column 1</th>
-                <th>Column 2</th>
-                <th>Correlation</th>
-            </tr>
+    def process_file_streaming(
+        self, file_path, file_metadata, output_dir=None, baseline=None
+    ):
         """
+        Profile a file larger than memory chunk by chunk and build the same
+        report as process_file. Null-like, sensitive, encrypted, duplicate and
+        format counts are exact; quantiles (median, Q1/Q3 and the outlier
+        fences) come from t-digests and are approximate on large columns.
+        """
+        file_name = os.path.basename(file_path)
+        print(f"Profiling {file_name} in chunks of {self.stream_chunksize:,} rows")
 
-        for corr in correlations:
-            html += f"""
-            <tr>
-                <td>{corr['column1']}</td>
-                <td>{corr['column2']}</td>
-                <td>{corr['correlation']}</td>
-            </tr>
-            """
-        html += "</table>"
-        return html
-
-    def generate_recommendations_list(self, recommendations):
-        """Generate HTML list for recommendations"""
-        if not recommendations:
-            return "<p class='no-data'>No specific recommendations generated</p>"
-
-        html = "<ul class='recommendations-list'>"
-        for rec in recommendations:
-            html += f"<li>{rec}</li>"
-        html += "</ul>"
-        return html
+        file_format = self.file_format(file_path)
+        encodings = fallback_encodings(file_format)
+
+        # Catalog column types first; a value that doesn't fit them (the file
+        # changed since it was cataloged) restarts the pass with inference
+        typed = typed_read_options(
+            file_metadata.data_types, file_format["header"], na_values=null_values
+        )
+        typed_attempts = [typed, None] if typed else [None]
+        failed_encodings = set()
+        for encoding, column_typed in [
+            (encoding, attempt) for encoding in encodings for attempt in typed_attempts
+        ]:
+            if encoding in failed_encodings:
+                continue
+            try:
+                profile = None
+                for chunk in self.read_csv_chunks(
+                    file_path, file_format, encoding, typed=column_typed
+                ):
+                    if profile is None:
+                        total_columns = len(chunk.columns)
+                        unique_columns = len(chunk.columns.unique())
+
+                        # Same column clean-up as the in-memory profile
+                        cleaned = chunk.columns.str.strip().str.replace(
+                            "\s+", " ", regex=True
+                        )
+                        positions = np.flatnonzero(~cleaned.duplicated())
+                        columns = cleaned[positions].tolist()
+
+                        mandatory_columns = file_metadata.flagged(
+                            "mandatory", columns
+                        )
+                        unique_columns_check = file_metadata.flagged("unique", columns)
+                        sensitive_columns = file_metadata.flagged(
+                            "sensitive", columns
+                        )
+                        encrypted_columns = file_metadata.flagged(
+                            "encrypted", columns
+                        )
+                        currency_columns = file_metadata.flagged("currency", columns)
+                        currency_pattern = self.currency_patterns["USD"]
+                        currency_counts = {}
+                        profile = StreamingFileProfile(
+                            check_columns=set(
+                                mandatory_columns + sensitive_columns + encrypted_columns
+                            ),
+                            duplicate_columns=unique_columns_check,
+                            numeric_candidates=[
+                                col
+                                for col in columns
+                                if not self.has_identifier_name(col)
+                            ],
+                            pattern_miner=self.pattern_miner,
+                        )
+
+                    chunk = chunk.iloc[:, positions]
+                    chunk.columns = columns
+                    profile.update(chunk)
+                    for col in currency_columns:
+                        counts = check_currency(chunk[col], currency_pattern)
+                        if col in currency_counts:
+                            counts = merge_currency_counts(currency_counts[col], counts)
+                        currency_counts[col] = counts
+                break
+            except UnicodeDecodeError:
+                if encoding == encodings[-1]:
+                    raise
+                failed_encodings.add(encoding)
+                print(f"Re-reading {file_name} as latin1")
+            except (ValueError, TypeError) as e:
+                if column_typed is None:
+                    raise
+                print(f"Re-reading {file_name} without catalog types ({e})")
+
+        if profile is None:
+            raise ValueError(f"No data rows in {file_name}")
+        total_rows = profile.row_count
+
+        plan = profile.stats_plan()
+        print(f"\nAnalyzing numeric columns: {plan.numeric_columns}")
+        correlations = []
+        if plan.numeric_columns:
+            # Second pass over the numeric columns only, for the outlier counts
+            column_positions = dict(zip(columns, positions))
+            usecols = [column_positions[col] for col in plan.numeric_columns]
+
+            def numeric_chunks():
+                for chunk in self.read_csv_chunks(
+                    file_path, file_format, encoding, usecols, column_typed
+                ):
+                    chunk.columns = plan.numeric_columns
+                    yield chunk
+
+            profile.count_outliers(plan, numeric_chunks())
+            if len(plan.numeric_columns) >= 2:
+                # Co-moments accumulated over the chunks give Pearson only
+                method = self.correlation_finder.method
+                if method != "pearson":
+                    print(
+                        f"{method.title()} correlations need the whole file in "
+                        f"memory; using Pearson for {file_name} in chunks"
+                    )
+                correlations = self.strong_correlations(
+                    profile.correlation_matrix(plan.numeric_columns)
+                )
+        desc_stats = plan.descriptive_stats()
+        outliers = self.summarize_outliers(plan)
+
+        null_counts = {}
+        for col in mandatory_columns:
+            count = null_like_count(profile.column_checks[col])
+            null_counts[col] = (count, f"({count} null values)")
+        duplicate_counts = {
+            col: (
+                counter.duplicate_rows,
+                f"({counter.duplicate_values} duplicate values)",
+            )
+            for col, counter in profile.duplicates.items()
+        }
+        sensitive_counts = {
+            col: (sensitive_count(profile.column_checks[col]), "(sensitive values)")
+            for col in sensitive_columns
+        }
+        encrypted_counts = {
+            col: (encrypted_count(profile.column_checks[col]), "(encrypted values)")
+            for col in encrypted_columns
+        }
+        pattern_stats = []
+        for col in columns:
+            if col in profile.text_columns:
+                result = self.pattern_miner.check_counts(*profile.shapes[col])
+                if result is not None:
+                    pattern_stats.append(self.pattern_stat(col, result, total_rows))
+
+        expected_columns = file_metadata.expected_columns
+        missing_columns = [col for col in expected_columns if col not in columns]
+        additional_columns = [col for col in columns if col not in expected_columns]
+
+        recommendations = self.generate_recommendations(
+            desc_stats, outliers, correlations
+        )
+
+        report_data = {
+            "file_name": file_name,
+            "file_path": file_path,
+            "total_rows": total_rows,
+            "total_columns": total_columns,
+            "unique_columns": unique_columns,
+            "file_metadata": file_metadata,
+            "mandatory_stats": self.format_column_stats(
+                null_counts, total_rows, "mandatory"
+            ),
+            "unique_stats": self.format_column_stats(
+                duplicate_counts, total_rows, "unique"
+            ),
+            "sensitive_stats": self.format_column_stats(
+                sensitive_counts, total_rows, "sensitive"
+            ),
+            "encrypted_stats": self.format_column_stats(
+                encrypted_counts, total_rows, "encrypted"
+            ),
+            "pattern_stats": pattern_stats,
+            "currency_stats": [
+                currency_stat(col, currency_counts[col], total_rows)
+                for col in currency_columns
+            ],
+            "descriptive_stats": desc_stats,
+            "outliers": outliers,
+            "correlations": correlations,
+            "recommendations": recommendations,
+            "missing_columns": missing_columns,
+            "additional_columns": additional_columns,
+        }
+
+        return self.finish_report(report_data, output_dir, baseline)
 
     def generate_individual_report(self, report_data):
-        """Generate individual HTML report for a file"""
+        """
+        Write the HTML report of a file, streamed from the templates in
+        report_rendering, and a compact JSON sidecar of the same report data
+        for downstream tooling
+        """
         try:
-            # Get metadata columns for this file
-            file_metadata = report_data["file_metadata"]
-            mandatory_columns = file_metadata[
-                file_metadata["Is Mandatory"].str.upper() == "YES"
-            ]["Column Name"].tolist()
-            unique_columns = file_metadata[
-                file_metadata["Is Unique"].str.upper() == "YES"
-            ]["Column Name"].tolist()
-            sensitive_columns = file_metadata[
-                file_metadata["Sensitive"].str.upper() == "YES"
-            ]["Column Name"].tolist()
-            encrypted_columns = file_metadata[
-                file_metadata["Encrypted"].str.upper() == "YES"
-            ]["Column Name"].tolist()
-            currency_columns = file_metadata[
-                file_metadata["Currency"].str.upper() == "YES"
-            ]["Column Name"].tolist()
-            # [col for col in report_data['currency_validation'].keys()] if 'currency_validation' in report_data else []
-            missing_columns = report_data.get("missing_columns", [])
-            additional_columns = report_data.get("additional_columns", [])
-
-            # Generate HTML report with corrected style
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Data Quality Report</title>
-                <style>
-                    body {{ 
-                        font-family: Arial, sans-serif; 
-                        margin: 20px; 
-                        background-color: #f5f5f5;
-                    }}
-                    .header {{ 
-                        background-color: #ffffff; 
-                        padding: 20px; 
-                        border-radius: 5px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                        margin-bottom: 20px;
-                    }}
-                    .section-header {{ 
-                        margin-top: 20px; 
-                        padding: 10px; 
-                        background-color: #e9ecef;
-                        border-radius: 5px;
-                    }}
-                    .data-table {{ 
-                        width: 100%; 
-                        border-collapse: collapse; 
-                        margin-top: 10px;
-                        background-color: #ffffff;
-                    }}
-                    .data-table th, .data-table td {{ 
-                        border: 1px solid #dee2e6; 
-                        padding: 12px; 
-                        text-align: left; 
-                    }}
-                    .data-table th {{ 
-                        background-color: #f8f9fa;
-                        color: #495057;
-                    }}
-                    .data-table tr:nth-child(even) {{
-                        background-color: #f8f9fa;
-                    }}
-                    .no-data {{ 
-                        color: #6c757d; 
-                        font-style: italic;
-                        padding: 20px;
-                        text-align: center;
-                    }}
-                    .column-list {{ 
-                        word-wrap: break-word; 
-                        max-width: 500px;
-                        color: #495057;
-                    }}
-                    .score-container {{
-                        padding: 20px;
-                        background-color: #ffffff;
-                        border-radius: 5px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                        margin: 20px 0;
-                    }}
-                    .overall-score {{
-                        text-align: center;
-                        font-size: 24px;
-                        color: #2c3e50;
-                        margin-bottom: 20px;
-                    }}
-                    # .score-interpretation {{
-                    #     font-style: italic;
-                    #     color: #6c757d;
-                    #     margin-bottom: 15px;
-                    #     text-align: center;
-                    # }}
-                    .component-scores {{
-                        margin-bottom: 20px;
-                    }}
-                    .score-table {{
-                        width: 100%;
-                        margin-bottom: 20px;
-                        border-collapse: collapse;
-                        background-color: #ffffff;
-                        table-layout: fixed;
-                    }}
-                    .score-table th, .score-table td {{
-                        border: 1px solid #dee2e6;
-                        padding: 12px;
-                        text-align: left;
-                    }}
-                    .score-table th {{
-                        background-color: #f8f9fa;
-                        color: #495057;
-                    }}
-                    .score-table th:first-child {{
-                        width: 40%;
-                    }}
-                    .score-table th:last-child {{
-                        width: 60%;
-                    }}
-                    .overall-score {{
-                        text-align: center;
-                        font-size: 24px;
-                        color: #2c3e50;
-                        margin: 20px 0;
-                        padding: 20px;
-                    }}
-                    .component-scores h4 {{
-                        margin-bottom: 15px;
-                        color: #2c3e50;
-                    }}
-                    .recommendations-list {{
-                        list-style-type: disc;
-                        margin-left: 20px;
-                        color: #495057;
-                    }}
-                    .analysis-section {{
-                        margin: 20px 0;
-                        padding: 20px;
-                        background-color: #ffffff;
-                        border-radius: 5px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    }}
-                    .section-title {{
-                        color: #2c3e50;
-                        border-bottom: 2px solid #3498db;
-                        padding-bottom: 10px;
-                        margin-bottom: 20px;
-                    }}
-                    h2 {{
-                        color: #2c3e50;
-                        margin-top: 0;
-                    }}
-                    h3 {{
-                        color: #2c3e50;
-                        margin-top: 0;
-                    }}
-                    h4 {{
-                        color: #2c3e50;
-                        margin-top: 0;
-                    }}
-                </style>
-            </head>
-            <body>
-            """
-
-            # Add header section
-            html += f"""
-                <div class='header'>
-                    <h2>Data Quality Report</h2>
-                    <p>File: {report_data['file_name']}</p>
-                    <p>Generated: {self.report_timestamp}</p>
-                    <table class='data-table'>
-                        <tr>
-                            <th>Total Rows</th>
-                            <td>{report_data['total_rows']:,}</td>
-                        </tr>
-                        <tr>
-                            <th>Total Columns</th>
-                            <td>{report_data['total_columns']:,}</td>
-                        </tr>
-                        <tr>
-                            <th>Missing Columns</th>
-                            <td class="column-list">{', '.join(missing_columns) if missing_columns else 'None'}</td>
-                        </tr>
-                        <tr>
-                            <th>Additional Columns</th>
-                            <td class="column-list">{', '.join(additional_columns) if additional_columns else 'None'}</td>
-                        </tr>
-                        <tr>
-                            <th>Mandatory Columns</th>
-                            <td class="column-list">{', '.join(mandatory_columns) if mandatory_columns else 'None'}</td>
-                        </tr>
-                        <tr>
-                            <th>Unique Columns</th>
-                            <td class="column-list">{', '.join(unique_columns) if unique_columns else 'None'}</td>
-                        </tr>
-                        <tr>
-                            <th>Sensitive Columns</th>
-                            <td class="column-list">{', '.join(sensitive_columns) if sensitive_columns else 'None'}</td>
-                        </tr>
-                        <tr>
-                            <th>Encrypted Columns</th>
-                            <td class="column-list">{', '.join(encrypted_columns) if encrypted_columns else 'None'}</td>
-                        </tr>
-                        <tr>
-                            <th>Currency Columns</th>
-                            <td class="column-list">{', '.join(currency_columns) if currency_columns else 'None'}</td>
-                        </tr>
-                    </table>
-                </div>
-            """
-
-            # Add Data Quality Score section
-            if "quality_score" in report_data:
-                html += f"""
-                    <div class='analysis-section'>
-                        <h3 class='section-title'>Data Quality Score</h3>
-                        <div class='score-container'>
-                            <div class='overall-score'>
-                                Overall Score: {report_data['quality_score']['overall_score']:.1f}
-                            </div>
-                            <div class='component-scores'>
-                                <h4>Component Scores:</h4>
-                                <table class='score-table'>
-                                    <thead>
-                                        <tr>
-                                            <th>Metric</th>
-                                            <th>Score</th>
-                                        </tr>
-                                    </thead>
-                                    <tbody>
-                """
-
-                # Add component scores
-                for metric, score in report_data["quality_score"][
-                    "component_scores"
-                ].items():
-                    html += f"""
-                        <tr>
-                            <td>{metric.title()}</td>
-                            <td>{score:.1f}</td>
-                        </tr>
-                    """
-
-                html += """
-                                    </tbody>
-                                </table>
-                            </div>
-                        </div>
-                    </div>
-                """
-
-            # Add sections for different types of columns
-            sections = [
-                ("Null Check", report_data.get("mandatory_stats", []), "mandatory"),
-                ("Duplicate Check", report_data.get("unique_stats", []), "unique"),
-                (
-                    "Sensitive Data Check",
-                    report_data.get("sensitive_stats", []),
-                    "sensitive",
-                ),
-                (
-                    "Encryption Check",
-                    report_data.get("encrypted_stats", []),
-                    "encrypted",
-                ),
-            ]
+            output_dir = report_data.get("output_dir", self.output_dir)
+            report_name = f"{output_dir}/reports_{report_data['file_name'].replace('.csv', '')}"
 
-            for section_name, stats, section_type in sections:
-                if stats:
-                    html += f"""
-                        <div class='section-header'>
-                            <h3>{section_name}</h3>
-                        </div>
-                        {self.generate_html_table(stats, section_type)}
-                    """
-
-            # Add analysis sections
-            html += f"""
-                <div class='analysis-section'>
-                    <h3 class='section-title'>Descriptive Statistics</h3>
-                    {self.generate_stats_table(report_data.get('descriptive_stats', {}))}
-                </div>
-
-                <div class='analysis-section'>
-                    <h3 class='section-title'>Outlier Analysis</h3>
-                    {self.generate_outliers_table(report_data.get('outliers', {}))}
-                </div>
-
-                <div class='analysis-section'>
-                    <h3 class='section-title'>Correlation Analysis</h3>
-                    {self.generate_correlations_table(report_data.get('correlations', []))}
-                </div>
-
-                <div class='analysis-section'>
-                    <h3 class='section-title'>Recommendations</h3>
-                    {self.generate_recommendations_list(report_data.get('recommendations', []))}
-                </div>
-            """
-
-            html += """
-                    </body>
-                </html>
-            """
-
-            # Save individual report
-            filename = f"{self.output_dir}/reports_{report_data['file_name'].replace('.csv', '')}.html"
+            filename = f"{report_name}.html"
             with open(filename, "w", encoding="utf-8") as f:
-                f.write(html)
+                write_html_report(f, report_data, self.report_timestamp)
             print(f"Individual report generated: {filename}")
 
+            with open(f"{report_name}.json", "w", encoding="utf-8") as f:
+                write_json_sidecar(f, report_data, self.report_timestamp)
+
         except Exception as e:
             print(f"Error generating report: {str(e)}")
             raise
@@ -1234,89 +1129,134 @@ class DataProfiler:
         column_lower = column_name.lower()
         return any(indicator in column_lower for indicator in self.currency_indicators)
 
-    def validate_currency_format(self, value, expected_currency="USD"):
-        """Validate currency format for a given value"""
-        if pd.isna(value):
-            return True  # Skip null values
-
-        str_value = str(value).strip()
-        str_value = (
-            str_value.replace("$", "")
-            .replace("€", "")
-            .replace("£", "")
-            .replace("₹", "")
-        )
-        pattern = self.currency_patterns.get(
-            expected_currency, self.currency_patterns["USD"]
-        )
-
-        if not re.match(pattern, str_value):
-            return False
-
-        try:
-            numeric_value = float(str_value.replace(",", ""))
-            if numeric_value < 0:
-                return False
-            return True
-        except ValueError:
-            return False
-
     def check_currency_format(self, df, column, expected_currency="USD"):
         """Check currency format compliance for a column"""
         try:
-            if df[column].dtype == object or np.issubdtype(df[column].dtype, np.number):
-                invalid_count = 0
-                negative_count = 0
-                zero_count = 0
-                total_count = len(df)
-
-                for value in df[column]:
-                    if pd.isna(value):
-                        continue
-
-                    str_value = str(value).strip()
-                    cleaned_value = (
-                        str_value.replace("$", "")
-                        .replace("€", "")
-                        .replace("£", "")
-                        .replace("₹", "")
-                        .replace(",", "")
-                    )
-
-                    try:
-                        numeric_value = float(cleaned_value)
-                        if numeric_value < 0:
-                            negative_count += 1
-                        elif numeric_value == 0:
-                            zero_count += 1
-                        elif not self.validate_currency_format(
-                            str_value, expected_currency
-                        ):
-                            invalid_count += 1
-                    except ValueError:
-                        invalid_count += 1
-
-                return {
-                    "invalid_format": invalid_count,
-                    "negative_values": negative_count,
-                    "zero_values": zero_count,
-                    "total_records": total_count,
-                    "invalid_percentage": round((invalid_count / total_count) * 100, 2),
-                    "negative_percentage": round(
-                        (negative_count / total_count) * 100, 2
-                    ),
-                    "zero_percentage": round((zero_count / total_count) * 100, 2),
-                }
-            return None
+            pattern = self.currency_patterns.get(
+                expected_currency, self.currency_patterns["USD"]
+            )
+            counts = check_currency(df[column], pattern)
+            return currency_stat(column, counts, len(df))
         except Exception as e:
             print(f"Error checking currency format for column {column}: {str(e)}")
             return None
 
+    def calculate_currency_stats(self, df, currency_columns):
+        """Currency report rows of the flagged columns"""
+        currency_stats = []
+        for column in currency_columns:
+            stat = self.check_currency_format(df, column)
+            if stat is not None:
+                currency_stats.append(stat)
+        return currency_stats
+
+
+# Per-process profiler, set up by init_dq_worker
+worker_profiler = None
+
+
+def init_dq_worker(
+    metadata_df, metadata_index, file_formats, report_timestamp, correlation_finder
+):
+    """Create this process's profiler from metadata already indexed by set_metadata"""
+    global worker_profiler
+    worker_profiler = DataProfiler()
+    worker_profiler.correlation_finder = correlation_finder
+    worker_profiler.metadata_df = metadata_df
+    worker_profiler.metadata_index = metadata_index
+    worker_profiler.file_formats = file_formats
+    worker_profiler.report_timestamp = report_timestamp
+
+
+def profile_task(task):
+    """
+    Profile the files of one task in order and write their reports in a
+    worker. A task holds the same file from each tree, e.g. its RAW and
+    Curated copies; each report is the baseline of the next one.
+    Returns {file path: report data, or None if the file failed}.
+    """
+    return run_profile_task(worker_profiler, task)
+
+
+def run_profile_task(profiler, task):
+    reports = {}
+    baseline = None
+    for file_path, output_dir in task:
+        report_data = profiler.process_file(file_path, output_dir, baseline)
+        reports[file_path] = report_data
+        baseline = report_data
+    return reports
+
+
+def file_size(file_path):
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def collect_dq_tasks(targets):
+    """Pair the files of every target tree by relative path, in target order"""
+    tasks = {}
+    for target in targets:
+        root = target["source_root_dir"]
+        for file_path in sorted(
+            glob.glob(os.path.join(root, "**", "*.csv"), recursive=True)
+        ):
+            relative_path = os.path.normcase(os.path.relpath(file_path, root))
+            tasks.setdefault(relative_path, []).append(
+                (file_path, target["output_dir"])
+            )
+    return list(tasks.values())
+
+
+def run_dq_tasks(profiler, tasks, workers):
+    """
+    Profile every task, across a pool of worker processes when configured.
+    Reports are written as each file finishes, and a task that fails (even
+    by taking its worker process down) does not stop the others.
+    Returns {file path: report data, or None for files that failed}.
+    """
+    reports = {}
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            reports.update(run_profile_task(profiler, task))
+        return reports
+
+    # Largest tasks first so one big file doesn't finish last on its own
+    tasks = sorted(
+        tasks,
+        key=lambda task: sum(file_size(file_path) for file_path, _ in task),
+        reverse=True,
+    )
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        initializer=init_dq_worker,
+        initargs=(
+            profiler.metadata_df,
+            profiler.metadata_index,
+            profiler.file_formats,
+            profiler.report_timestamp,
+            profiler.correlation_finder,
+        ),
+    ) as executor:
+        futures = {executor.submit(profile_task, task): task for task in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            task = futures[future]
+            try:
+                reports.update(future.result())
+            except Exception as e:
+                for file_path, _ in task:
+                    print(f"Error processing file {file_path}: {str(e)}")
+                    reports[file_path] = None
+            print(f"Finished {done}/{len(tasks)}: {task[0][0]}")
+    return reports
+
 
-def main():
+def main(target_names=None):
+    """Profile the given targets (default: all of dq_targets) in one run"""
     try:
-        # Configure paths
-        source_root_dir = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/RAW"
+        targets = [dq_targets[name] for name in (target_names or dq_targets)]
 
         # metadata_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Metadata/schemaMaster.csv"
         metadata_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/IQVIA FLOW/schemaMaster.csv"
@@ -1326,25 +1266,39 @@ def main():
         metadata_df = pd.read_csv(metadata_file)
         print(f"Metadata loaded successfully: {len(metadata_df)} rows")
 
-        # Initialize profiler and set metadata
+        # Initialize profiler and set metadata once for every target
         profiler = DataProfiler()
         profiler.set_metadata(metadata_df)
+        for target in targets:
+            os.makedirs(target["output_dir"], exist_ok=True)
 
-        # Process all CSV files
-        csv_files = glob.glob(
-            os.path.join(source_root_dir, "**", "*.csv"), recursive=True
-        )
-        print(f"\nFound {len(csv_files)} CSV files to process")
+        # Process all CSV files of every target
+        tasks = collect_dq_tasks(targets)
+        file_count = sum(len(task) for task in tasks)
+        print(f"\nFound {file_count} CSV files to process")
+
+        # Sniff each file's format once, or reuse it from the shared manifest
+        file_formats = FileFormatManifest()
+        for task in tasks:
+            for file_path, _ in task:
+                profiler.file_formats[file_path] = file_formats.format_of(file_path)
+        file_formats.save()
 
         # Process each file
-        for file_path in csv_files:
-            profiler.process_file(file_path)
+        reports = run_dq_tasks(profiler, tasks, dq_workers)
 
-        print("\nAll reports generated successfully!")
+        failed_files = [path for path, report in reports.items() if report is None]
+        if failed_files:
+            print(f"\nNo report generated for {len(failed_files)} files:")
+            for file_path in failed_files:
+                print(f"  - {file_path}")
+        else:
+            print("\nAll reports generated successfully!")
 
     except Exception as e:
         print(f"\nError in main execution: {str(e)}")
 
 
 if __name__ == "__main__":
-    main()
+    # Target names may be given on the command line, e.g. "Curated"
+    main(sys.argv[1:] or None)
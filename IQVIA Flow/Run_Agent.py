@@ -50,16 +50,7 @@ if os.path.exists(signal_file_path):
         f.write("")  # Clear the file content
     logging.info("Signal file content cleared.")
 
-# Step 6: Run the next Python scripts after Streamlit app is terminated
-logging.info("Running reports generation script (reports_generation.py)...")
-try:
-    subprocess.run(["python", "Pattern_Mining_Agent.py"], check=True)
-    logging.info("Reports generation script completed successfully.")
-except subprocess.CalledProcessError as e:
-    logging.error(f"Error running reports generation script: {e}")
-    raise
-
-# Step 7: Run the final script (Correction_Agent.py)
+# Step 6: Run the final script (Correction_Agent.py)
 logging.info("Running text correction script (Correction_Agent.py)...")
 try:
     subprocess.run(["python", "Repair_Agent.py"], check=True)
@@ -68,14 +59,14 @@ except subprocess.CalledProcessError as e:
     logging.error(f"Error running text correction script: {e}")
     raise
 
-logging.info("All steps completed successfully.")
-
-
-# Step 8: Run the next Python scripts after Streamlit app is terminated
-logging.info("Running reports generation script (Curated_Reports_Generation.py)...")
+# Step 7: Profile the RAW and Curated trees in one run; each Curated report
+# compares the file with its RAW copy
+logging.info("Running reports generation script (Pattern_Mining_Agent.py)...")
 try:
-    subprocess.run(["python", "Pattern_Mining_Curated.py"], check=True)
+    subprocess.run(["python", "Pattern_Mining_Agent.py"], check=True)
     logging.info("Reports generation script completed successfully.")
 except subprocess.CalledProcessError as e:
     logging.error(f"Error running reports generation script: {e}")
     raise
+
+logging.info("All steps completed successfully.")
@@ -0,0 +1,165 @@
+import re
+from itertools import combinations
+import numpy as np
+from column_profiler import hash_column, read_in_chunks
+
+# Odd 64-bit constant used to mix column hashes into a combination hash
+hash_multiplier = np.uint64(0x9E3779B97F4A7C15)
+
+
+def combine_hashes(column_hashes):
+    """Hash of a column combination from the per-column row hashes"""
+    combined = column_hashes[0].copy()
+    with np.errstate(over="ignore"):
+        for hashes in column_hashes[1:]:
+            combined = combined * hash_multiplier + hashes
+    return combined
+
+
+def frame_hashes(df, columns):
+    return {column: hash_column(df[column]) for column in columns}
+
+
+class CandidateKeyMiner:
+    """
+    Find the minimal column combinations that identify every row.
+
+    Rows are taken as they are, so a fully duplicated row breaks every key,
+    just as it makes each column not unique in the catalog. Combinations are
+    mined level by level on a sample of the file, apriori style: a
+    combination is only tried when all of its subsets were found not to be
+    unique, and combinations whose distinct counts multiply to less than the
+    row count are skipped without hashing. Keys found on the sample are
+    verified on the whole file.
+    """
+
+    def __init__(self, max_key_size=4, sample_rows=100_000, max_candidates=5000):
+        self.max_key_size = max_key_size
+        self.sample_rows = sample_rows
+        # Upper bound on combinations tried per level
+        self.max_candidates = max_candidates
+
+    def find_keys(self, file_path, profiles, file_format=None, dtype=None):
+        """
+        Return the minimal keys of a file as tuples of column names, reading
+        it in its sniffed format and with the dtype it was profiled with
+        """
+        # Key columns can't hold nulls, and constant columns never help
+        columns = [
+            column
+            for column, profile in profiles.items()
+            if profile.null_count == 0 and profile.distinct_count() > 1
+        ]
+        if not columns:
+            return []
+
+        try:
+            sample = next(
+                read_in_chunks(file_path, self.sample_rows, file_format, dtype)
+            )
+        except UnicodeDecodeError:
+            raise
+        except (ValueError, TypeError):
+            if dtype is None:
+                raise
+            # The file no longer fits its catalog types, as when profiling
+            dtype = None
+            sample = next(read_in_chunks(file_path, self.sample_rows, file_format))
+        hashes = frame_hashes(sample, columns)
+        row_count = len(sample)
+        distinct_counts = {
+            column: len(np.unique(hashes[column])) for column in columns
+        }
+
+        keys = []
+        level = [(column,) for column in columns]
+        for _ in range(self.max_key_size):
+            non_keys = set()
+            for combo in level:
+                if len(combo) == 1 and not profiles[combo[0]].is_unique():
+                    # Never a key where the catalog says the column isn't unique
+                    non_keys.add(combo)
+                    continue
+                if np.prod([float(distinct_counts[c]) for c in combo]) < row_count:
+                    non_keys.add(combo)
+                    continue
+                combo_hashes = combine_hashes([hashes[column] for column in combo])
+                if len(np.unique(combo_hashes)) == row_count:
+                    keys.append(combo)
+                else:
+                    non_keys.add(combo)
+            level = self.next_level(non_keys, columns)
+            if not level:
+                break
+
+        if len(sample) >= self.sample_rows:
+            keys = self.verify_keys(file_path, keys, file_format, dtype)
+        return keys
+
+    def next_level(self, non_keys, columns):
+        """Combinations one column larger whose every subset is not a key"""
+        order = {column: position for position, column in enumerate(columns)}
+        # Only combinations sharing all but their last column are joined
+        by_prefix = {}
+        for combo in sorted(non_keys, key=lambda combo: [order[c] for c in combo]):
+            by_prefix.setdefault(combo[:-1], []).append(combo[-1])
+
+        candidates = []
+        for prefix, last_columns in by_prefix.items():
+            for first, second in combinations(last_columns, 2):
+                combo = prefix + (first, second)
+                if all(
+                    subset in non_keys
+                    for subset in combinations(combo, len(combo) - 1)
+                ):
+                    candidates.append(combo)
+                    if len(candidates) >= self.max_candidates:
+                        return candidates
+        return candidates
+
+    def verify_keys(self, file_path, keys, file_format=None, dtype=None):
+        """Keep the keys that stay unique over every row of the whole file"""
+        key_columns = list(dict.fromkeys(column for key in keys for column in key))
+        for attempt in [dtype, None] if dtype else [None]:
+            seen_keys = {key: np.array([], dtype=np.uint64) for key in keys}
+            valid = set(keys)
+            try:
+                for chunk in read_in_chunks(
+                    file_path, self.sample_rows, file_format, attempt
+                ):
+                    hashes = frame_hashes(chunk, key_columns)
+                    for key in list(valid):
+                        key_hashes = combine_hashes([hashes[column] for column in key])
+                        unique_keys = np.unique(key_hashes)
+                        if len(unique_keys) < len(key_hashes) or np.isin(
+                            unique_keys, seen_keys[key], assume_unique=True
+                        ).any():
+                            valid.discard(key)
+                            continue
+                        seen_keys[key] = np.union1d(seen_keys[key], unique_keys)
+                break
+            except UnicodeDecodeError:
+                raise
+            except (ValueError, TypeError):
+                if attempt is None:
+                    raise
+        return [key for key in keys if key in valid]
+
+    def primary_key(self, keys, columns):
+        """Pick the primary key: fewest columns, ID-named columns, earliest first"""
+        if not keys:
+            return ()
+        order = {column: position for position, column in enumerate(columns)}
+
+        def is_id_column(column):
+            name = str(column).strip().lower()
+            return name.endswith("id") or re.search(r"\bid\b", name) is not None
+
+        return min(
+            keys,
+            key=lambda key: (
+                len(key),
+                -sum(is_id_column(column) for column in key),
+                [order[column] for column in key],
+            ),
+        )
@@ -0,0 +1,95 @@
+import os
+import json
+import pickle
+import hashlib
+
+# Changes whenever the cached rows or profiles change shape, so that caches
+# written by an older catalog are generated again
+cache_version = 3
+
+
+def file_content_hash(file_path, block_size=1 << 20):
+    """SHA-256 of the file contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CatalogManifest:
+    """
+    Record of the files already cataloged: path, size, mtime and content hash,
+    with the catalog rows and column profiles generated for each file cached
+    on disk under its path and content hash (identical files in two sources
+    keep a cache each, with their own source and file fields).
+
+    A file is unchanged when its size and mtime match the manifest, or when
+    they differ but its content hash still matches (e.g. after a copy).
+    """
+
+    def __init__(self, manifest_file, cache_dir):
+        self.manifest_file = manifest_file
+        self.cache_dir = cache_dir
+        self.entries = {}
+        if os.path.exists(manifest_file):
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self.current = {}  # Stat and hash of the files seen in this run
+
+    def cache_path(self, file_path, content_hash):
+        key = f"{cache_version}\n{file_path}\n{content_hash}"
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def is_unchanged(self, file_path):
+        stat = os.stat(file_path)
+        entry = self.entries.get(file_path)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime
+        ):
+            content_hash = entry["hash"]
+        else:
+            content_hash = file_content_hash(file_path)
+        self.current[file_path] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": content_hash,
+        }
+        return entry is not None and entry["hash"] == content_hash
+
+    def load_cached(self, file_path):
+        """Return the cached {"rows", "profiles"} of an unchanged file, if any"""
+        if not self.is_unchanged(file_path):
+            return None
+        cache_path = self.cache_path(file_path, self.current[file_path]["hash"])
+        if not os.path.exists(cache_path):
+            return None
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+
+    def store(self, file_path, rows, profiles):
+        """Cache the generated rows and profiles of a file under its path and content"""
+        if file_path not in self.current:
+            self.is_unchanged(file_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.cache_path(file_path, self.current[file_path]["hash"]), "wb") as f:
+            pickle.dump({"rows": rows, "profiles": profiles}, f)
+
+    def save(self):
+        """Write the manifest for the files seen in this run and drop stale caches"""
+        live_paths = {
+            self.cache_path(file_path, entry["hash"])
+            for file_path, entry in self.current.items()
+        }
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                cache_path = os.path.join(self.cache_dir, name)
+                if name.endswith(".pkl") and cache_path not in live_paths:
+                    os.remove(cache_path)
+        os.makedirs(os.path.dirname(self.manifest_file) or ".", exist_ok=True)
+        with open(self.manifest_file, "w", encoding="utf-8") as f:
+            json.dump(self.current, f, indent=2)
+        self.entries = dict(self.current)
@@ -0,0 +1,73 @@
+import re
+import pandas as pd
+
+# Strings counted as null-like on top of real nulls
+null_tokens = {"empty": "", "na": "NA", "nan": "NaN"}
+
+sensitive_patterns = {
+    "email": re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}"),
+    "credit_card": re.compile(r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b"),
+    "phone": re.compile(r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b"),
+}
+
+encrypted_patterns = {
+    "hex": re.compile(r"^[A-Fa-f0-9]{32,}$"),
+    "base64": re.compile(r"^[A-Za-z0-9+/]{32,}={0,2}$"),
+}
+
+null_checks = ["null", "empty", "space", "na", "nan", "none"]
+
+
+def check_column(series):
+    """
+    Null-like, sensitive and encrypted value counts of a column.
+
+    Every check runs in one traversal of the column's distinct values, and
+    each match is weighted by how often the value occurs, so the counts are
+    the same as checking every row.
+    """
+    counts = dict.fromkeys(
+        null_checks + list(sensitive_patterns) + list(encrypted_patterns), 0
+    )
+    if series.dtype != object:
+        # Numbers and dates are never null tokens, sensitive or encrypted
+        counts["null"] = int(series.isnull().sum())
+        return counts
+
+    for value, count in series.value_counts(dropna=False, sort=False).items():
+        if pd.isna(value):
+            counts["null"] += count
+            if value is None:
+                counts["none"] += count  # str(None) == "None"
+            continue
+
+        text = str(value)
+        if text.isspace():
+            counts["space"] += count
+        if text == "None":
+            counts["none"] += count
+        if not isinstance(value, str):
+            continue
+        for check, token in null_tokens.items():
+            if value == token:
+                counts[check] += count
+        for check, pattern in sensitive_patterns.items():
+            if pattern.search(value):
+                counts[check] += count
+        for check, pattern in encrypted_patterns.items():
+            if pattern.search(value):
+                counts[check] += count
+
+    return {check: int(count) for check, count in counts.items()}
+
+
+def null_like_count(counts):
+    return sum(counts[check] for check in null_checks)
+
+
+def sensitive_count(counts):
+    return sum(counts[check] for check in sensitive_patterns)
+
+
+def encrypted_count(counts):
+    return sum(counts[check] for check in encrypted_patterns)
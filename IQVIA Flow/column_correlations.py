@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+correlation_methods = ["pearson", "spearman", "kendall"]
+
+
+def strong_pairs(corr, threshold=0.7, offset=(0, 0), upper=True):
+    """
+    Column pairs of a correlation block whose |r| is above the threshold,
+    read with one mask instead of a loop over the cells. offset is the
+    position of the block in the full matrix; upper keeps only pairs above
+    its diagonal, for blocks that lie on it.
+    """
+    with np.errstate(invalid="ignore"):
+        mask = np.abs(corr) > threshold
+    if upper:
+        mask &= np.triu(np.ones(corr.shape, dtype=bool), k=1)
+    rows, cols = np.nonzero(mask)
+    return [
+        (offset[0] + i, offset[1] + j, corr[i, j]) for i, j in zip(rows, cols)
+    ]
+
+
+def format_pairs(pairs, columns):
+    """Report rows of (position, position, r) pairs, in matrix order"""
+    return [
+        {
+            "column1": columns[i],
+            "column2": columns[j],
+            "correlation": round(correlation, 2),
+        }
+        for i, j, correlation in sorted(pairs, key=lambda pair: pair[:2])
+    ]
+
+
+def matrix_correlations(corr_matrix, threshold=0.7):
+    """Strong pairs of a full correlation matrix given as a DataFrame"""
+    columns = list(corr_matrix.columns)
+    pairs = strong_pairs(corr_matrix.to_numpy(dtype=float), threshold)
+    return format_pairs(pairs, columns)
+
+
+class CorrelationFinder:
+    """
+    Find strongly correlated column pairs without building the full matrix.
+
+    The columns are split into groups of `block_size`, and only one
+    block-by-block slice of the matrix exists at a time; pairs above the
+    threshold are pulled out of each slice with a mask. Like DataFrame.corr,
+    each pair uses the rows where both columns have a value. Spearman
+    correlates ranks taken per column over its non-null values, and Kendall
+    is tau-b computed from the signs of all row-pair differences, which is
+    quadratic in rows: tall files are sampled down to `sample_rows` rows
+    first (by default only for Kendall).
+    """
+
+    def __init__(
+        self,
+        method="pearson",
+        threshold=0.7,
+        block_size=128,
+        sample_rows=None,
+        kendall_sample_rows=5_000,
+        seed=42,
+    ):
+        if method not in correlation_methods:
+            raise ValueError(f"Unknown correlation method: {method}")
+        self.method = method
+        self.threshold = threshold
+        self.block_size = block_size
+        self.sample_rows = sample_rows
+        if sample_rows is None and method == "kendall":
+            self.sample_rows = kendall_sample_rows
+        self.seed = seed
+
+    def sample(self, block):
+        if self.sample_rows is None or len(block) <= self.sample_rows:
+            return block
+        rng = np.random.default_rng(self.seed)
+        rows = np.sort(rng.choice(len(block), self.sample_rows, replace=False))
+        return block[rows]
+
+    def find(self, block, columns):
+        """Report rows of the strong pairs among the columns of a float block"""
+        block = self.sample(np.asarray(block, dtype=float))
+        if self.method == "spearman":
+            block = pd.DataFrame(block).rank().to_numpy(dtype=float)
+
+        pairs = []
+        starts = range(0, len(columns), self.block_size)
+        for first in starts:
+            left = block[:, first : first + self.block_size]
+            for second in starts:
+                if second < first:
+                    continue
+                right = block[:, second : second + self.block_size]
+                if self.method == "kendall":
+                    corr = kendall_block(left, right)
+                else:
+                    corr = pearson_block(left, right)
+                pairs += strong_pairs(
+                    corr,
+                    self.threshold,
+                    offset=(first, second),
+                    upper=first == second,
+                )
+        return format_pairs(pairs, columns)
+
+
+def pearson_block(left, right):
+    """Pairwise-complete Pearson correlation between two column groups"""
+    left_valid = ~np.isnan(left)
+    right_valid = ~np.isnan(right)
+    with np.errstate(all="ignore"):
+        if left_valid.all() and right_valid.all():
+            left = left - left.mean(axis=0)
+            right = right - right.mean(axis=0)
+            left /= np.linalg.norm(left, axis=0)
+            right /= np.linalg.norm(right, axis=0)
+            return np.clip(left.T @ right, -1, 1)
+
+        # Shift by the column means first so the sums below stay small
+        left = np.where(left_valid, left - np.nanmean(left, axis=0), 0.0)
+        right = np.where(right_valid, right - np.nanmean(right, axis=0), 0.0)
+        left_valid = left_valid.astype(float)
+        right_valid = right_valid.astype(float)
+
+        count = left_valid.T @ right_valid
+        left_sum = left.T @ right_valid
+        right_sum = left_valid.T @ right
+        cov = left.T @ right - left_sum * right_sum / count
+        left_var = (left**2).T @ right_valid - left_sum**2 / count
+        right_var = left_valid.T @ right**2 - right_sum**2 / count
+        corr = cov / np.sqrt(left_var * right_var)
+        return np.clip(corr, -1, 1)
+
+
+def kendall_block(left, right, pairs_per_step=2_000_000):
+    """Pairwise-complete Kendall tau-b between two column groups"""
+    n = len(left)
+    numerator = np.zeros((left.shape[1], right.shape[1]))
+    left_untied = np.zeros_like(numerator)
+    right_untied = np.zeros_like(numerator)
+    width = max(left.shape[1], right.shape[1], 1)
+    step = max(1, pairs_per_step // (n * width))
+    for start in range(0, n - 1, step):
+        stop = min(start + step, n - 1)
+        # Signs of x[j] - x[i] for every row pair i < j with i in this step
+        first_rows = np.arange(start, stop)
+        pair_counts = n - 1 - first_rows
+        i = np.repeat(first_rows, pair_counts)
+        offsets = np.arange(len(i)) - np.repeat(
+            np.cumsum(pair_counts) - pair_counts, pair_counts
+        )
+        j = i + 1 + offsets
+        left_signs = np.nan_to_num(np.sign(left[j] - left[i]))
+        right_signs = np.nan_to_num(np.sign(right[j] - right[i]))
+        left_pair_valid = ~(np.isnan(left[j]) | np.isnan(left[i]))
+        right_pair_valid = ~(np.isnan(right[j]) | np.isnan(right[i]))
+
+        numerator += left_signs.T @ right_signs
+        left_untied += (left_signs**2).T @ right_pair_valid
+        right_untied += left_pair_valid.T.astype(float) @ right_signs**2
+    with np.errstate(all="ignore"):
+        return numerator / np.sqrt(left_untied * right_untied)
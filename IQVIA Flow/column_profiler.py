@@ -0,0 +1,444 @@
+import warnings
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+from file_sniffer import read_options
+from typed_reader import typed_read_options
+
+
+# Text pandas passes over when it infers a date format from the first value
+missing_date_text = {"", "now", "today", "nan", "NaN", "NAN", "nat", "NaT", "NAT"}
+
+
+def first_date_format(text):
+    """The format pandas.to_datetime would infer from the first usable value"""
+    for value in text:
+        if value not in missing_date_text:
+            return guess_datetime_format(value)
+    return None
+
+
+def canonical_text(values):
+    """
+    Text of every value as it reads in the file, whatever dtype its chunk was
+    read with: whole numbers without a decimal part ("1", not "1.0"), other
+    numbers as their shortest repr and everything else as a string
+    """
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype(str)
+    if pd.api.types.is_float_dtype(values):
+        numbers = values.to_numpy(dtype="float64")
+        whole = np.isfinite(numbers) & (numbers == np.floor(numbers))
+        whole &= np.abs(numbers) < 2**63
+        text = values.astype(str).to_numpy(dtype=object)
+        text[whole] = numbers[whole].astype(np.int64).astype(str)
+        return pd.Series(text, index=values.index, dtype=object)
+    return values.astype(object).where(values.notnull(), None).astype(str)
+
+
+def hash_column(values):
+    """
+    64-bit hash of every row, from its canonical text, so that a value hashes
+    the same in a chunk read as numbers and in one read as text (a column's
+    dtype can change from chunk to chunk)
+    """
+    return pd.util.hash_pandas_object(canonical_text(values), index=False).to_numpy(
+        dtype=np.uint64
+    )
+
+
+def hash_values(values):
+    """64-bit hashes of the non-null values"""
+    return hash_column(values.dropna())
+
+
+def leading_zeros(words):
+    """Vectorized count of leading zero bits of non-zero uint64 values"""
+    words = words.copy()
+    zeros = np.zeros(len(words), dtype=np.uint8)
+    for shift in [32, 16, 8, 4, 2, 1]:
+        # The top `shift` bits are zero when the word is below 2 ** (64 - shift)
+        mask = words < (np.uint64(1) << np.uint64(64 - shift))
+        zeros[mask] += shift
+        words[mask] <<= np.uint64(shift)
+    return zeros
+
+
+class HyperLogLog:
+    """Mergeable HyperLogLog distinct-count sketch over 64-bit hashes"""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # Sentinel bit keeps the remaining word non-zero
+        remainder = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = leading_zeros(remainder) + 1
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        empty_registers = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and empty_registers > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / empty_registers)
+        return int(round(estimate))
+
+
+class ColumnProfile:
+    """
+    Mergeable per-column accumulator updated chunk by chunk.
+
+    Holds null counts, distinct counts (exact hash set up to `exact_limit`
+    values, HyperLogLog afterwards), a bottom-k MinHash sketch, min/max, the step between consecutive
+    numeric values, row counts per type class and a bounded sample of distinct
+    values, so memory stays flat whatever the file size.
+    """
+
+    type_classes = ["int", "float", "date", "string", "bool"]
+
+    def __init__(
+        self,
+        name,
+        value_checks=None,
+        exact_limit=100_000,
+        sample_size=1000,
+        sketch_size=256,
+    ):
+        self.name = name
+        self.value_checks = value_checks or {}
+        self.exact_limit = exact_limit
+        self.sample_size = sample_size
+        self.sketch_size = sketch_size
+
+        self.row_count = 0
+        self.null_count = 0
+        self.hll = HyperLogLog()
+        self.exact_hashes = np.array([], dtype=np.uint64)
+        self.min_hashes = np.array([], dtype=np.uint64)
+        self.duplicate_seen = False
+        self.min_value = None
+        self.max_value = None
+        self.max_length = None
+        self.all_numeric = True
+        self.whole_numbers = True
+        self.first_value = None
+        self.last_value = None
+        self.step = None
+        self.constant_step = True
+        self.type_counts = dict.fromkeys(self.type_classes, 0)
+        self.check_results = dict.fromkeys(self.value_checks, "No")
+        self.sample = pd.Series(dtype=object)
+
+    def update(self, values):
+        """Fold one chunk of the column into the accumulator"""
+        values = values.reset_index(drop=True)
+        self.row_count += len(values)
+        self.null_count += int(values.isnull().sum())
+
+        self.update_distinct(hash_values(values))
+        self.update_range(values)
+        self.update_step(values)
+        self.update_types(values)
+
+        distinct_values = pd.Series(values.unique())
+        for check_name, check in self.value_checks.items():
+            if self.check_results[check_name] == "No":
+                self.check_results[check_name] = check(distinct_values)
+
+        if len(self.sample) < self.sample_size:
+            self.sample = (
+                pd.concat([self.sample, distinct_values], ignore_index=True)
+                if len(self.sample)
+                else distinct_values
+            )
+            self.sample = self.sample.drop_duplicates().head(self.sample_size)
+
+    def update_distinct(self, hashes):
+        self.hll.add_hashes(hashes)
+        chunk_hashes = np.unique(hashes)
+        # The k smallest distinct hashes form a one-permutation MinHash sketch
+        self.min_hashes = np.union1d(
+            self.min_hashes, chunk_hashes[: self.sketch_size]
+        )[: self.sketch_size]
+        if self.exact_hashes is None:
+            return
+        if len(chunk_hashes) < len(hashes) or np.isin(
+            chunk_hashes, self.exact_hashes, assume_unique=True
+        ).any():
+            self.duplicate_seen = True
+        self.exact_hashes = np.union1d(self.exact_hashes, chunk_hashes)
+        if len(self.exact_hashes) > self.exact_limit:
+            # Past the limit only the sketch is kept
+            self.exact_hashes = None
+
+    def update_range(self, values):
+        non_null = values.dropna()
+        if non_null.empty:
+            return
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+            values
+        ):
+            chunk_min, chunk_max = non_null.min(), non_null.max()
+            if self.whole_numbers and pd.api.types.is_float_dtype(values):
+                self.whole_numbers = bool((non_null % 1 == 0).all())
+            self.min_value = (
+                chunk_min if self.min_value is None else min(self.min_value, chunk_min)
+            )
+            self.max_value = (
+                chunk_max if self.max_value is None else max(self.max_value, chunk_max)
+            )
+        else:
+            chunk_length = int(non_null.astype(str).str.len().max())
+            self.max_length = (
+                chunk_length
+                if self.max_length is None
+                else max(self.max_length, chunk_length)
+            )
+
+    def update_step(self, values):
+        """Track whether consecutive values differ by one constant step"""
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(
+            values
+        ):
+            self.all_numeric = False
+            return
+        if len(values) == 0:
+            return
+        if self.first_value is None and self.row_count == len(values):
+            self.first_value = values.iloc[0]
+        if self.last_value is not None:
+            values = pd.concat([pd.Series([self.last_value]), values], ignore_index=True)
+        self.last_value = values.iloc[-1]
+
+        steps = values.diff().dropna().unique()
+        if len(steps) == 0 or not self.constant_step:
+            return
+        if self.step is None:
+            self.step = steps[0]
+        if len(steps) > 1 or steps[0] != self.step:
+            self.constant_step = False
+
+    def update_types(self, values):
+        non_null = values.dropna()
+        if non_null.empty:
+            return
+        if pd.api.types.is_bool_dtype(values):
+            self.type_counts["bool"] += len(non_null)
+        elif pd.api.types.is_integer_dtype(values):
+            self.type_counts["int"] += len(non_null)
+        elif pd.api.types.is_float_dtype(values):
+            self.type_counts["float"] += len(non_null)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            self.type_counts["date"] += len(non_null)
+        else:
+            # Classify distinct strings once and weight by their frequency;
+            # first-appearance order keeps pandas' date format inference
+            value_counts = non_null.value_counts(sort=False).reindex(non_null.unique())
+            text = pd.Series(value_counts.index.astype(str))
+            with warnings.catch_warnings():
+                # With no format inferred each value is parsed by dateutil;
+                # pandas would warn about that once per chunk
+                warnings.simplefilter("ignore", UserWarning)
+                parsed = pd.to_datetime(
+                    text, format=first_date_format(text), errors="coerce"
+                )
+            date_rows = int(value_counts[parsed.notnull().to_numpy()].sum())
+            self.type_counts["date"] += date_rows
+            self.type_counts["string"] += len(non_null) - date_rows
+
+    def merge(self, other):
+        """Merge the profile of the chunks that directly follow this profile's rows"""
+        if self.exact_hashes is not None and other.exact_hashes is not None:
+            if other.duplicate_seen or np.isin(
+                other.exact_hashes, self.exact_hashes, assume_unique=True
+            ).any():
+                self.duplicate_seen = True
+            self.exact_hashes = np.union1d(self.exact_hashes, other.exact_hashes)
+            if len(self.exact_hashes) > self.exact_limit:
+                self.exact_hashes = None
+        else:
+            self.exact_hashes = None
+            self.duplicate_seen = self.duplicate_seen or other.duplicate_seen
+        self.hll.merge(other.hll)
+        self.min_hashes = np.union1d(self.min_hashes, other.min_hashes)[
+            : self.sketch_size
+        ]
+
+        if self.row_count and other.row_count and self.all_numeric and other.all_numeric:
+            # The step between the last value here and the first value there
+            if self.last_value is not None and other.first_value is not None:
+                boundary = other.first_value - self.last_value
+                if not pd.isna(boundary):
+                    if self.step is None:
+                        self.step = boundary
+                    elif boundary != self.step:
+                        self.constant_step = False
+        if other.step is not None:
+            if self.step is None:
+                self.step = other.step
+            elif other.step != self.step:
+                self.constant_step = False
+        self.constant_step = self.constant_step and other.constant_step
+        self.all_numeric = self.all_numeric and other.all_numeric
+        self.whole_numbers = self.whole_numbers and other.whole_numbers
+        if other.row_count:
+            if self.first_value is None and not self.row_count:
+                self.first_value = other.first_value
+            self.last_value = other.last_value
+
+        self.row_count += other.row_count
+        self.null_count += other.null_count
+        for bound, pick in [("min_value", min), ("max_value", max), ("max_length", max)]:
+            mine, theirs = getattr(self, bound), getattr(other, bound)
+            if theirs is not None:
+                setattr(self, bound, theirs if mine is None else pick(mine, theirs))
+        for type_class in self.type_classes:
+            self.type_counts[type_class] += other.type_counts[type_class]
+        for check_name, result in other.check_results.items():
+            if result == "Yes":
+                self.check_results[check_name] = "Yes"
+        if len(self.sample) < self.sample_size:
+            self.sample = (
+                pd.concat([self.sample, other.sample], ignore_index=True)
+                .drop_duplicates()
+                .head(self.sample_size)
+            )
+        return self
+
+    def distinct_count(self):
+        if self.exact_hashes is not None:
+            return len(self.exact_hashes)
+        return self.hll.count()
+
+    def contained_in(self, other):
+        """
+        Fraction of this column's distinct values found in the other column:
+        exact from the hash sets when both are kept, otherwise estimated from
+        the MinHash sketches
+        """
+        if len(self.min_hashes) == 0:
+            return 0.0
+        if self.exact_hashes is not None and other.exact_hashes is not None:
+            found = np.isin(self.exact_hashes, other.exact_hashes, assume_unique=True)
+            return float(found.mean())
+        if len(other.min_hashes) < other.sketch_size:
+            # The other sketch holds all of its values
+            threshold = np.iinfo(np.uint64).max
+        else:
+            threshold = other.min_hashes[-1]
+        # Only hashes below the other sketch's k-th smallest can be compared
+        comparable = self.min_hashes[self.min_hashes <= threshold]
+        if len(comparable) == 0:
+            return 0.0
+        return float(np.isin(comparable, other.min_hashes, assume_unique=True).mean())
+
+    def is_mandatory(self):
+        return self.null_count == 0
+
+    def is_unique(self):
+        """Every row holds a distinct, non-null value"""
+        if self.null_count > 0 or self.duplicate_seen:
+            return False
+        if self.exact_hashes is not None:
+            return True
+        # Past the exact limit accept the sketch estimate within 3 standard errors
+        tolerance = 3 * self.hll.relative_error()
+        return self.hll.count() >= self.row_count * (1 - tolerance)
+
+    def is_numeric(self):
+        return self.all_numeric and self.row_count > 0
+
+    def holds_whole_numbers(self):
+        """Numbers with no fractional part, e.g. integer IDs read as float for a null"""
+        return self.is_numeric() and self.min_value is not None and self.whole_numbers
+
+    def is_auto_gen(self):
+        """Numeric values increasing by exactly one from row to row"""
+        return (
+            self.is_numeric()
+            and self.constant_step
+            and self.step is not None
+            and self.step == 1
+        )
+
+    def data_type(self):
+        """User-friendly data type from the type-class counts"""
+        counts = self.type_counts
+        if counts["string"]:
+            return "string"
+        if counts["date"]:
+            # Date only if every row parses, as when reading the whole column
+            if self.null_count == 0 and counts["date"] == self.row_count:
+                return "date"
+            return "string"
+        if counts["bool"] and not (counts["int"] or counts["float"]):
+            return "boolean"
+        if counts["float"] or (counts["int"] and self.null_count):
+            return "float"
+        if counts["int"]:
+            return "int"
+        return "float"  # All-null columns are read as float
+
+
+def read_in_chunks(file_path, chunksize, file_format=None, dtype=None):
+    """Yield DataFrame chunks of a CSV (in its sniffed format, if given) or Excel file"""
+    if file_path.endswith(".xlsx"):
+        # Excel files can't be streamed by pandas and are read at once
+        yield pd.read_excel(file_path)
+        return
+    yield from pd.read_csv(
+        file_path, chunksize=chunksize, dtype=dtype, **read_options(file_format)
+    )
+
+
+def catalog_dtype(file_path, file_format=None, column_types=None):
+    """dtype argument reading a CSV with its known column types, if any"""
+    if column_types and file_format is not None and not file_path.endswith(".xlsx"):
+        return typed_read_options(column_types, file_format["header"]).get("dtype")
+    return None
+
+
+def profile_file(
+    file_path,
+    chunksize=100_000,
+    value_checks=None,
+    file_format=None,
+    column_types=None,
+):
+    """
+    Profile every column of a file in one streaming pass. Columns with a
+    known type (from the previous catalog) are read with it; if the file no
+    longer fits those types the pass restarts with inference.
+    """
+    dtype = catalog_dtype(file_path, file_format, column_types)
+    for attempt in [dtype, None] if dtype else [None]:
+        profiles = {}
+        try:
+            for chunk in read_in_chunks(file_path, chunksize, file_format, attempt):
+                for column in chunk.columns:
+                    if column not in profiles:
+                        profiles[column] = ColumnProfile(
+                            column, value_checks=value_checks
+                        )
+                    profiles[column].update(chunk[column])
+            return profiles
+        except UnicodeDecodeError:
+            raise
+        except (ValueError, TypeError) as e:
+            if attempt is None:
+                raise
+            print(f"Profiling {file_path} without catalog types ({e})")
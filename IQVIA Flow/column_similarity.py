@@ -0,0 +1,161 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+# Domain synonyms mapped to one word before names are compared
+name_synonyms = {
+    "med": "drug",
+    "meds": "drug",
+    "medication": "drug",
+    "medicine": "drug",
+    "product": "drug",
+    "qty": "quantity",
+    "amt": "amount",
+    "dr": "doctor",
+    "no": "number",
+    "num": "number",
+    "phone": "contact",
+    "mail": "email",
+}
+
+
+def normalize_column_name(column_name):
+    """Lower-case words with synonyms unified: "Med Name " -> "drug name" """
+    words = re.findall(r"[a-z0-9]+", str(column_name).lower())
+    return " ".join(name_synonyms.get(word, word) for word in words)
+
+
+def name_ngrams(column_name, n=3):
+    """Character n-grams of the normalized name, padded so short names still match"""
+    padded = f" {normalize_column_name(column_name)} "
+    return {padded[i : i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def jaccard(first, second):
+    if not first and not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    """k-permutation MinHash signatures over 64-bit hashes"""
+
+    def __init__(self, num_perm=64, seed=42):
+        rng = np.random.default_rng(seed)
+        # Odd multipliers keep each permutation a bijection on uint64
+        self.a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        with np.errstate(over="ignore"):
+            return (hashes[:, None] * self.a + self.b).min(axis=0)
+
+
+class SimilarColumnMatcher:
+    """
+    Link similar columns across the catalog by name and by values.
+
+    Each column gets two MinHash signatures, one over the character n-grams
+    of its normalized name and one over its value sketch from the column
+    profiler. Locality-sensitive hashing on signature bands yields candidate
+    pairs, so only columns sharing a band are ever compared. A pair is similar
+    when its names are (n-gram Jaccard), or when its values are and its names
+    still share some n-grams: dense codes such as 1..N or S001..S0NN overlap
+    in any two key columns, whatever they identify. The score of a pair is
+    the larger of its name and value Jaccard.
+    """
+
+    def __init__(
+        self,
+        name_threshold=0.75,
+        value_threshold=0.5,
+        min_name_similarity=0.3,
+        bands=16,
+        rows_per_band=4,
+        min_distinct=2,
+    ):
+        self.name_threshold = name_threshold
+        self.value_threshold = value_threshold
+        self.min_name_similarity = min_name_similarity
+        self.bands = bands
+        self.rows_per_band = rows_per_band
+        self.min_distinct = min_distinct
+        self.hasher = MinHasher(num_perm=bands * rows_per_band)
+        self.columns = []  # (key, name n-grams, profile)
+        self.buckets = {}  # (kind, band, band signature) -> column positions
+
+    def add_column(self, key, column_name, profile):
+        """Register a column under a key such as (source, file name, column name)"""
+        position = len(self.columns)
+        grams = name_ngrams(column_name)
+        self.columns.append((key, grams, profile))
+
+        gram_hashes = pd.util.hash_array(np.array(sorted(grams), dtype=object))
+        self.add_to_buckets("name", position, self.hasher.signature(gram_hashes))
+        if (
+            profile is not None
+            and len(profile.min_hashes)
+            and profile.distinct_count() >= self.min_distinct
+        ):
+            self.add_to_buckets(
+                "value", position, self.hasher.signature(profile.min_hashes)
+            )
+
+    def add_to_buckets(self, kind, position, signature):
+        for band in range(self.bands):
+            rows = signature[band * self.rows_per_band : (band + 1) * self.rows_per_band]
+            self.buckets.setdefault((kind, band, rows.tobytes()), []).append(position)
+
+    def candidate_pairs(self):
+        pairs = set()
+        for positions in self.buckets.values():
+            for i, first in enumerate(positions):
+                for second in positions[i + 1 :]:
+                    pairs.add((first, second))
+        return pairs
+
+    def value_similarity(self, profile, other):
+        """Jaccard of the value sets: exact from hash sets, else from the sketches"""
+        if profile is None or other is None:
+            return 0.0
+        if profile.exact_hashes is not None and other.exact_hashes is not None:
+            common = len(np.intersect1d(profile.exact_hashes, other.exact_hashes))
+            union = len(profile.exact_hashes) + len(other.exact_hashes) - common
+            return common / union if union else 0.0
+        size = min(len(profile.min_hashes), len(other.min_hashes))
+        if size == 0:
+            return 0.0
+        union_sketch = np.union1d(profile.min_hashes, other.min_hashes)[:size]
+        in_both = np.isin(union_sketch, profile.min_hashes) & np.isin(
+            union_sketch, other.min_hashes
+        )
+        return float(in_both.mean())
+
+    def find(self):
+        """Return {key: [(other key, score), ...]} with the best matches first"""
+        matches = {}
+        for first, second in self.candidate_pairs():
+            key, grams, profile = self.columns[first]
+            other_key, other_grams, other_profile = self.columns[second]
+            name_score = jaccard(grams, other_grams)
+            value_score = 0.0
+            if (
+                profile is not None
+                and other_profile is not None
+                and profile.data_type() == other_profile.data_type()
+            ):
+                value_score = self.value_similarity(profile, other_profile)
+            similar_names = name_score >= self.name_threshold
+            similar_values = (
+                value_score >= self.value_threshold
+                and name_score >= self.min_name_similarity
+            )
+            if not similar_names and not similar_values:
+                continue
+            score = round(max(name_score, value_score), 2)
+            matches.setdefault(key, []).append((other_key, score))
+            matches.setdefault(other_key, []).append((key, score))
+        for key in matches:
+            matches[key].sort(key=lambda match: (-match[1], match[0]))
+        return matches
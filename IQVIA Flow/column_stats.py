@@ -0,0 +1,100 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+# Quantiles every report section reads: Q1, median, Q3
+quantile_levels = [0.25, 0.5, 0.75]
+
+
+class ColumnStatsPlan:
+    """
+    Descriptive statistics of the analyzable numeric columns of one file.
+
+    Built once per file: the numeric columns are stacked into one float
+    block, and mean, std, min, max and every quantile are computed with a
+    single vectorized call each over that block. The descriptive statistics,
+    outlier and correlation sections all read from the plan instead of
+    recomputing per column. A plan can also be built from statistics that
+    were accumulated chunk by chunk, in which case the outlier counts come
+    from a separate pass over the file.
+    """
+
+    def __init__(self, numeric_columns, row_count, integer_columns, summary):
+        self.numeric_columns = list(numeric_columns)
+        self.row_count = row_count
+        self.integer_columns = set(integer_columns)
+        self.mean = summary["mean"]
+        self.std = summary["std"]
+        self.min = summary["min"]
+        self.max = summary["max"]
+        self.q1 = summary["q1"]
+        self.median = summary["median"]
+        self.q3 = summary["q3"]
+        self.block = None
+        self.outlier_rows = None  # Outlier counts when there is no block
+
+    @classmethod
+    def from_frame(cls, df, numeric_columns):
+        numeric_columns = list(numeric_columns)
+        integer_columns = [
+            col
+            for col in numeric_columns
+            if pd.api.types.is_integer_dtype(df[col].dtype)
+        ]
+        block = df[numeric_columns].to_numpy(dtype=float)
+
+        # All-null and single-value columns give NaN, as in pandas
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            q1, median, q3 = np.nanquantile(block, quantile_levels, axis=0)
+            summary = {
+                "mean": np.nanmean(block, axis=0),
+                "std": np.nanstd(block, axis=0, ddof=1),
+                "min": np.nanmin(block, axis=0),
+                "max": np.nanmax(block, axis=0),
+                "q1": q1,
+                "median": median,
+                "q3": q3,
+            }
+
+        plan = cls(numeric_columns, len(df), integer_columns, summary)
+        plan.block = block
+        return plan
+
+    def position(self, col):
+        return self.numeric_columns.index(col)
+
+    def extreme(self, values, col):
+        """Min/max keep the column's integer type, as pandas does"""
+        value = values[self.position(col)]
+        if col in self.integer_columns and not np.isnan(value):
+            return int(value)
+        return value
+
+    def descriptive_stats(self):
+        """Rounded mean, median, std, min, max, Q1 and Q3 per column"""
+        stats = {}
+        for i, col in enumerate(self.numeric_columns):
+            stats[col] = {
+                "mean": round(self.mean[i], 2),
+                "median": round(self.median[i], 2),
+                "std": round(self.std[i], 2),
+                "min": round(self.extreme(self.min, col), 2),
+                "max": round(self.extreme(self.max, col), 2),
+                "q1": round(self.q1[i], 2),
+                "q3": round(self.q3[i], 2),
+            }
+        return stats
+
+    def iqr_bounds(self, factor=1.5):
+        iqr = self.q3 - self.q1
+        return self.q1 - factor * iqr, self.q3 + factor * iqr
+
+    def outlier_counts(self, factor=1.5):
+        """Values outside the IQR fences per column, from one mask over the block"""
+        lower_bounds, upper_bounds = self.iqr_bounds(factor)
+        if self.block is None:
+            return self.outlier_rows, lower_bounds, upper_bounds
+        with np.errstate(invalid="ignore"):
+            mask = (self.block < lower_bounds) | (self.block > upper_bounds)
+        return mask.sum(axis=0), lower_bounds, upper_bounds
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+currency_counts = ["invalid_format", "negative_values", "zero_values"]
+
+# Symbols dropped before a value is read as a number
+currency_symbols = r"[$€£₹]"
+
+
+def check_currency(series, pattern):
+    """
+    Invalid, negative and zero amount counts of a currency column.
+
+    Only the distinct values are parsed, with vectorized string operations
+    and pd.to_numeric, and each is weighted by how often it occurs. A value
+    is invalid when it is not a number once symbols and thousands separators
+    are dropped, or when a positive amount doesn't match the format pattern.
+    Values already parsed as numbers have no text format left to check.
+    """
+    counts = dict.fromkeys(currency_counts, 0)
+    value_counts = series.dropna().value_counts(sort=False)
+    if value_counts.empty:
+        return counts
+    frequency = value_counts.to_numpy()
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        numbers = pd.Series(value_counts.index, dtype=float)
+        format_ok = np.ones(len(numbers), dtype=bool)
+    else:
+        text = pd.Series(value_counts.index.astype(str)).str.strip()
+        amounts = text.str.replace(currency_symbols, "", regex=True)
+        numbers = pd.to_numeric(
+            amounts.str.replace(",", "", regex=False), errors="coerce"
+        )
+        format_ok = amounts.str.match(pattern).to_numpy(dtype=bool)
+
+    numbers = numbers.to_numpy(dtype=float)
+    negative = numbers < 0
+    zero = numbers == 0
+    invalid = np.isnan(numbers) | (numbers > 0) & ~format_ok
+    counts["invalid_format"] = int(frequency[invalid].sum())
+    counts["negative_values"] = int(frequency[negative].sum())
+    counts["zero_values"] = int(frequency[zero].sum())
+    return counts
+
+
+def merge_currency_counts(counts, other):
+    """Add the counts of two parts of a column, e.g. consecutive chunks"""
+    return {check: counts[check] + other[check] for check in currency_counts}
+
+
+def currency_stat(column, counts, total_records):
+    """Report row of a currency column"""
+    stat = {"column": column, "total_records": total_records}
+    for check in currency_counts:
+        stat[check] = counts[check]
+        stat[check.split("_")[0] + "_percentage"] = (
+            round(counts[check] / total_records * 100, 2) if total_records else 0.0
+        )
+    return stat
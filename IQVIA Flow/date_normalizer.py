@@ -0,0 +1,166 @@
+import warnings
+from functools import lru_cache
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# Distinct values a column's candidate formats are guessed from
+format_sample_size = 100
+
+# Unparsed values shown in a column's report
+unparsed_examples = 5
+
+# Dates no format of their column fitted are parsed one at a time; the most
+# recent ones are kept across columns and files, up to this many
+leftover_cache_size = 10_000
+
+
+def guess_formats(values):
+    """
+    Formats guessed from a sample of distinct date texts, month first and
+    day first, in the order they were first guessed
+    """
+    formats = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        for value in values[:format_sample_size]:
+            for dayfirst in (False, True):
+                date_format = guess_datetime_format(value, dayfirst=dayfirst)
+                if date_format and date_format not in formats:
+                    formats.append(date_format)
+    return formats
+
+
+def reads_day_first(date_format):
+    """Whether a format has both a day and a month number, the day first"""
+    return (
+        date_format is not None
+        and "%d" in date_format
+        and "%m" in date_format
+        and date_format.find("%d") < date_format.find("%m")
+    )
+
+
+@lru_cache(maxsize=leftover_cache_size)
+def parse_leftover(value, dayfirst):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.to_datetime(value, errors="coerce", dayfirst=dayfirst)
+
+
+def date_lookup(values):
+    """
+    Parse the distinct values of a column of date texts written in one or
+    more formats.
+
+    Candidate formats are guessed from the distinct values and each is
+    tried on all of them at once; the one parsing the most distinct values
+    is the column's dominant format. The values it leaves are parsed by the
+    next best formats in turn, and whatever is still left one value at a
+    time, reading day first if the dominant format does. Returns the
+    date of every distinct value (NaT where nothing fitted) and the number
+    of distinct values each format parsed.
+    """
+    distinct = pd.Series(values.dropna().unique(), dtype=object)
+    text = distinct.astype(str).str.strip()
+    distinct_dates = pd.Series(pd.NaT, index=distinct.index, dtype="datetime64[ns]")
+
+    # Coverage of every candidate format over the distinct values
+    attempts = {
+        date_format: pd.to_datetime(text, format=date_format, errors="coerce")
+        for date_format in guess_formats(text.tolist())
+    }
+    used = {}
+    remaining = distinct.index
+    for date_format in sorted(
+        attempts, key=lambda date_format: -attempts[date_format].notna().sum()
+    ):
+        attempt = attempts[date_format][remaining]
+        fitted = attempt.notna().to_numpy()
+        if fitted.any():
+            distinct_dates[remaining[fitted]] = attempt[fitted]
+            used[date_format] = int(fitted.sum())
+            remaining = remaining[~fitted]
+
+    dayfirst = reads_day_first(next(iter(used), None))
+    for position in remaining:
+        distinct_dates[position] = parse_leftover(text[position], dayfirst)
+    one_at_a_time = int(distinct_dates[remaining].notna().sum())
+    if one_at_a_time:
+        used["one at a time"] = one_at_a_time
+
+    return pd.Series(distinct_dates.to_numpy(), index=distinct.to_numpy()), used
+
+
+def date_report(values, parsed, lookup, used):
+    """Rows, formats used and the rows left unparsed, in aggregate"""
+    unparsed = values.notna() & parsed.isna()
+    return {
+        "rows": int(values.notna().sum()),
+        "distinct_values": len(lookup),
+        "formats": used,
+        "unparsed_rows": int(unparsed.sum()),
+        "unparsed_examples": values[unparsed]
+        .drop_duplicates()
+        .head(unparsed_examples)
+        .tolist(),
+    }
+
+
+def parse_dates(values):
+    """Dates of a column of date texts (NaT where nothing fitted), and its report"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values, date_report(values, values, pd.Series([], dtype=object), {})
+    lookup, used = date_lookup(values)
+    parsed = values.map(lookup)
+    return parsed, date_report(values, parsed, lookup, used)
+
+
+def lookup_report(value_counts, lookup, used):
+    """
+    Report of a column from the rows of each of its distinct values, in the
+    order they first appear, e.g. counted chunk by chunk
+    """
+    unparsed = lookup.reindex(value_counts.index).isna().to_numpy()
+    return {
+        "rows": int(value_counts.sum()),
+        "distinct_values": len(lookup),
+        "formats": used,
+        "unparsed_rows": int(value_counts[unparsed].sum()),
+        "unparsed_examples": value_counts.index[unparsed][:unparsed_examples].tolist(),
+    }
+
+
+def format_dates(values, formatted):
+    """Date texts replaced from a lookup of their formatted dates; others kept as they are"""
+    normalized = values.map(formatted)
+    return normalized.where(normalized.notna(), values)
+
+
+def normalize_dates(values, output_format="%m/%d/%Y"):
+    """
+    Date texts rewritten in one format, each distinct value formatted once;
+    values that can't be parsed are kept as they are. Returns the column and
+    its report.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime(output_format), parse_dates(values)[1]
+    lookup, used = date_lookup(values)
+    normalized = format_dates(values, lookup.dt.strftime(output_format))
+    return normalized, date_report(values, values.map(lookup), lookup, used)
+
+
+def describe_report(column, report):
+    """One line summing up the normalization of a column"""
+    formats = ", ".join(
+        f"{date_format} ({count})" for date_format, count in report["formats"].items()
+    )
+    line = (
+        f"Dates in {column}: {report['rows']} rows, {report['distinct_values']} "
+        f"distinct values read as {formats or 'nothing'}"
+    )
+    if report["unparsed_rows"]:
+        line += (
+            f"; {report['unparsed_rows']} rows left unparsed, "
+            f"e.g. {report['unparsed_examples']}"
+        )
+    return line
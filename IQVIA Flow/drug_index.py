@@ -0,0 +1,103 @@
+import os
+import re
+import numpy as np
+
+# Trigrams found in more than this share of the drugs (e.g. "ine", "tab")
+# are skipped when looking up a name: scanning their postings costs nearly
+# a full pass over the list and says little about which drug is meant
+common_trigram_share = 0.05
+
+
+def name_trigrams(name):
+    """Character trigrams of a name padded with spaces: "abc" -> {" ab", "abc", "bc "}"""
+    text = " " + re.sub(r"(?u)[\W_]+", " ", str(name)).lower().strip() + " "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to the drugs containing them.
+
+    The postings of every trigram are stored back to back in one array, in
+    trigram order, with an offsets array marking where each trigram's list
+    starts. Candidates of a name are the drugs sharing the most trigrams
+    with it, so the cost of a lookup depends on the postings of its own
+    trigrams rather than on the size of the dictionary; trigrams common to
+    a large share of the drugs are left out of the count.
+    """
+
+    def __init__(self, vocabulary, offsets, postings):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self.drug_count = int(postings.max()) + 1 if len(postings) else 0
+
+    @classmethod
+    def build(cls, drug_names):
+        grams = []
+        ids = []
+        for drug_id, name in enumerate(drug_names):
+            name_grams = name_trigrams(name)
+            grams += name_grams
+            ids += [drug_id] * len(name_grams)
+        vocabulary, gram_ids = np.unique(np.array(grams, dtype=str), return_inverse=True)
+        ids = np.array(ids, dtype=np.int64)
+        order = np.lexsort((ids, gram_ids))
+        offsets = np.searchsorted(gram_ids[order], np.arange(len(vocabulary) + 1))
+        return cls(vocabulary, offsets, ids[order])
+
+    @classmethod
+    def load(cls, index_file, drug_names, version):
+        """The saved index if it was built from this version of the list, else a new one"""
+        if index_file and os.path.exists(index_file):
+            with np.load(index_file, allow_pickle=False) as saved:
+                if str(saved["version"]) == version:
+                    return cls(saved["vocabulary"], saved["offsets"], saved["postings"])
+        print(f"Building the trigram index of {len(drug_names)} drug names")
+        index = cls.build(drug_names)
+        if index_file:
+            index.save(index_file, version)
+        return index
+
+    def save(self, index_file, version):
+        os.makedirs(os.path.dirname(index_file) or ".", exist_ok=True)
+        with open(index_file, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(version),
+                vocabulary=self.vocabulary,
+                offsets=self.offsets,
+                postings=self.postings,
+            )
+
+    def candidates(self, name, limit=200):
+        """
+        Ids of the (at most limit) drugs sharing the most uncommon trigrams
+        with a name, in list order; if every trigram of the name is common,
+        only its rarest one is looked up
+        """
+        grams = np.array(sorted(name_trigrams(name)), dtype=str)
+        if not len(self.vocabulary) or not len(grams):
+            return np.array([], dtype=np.int64)
+        positions = np.searchsorted(self.vocabulary, grams)
+        found = positions < len(self.vocabulary)
+        found[found] = self.vocabulary[positions[found]] == grams[found]
+        positions = positions[found]
+        if not len(positions):
+            return np.array([], dtype=np.int64)
+        sizes = self.offsets[positions + 1] - self.offsets[positions]
+        uncommon = sizes <= max(limit, common_trigram_share * self.drug_count)
+        if uncommon.any():
+            positions = positions[uncommon]
+        else:
+            positions = positions[[sizes.argmin()]]
+
+        ids, shared = np.unique(
+            np.concatenate(
+                [self.postings[self.offsets[p] : self.offsets[p + 1]] for p in positions]
+            ),
+            return_counts=True,
+        )
+        if len(ids) > limit:
+            ids = np.sort(ids[np.argpartition(-shared, limit - 1)[:limit]])
+        return ids
@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import hashlib
+import importlib.util
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from drug_index import TrigramIndex, common_trigram_share
+
+# rapidfuzz scores a whole batch of names in C across cores; without it
+# each name goes through fuzzywuzzy's extractOne, in a pool of processes
+has_rapidfuzz = importlib.util.find_spec("rapidfuzz") is not None
+
+# Names scored per cdist call, bounding the score matrix to batch x dictionary
+match_batch_size = 2_000
+
+# Drug lists longer than this are searched through a trigram index: each
+# name is only scored against the drugs sharing the most trigrams with it
+indexed_dictionary_size = 5_000
+candidate_limit = 200
+
+
+def normalize_drug_name(name):
+    """Cache key of a product name, as fuzzywuzzy sees it: " Vitamin-C" -> "vitamin c" """
+    return re.sub(r"(?u)\W", " ", str(name)).lower().strip()
+
+
+def dictionary_version(drug_names, scorer):
+    """Changes whenever the drug list (or the scorer) does, invalidating cached matches"""
+    digest = hashlib.sha256("\n".join(map(str, drug_names)).encode("utf-8"))
+    return f"{scorer}:{digest.hexdigest()[:16]}"
+
+
+def rapidfuzz_best_matches(names, drug_names, workers):
+    """(closest drug, score) of every name, from one cdist score matrix"""
+    from rapidfuzz import process, fuzz, utils
+
+    scores = process.cdist(
+        names,
+        drug_names,
+        scorer=fuzz.WRatio,
+        processor=utils.default_process,
+        workers=workers,
+    )
+    # fuzzywuzzy scores are whole numbers: round before picking so that
+    # ties go to the first drug in the list, as with extractOne
+    scores = np.rint(scores)
+    best = scores.argmax(axis=1)
+    return [(drug_names[j], int(scores[i, j])) for i, j in enumerate(best)]
+
+
+def closest_drug(name, choices):
+    """(closest drug, score) of one name among a few choices"""
+    if has_rapidfuzz:
+        return rapidfuzz_best_matches([name], choices, 1)[0]
+    from fuzzywuzzy import process
+
+    return tuple(process.extractOne(name, choices))
+
+
+worker_drug_names = None
+worker_index = None
+
+
+def init_match_worker(drug_names, index=None):
+    global worker_drug_names, worker_index
+    worker_drug_names = drug_names
+    worker_index = index
+
+
+def best_matches(names):
+    """
+    (closest drug, score) of every name (runs in a worker process), against
+    the whole list or only the index candidates of each name. A name with
+    no candidate has no match.
+    """
+    if worker_index is None:
+        return [closest_drug(name, worker_drug_names) for name in names]
+    matches = []
+    for name in names:
+        ids = worker_index.candidates(name, candidate_limit)
+        if len(ids):
+            matches.append(closest_drug(name, [worker_drug_names[i] for i in ids]))
+        else:
+            matches.append((None, 0))
+    return matches
+
+
+class DrugNameMatcher:
+    """
+    Closest drug of each product name by WRatio. rapidfuzz scores close to
+    fuzzywuzzy's extractOne but not always the same: fuzzywuzzy drops
+    non-ASCII characters before scoring and aligns partial matches with
+    difflib, so accented names or long partial overlaps can score a few
+    points apart.
+
+    Product names are deduplicated before scoring, and the best match of
+    every name is kept in a cache on disk keyed by its normalized form. The
+    cache belongs to one version of the drug list, so editing the list
+    starts a new one. A long list is searched through a trigram index
+    saved to index_file; the threshold applies to the exact score of the
+    best candidate, as it did to the best of the whole list.
+    """
+
+    def __init__(
+        self,
+        drug_names,
+        cache_file=None,
+        threshold=80,
+        workers=None,
+        index_file=None,
+    ):
+        self.drug_names = list(drug_names)
+        self.cache_file = cache_file
+        self.threshold = threshold
+        self.workers = workers or os.cpu_count() or 1
+        self.scorer = "rapidfuzz" if has_rapidfuzz else "fuzzywuzzy"
+        self.index = None
+        if len(self.drug_names) > indexed_dictionary_size:
+            self.index = TrigramIndex.load(
+                index_file,
+                self.drug_names,
+                dictionary_version(self.drug_names, "trigram"),
+            )
+            self.scorer += f"+trigram{candidate_limit}/{common_trigram_share}"
+        self.version = dictionary_version(self.drug_names, self.scorer)
+        self.matches = {}  # normalized name -> [closest drug, score]
+        self.new_matches = {}  # scored since loading, to merge across processes
+        self.updated = False
+        if cache_file and os.path.exists(cache_file):
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("version") == self.version:
+                self.matches = cache.get("matches", {})
+
+    def score(self, names):
+        """(closest drug, score) of every name, in batches across the workers"""
+        if has_rapidfuzz and self.index is None:
+            return [
+                match
+                for start in range(0, len(names), match_batch_size)
+                for match in rapidfuzz_best_matches(
+                    names[start : start + match_batch_size],
+                    self.drug_names,
+                    self.workers,
+                )
+            ]
+
+        workers = min(self.workers, len(names))
+        if workers <= 1:
+            init_match_worker(self.drug_names, self.index)
+            return best_matches(names)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_match_worker,
+            initargs=(self.drug_names, self.index),
+        ) as executor:
+            # One part per worker, in order, so the matches line up with the names
+            size = -(-len(names) // workers)
+            parts = [names[start : start + size] for start in range(0, len(names), size)]
+            return [
+                match
+                for part in executor.map(best_matches, parts)
+                for match in part
+            ]
+
+    def correct(self, values):
+        """
+        Product names with each one whose closest drug scores above the
+        threshold replaced by that drug name; missing names stay missing
+        """
+        distinct = pd.Series(values.dropna().unique())
+        keys = distinct.map(normalize_drug_name)
+
+        # Score one spelling of each name not matched in an earlier run
+        new_names = distinct[~keys.isin(self.matches)].groupby(keys).first()
+        if len(new_names) and self.drug_names:
+            for key, match in zip(new_names.index, self.score(new_names.tolist())):
+                self.matches[key] = self.new_matches[key] = list(match)
+            self.updated = True
+
+        corrected = [
+            match[0] if match is not None and match[1] > self.threshold else name
+            for name, match in zip(distinct, keys.map(self.matches.get))
+        ]
+        return values.map(dict(zip(distinct, corrected)))
+
+    def merge_matches(self, matches):
+        """Add the matches another process scored (its new_matches) to the cache"""
+        new = {key: match for key, match in matches.items() if key not in self.matches}
+        if new:
+            self.matches.update(new)
+            self.new_matches.update(new)
+            self.updated = True
+
+    def save(self):
+        if not self.cache_file or not self.updated:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "matches": self.matches}, f)
+        self.updated = False
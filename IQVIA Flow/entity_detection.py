@@ -0,0 +1,228 @@
+import re
+import pandas as pd
+
+# List of common currency symbols
+currency_symbols = ["$", "€", "£", "¥", "₹"]
+
+# List of common measurement units
+measurement_units = ["kg", "lbs", "m", "cm", "inches", "ft", "meter", "km", "mile"]
+
+# Column name words that indicate currency data (same list as DataProfiler)
+currency_indicators = [
+    "price",
+    "amount",
+    "cost",
+    "fee",
+    "charge",
+    "payment",
+    "salary",
+    "wage",
+    "income",
+    "expense",
+    "revenue",
+    "$",
+    "£",
+    "€",
+    "₹",
+    "usd",
+    "eur",
+    "gbp",
+    "inr",
+]
+
+# Column name words that indicate measurement data
+measurement_indicators = [
+    "weight",
+    "height",
+    "length",
+    "width",
+    "depth",
+    "distance",
+] + measurement_units
+
+# Compiled patterns used by the regex tier
+currency_symbol_pattern = re.compile("|".join(re.escape(s) for s in currency_symbols))
+# A number followed by a unit ("5 kg", "1,200m"); a unit word elsewhere in a
+# text ("John M Smith", "3 km north") is left to the NLP tier
+measurement_value_pattern = re.compile(
+    r"^\s*[-+]?\d[\d,]*(?:\.\d+)?\s*(?:"
+    + "|".join(re.escape(unit) for unit in measurement_units)
+    + r")\s*$"
+)
+name_word_pattern = re.compile(r"[a-z]+|[^\sa-z0-9]")
+# Values that can be neither currency nor measurement: numbers, dates, codes, nulls
+settled_value_pattern = re.compile(
+    r"^(?:"
+    r"[-+]?\d[\d,]*(?:\.\d+)?"  # Plain numbers
+    r"|\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"  # Dates
+    r"|[A-Za-z]{0,4}[-_]?\d+"  # Codes such as C001, S-12, DX06700
+    r"|nan|none|null|na|nat|"  # Null tokens
+    r")$",
+    re.IGNORECASE,
+)
+
+# Pipeline components not needed for entity detection (only "ner" is kept)
+non_ner_components = [
+    "tok2vec",
+    "tagger",
+    "parser",
+    "attribute_ruler",
+    "lemmatizer",
+    "senter",
+]
+
+# Detection tiers, cheapest first
+TIER_DTYPE = "dtype"
+TIER_REGEX = "regex"
+TIER_NLP = "nlp"
+
+
+def load_ner_model(model_name="en_core_web_sm"):
+    """Load a spaCy model with only the NER component in the pipeline"""
+    import spacy  # Imported here so runs that never reach the NLP tier skip it
+
+    return spacy.load(model_name, exclude=non_ner_components)
+
+
+def is_text_column(column_data):
+    """Only string and numeric columns are checked for currency/measurement"""
+    return pd.api.types.is_string_dtype(
+        column_data
+    ) or pd.api.types.is_numeric_dtype(column_data)
+
+
+def has_name_hint(column_name, indicators):
+    """Check whether any word or symbol of the column name is an indicator"""
+    words = name_word_pattern.findall(str(column_name).lower())
+    return any(word in indicators for word in words)
+
+
+class EntityDetector:
+    """
+    Detect Currency and Measurement columns with a cheap-first cascade.
+
+    Each column is decided by the first tier that can settle it: dtype rules,
+    compiled regexes over the distinct values, and finally spaCy NER. A
+    currency/measurement column name is not evidence on its own: it only
+    keeps plain numbers from being settled as No by the regexes, so the
+    values still decide. Only columns left undecided reach the model, whose
+    distinct values go through one batched `nlp.pipe` call per file. The
+    model is loaded on first use.
+    """
+
+    def __init__(
+        self,
+        nlp=None,
+        model_name="en_core_web_sm",
+        batch_size=1000,
+        n_process=1,
+        min_texts_per_process=5000,
+    ):
+        self._nlp = nlp
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.n_process = n_process
+        # Worker start-up costs more than it saves on small inputs
+        self.min_texts_per_process = min_texts_per_process
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = load_ner_model(self.model_name)
+        return self._nlp
+
+    def get_entities(self, texts):
+        """Run the model over the texts and return {text: [(label, entity text)]}"""
+        texts = list(texts)
+        if not texts:
+            return {}
+        n_process = self.n_process
+        if len(texts) < self.min_texts_per_process * n_process:
+            n_process = 1
+
+        entities = {}
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=n_process)
+        for text, doc in zip(texts, docs):
+            entities[text] = [(ent.label_, ent.text) for ent in doc.ents]
+        return entities
+
+    def detect(self, columns):
+        """
+        Return {column: {"Currency": "Yes"/"No", "Currency Detected By": tier,
+        "Measurement": "Yes"/"No", "Measurement Detected By": tier}} for a
+        DataFrame or a {column: Series} mapping
+        """
+        flags = {}
+        pending = {}  # (column, check) -> distinct values for the NLP tier
+        for column in columns:
+            flags[column] = {}
+            values = None
+            for check in ["Currency", "Measurement"]:
+                decision = self.decide_by_dtype(columns[column])
+                if decision is None:
+                    if values is None:
+                        values = [str(v) for v in columns[column].unique()]
+                    decision = self.decide_by_regex(
+                        check, values, self.name_hint(column, check)
+                    )
+                if decision is None:
+                    pending[(column, check)] = values
+                    continue
+                self.set_flag(flags[column], check, *decision)
+
+        if pending:
+            # One model pass over the distinct values of all undecided columns
+            texts = set()
+            for (column, check), values in pending.items():
+                texts.update(self.nlp_texts(check, values))
+            entities = self.get_entities(sorted(texts))
+            for (column, check), values in pending.items():
+                flag = self.decide_by_nlp(check, values, entities)
+                self.set_flag(flags[column], check, flag, TIER_NLP)
+        return flags
+
+    def set_flag(self, column_flags, check, flag, tier):
+        column_flags[check] = flag
+        column_flags[f"{check} Detected By"] = tier
+
+    def decide_by_dtype(self, column_data):
+        """Dates, booleans and other non-text dtypes can't hold either"""
+        if pd.api.types.is_bool_dtype(column_data) or not is_text_column(column_data):
+            return "No", TIER_DTYPE
+        return None
+
+    def name_hint(self, column_name, check):
+        """Whether the column name suggests currency/measurement data"""
+        indicators = (
+            currency_indicators if check == "Currency" else measurement_indicators
+        )
+        return has_name_hint(column_name, indicators)
+
+    def decide_by_regex(self, check, values, name_hint=False):
+        """
+        Currency symbols and numbers with a unit settle as Yes; numbers,
+        dates and codes as No, unless the column name hints otherwise
+        """
+        if check == "Currency":
+            if any(currency_symbol_pattern.search(v) for v in values):
+                return "Yes", TIER_REGEX
+        elif any(measurement_value_pattern.match(v.lower()) for v in values):
+            return "Yes", TIER_REGEX
+        if not name_hint and all(settled_value_pattern.match(v) for v in values):
+            return "No", TIER_REGEX
+        return None
+
+    def nlp_texts(self, check, values):
+        if check == "Measurement":
+            return [v.lower() for v in values]
+        return values
+
+    def decide_by_nlp(self, check, values, entities):
+        """Currency if spaCy finds a MONEY entity, Measurement if an entity is a unit"""
+        for text in self.nlp_texts(check, values):
+            for label, ent_text in entities[text]:
+                if check == "Currency" and label == "MONEY":
+                    return "Yes"
+                if check == "Measurement" and ent_text in measurement_units:
+                    return "Yes"
+        return "No"
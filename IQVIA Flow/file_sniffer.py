@@ -0,0 +1,140 @@
+import os
+import re
+import io
+import csv
+import json
+import codecs
+from catalog_manifest import file_content_hash
+
+# Shared by every stage: the format of each data file, sniffed once
+file_formats_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0.1/IQVIA/Directories/Metadata/file_formats.json"
+
+byte_order_marks = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+candidate_delimiters = ",;\t|"
+
+
+def clean_header_name(name):
+    """Header clean-up every stage applies: " Pharmacy  ID " -> "Pharmacy ID" """
+    return re.sub(r"\s+", " ", str(name).strip())
+
+
+def sniff_file(file_path, sample_size=64 * 1024):
+    """
+    Detect the encoding, byte order mark, delimiter, quote character and
+    header of a CSV file from its first few KB. The encoding is only a
+    guess for a file longer than the sample: a byte that isn't UTF-8 can
+    still come later, and readers keep a latin1 fallback for that case.
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_size)
+        complete = not f.read(1)
+
+    encoding, bom = "utf-8", False
+    for mark, name in byte_order_marks:
+        if sample.startswith(mark):
+            encoding, bom = name, True
+            break
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        text = decoder.decode(sample, final=complete)
+    except UnicodeDecodeError:
+        encoding = "latin1"
+        text = sample.decode(encoding)
+    if not complete and "\n" in text:
+        text = text[: text.rfind("\n") + 1]  # Whole lines only
+
+    delimiter, quotechar = ",", '"'
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=candidate_delimiters)
+        delimiter, quotechar = dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        pass  # One column, or too few lines to tell
+
+    rows = csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=quotechar)
+    header = next(rows, [])
+    return {
+        "encoding": encoding,
+        "bom": bom,
+        "delimiter": delimiter,
+        "quotechar": quotechar,
+        "header": header,
+        "header_whitespace": any(name != clean_header_name(name) for name in header),
+    }
+
+
+def read_options(file_format):
+    """pd.read_csv keyword arguments for a sniffed file format"""
+    if file_format is None:
+        return {}
+    return {
+        "encoding": file_format["encoding"],
+        "sep": file_format["delimiter"],
+        "quotechar": file_format["quotechar"],
+    }
+
+
+def fallback_encodings(file_format):
+    """Encodings to try in order: the sniffed one, then latin1 if it was UTF-8"""
+    encoding = file_format["encoding"] if file_format else "utf-8"
+    if encoding.startswith("utf-8"):
+        return [encoding, "latin1"]
+    return [encoding]
+
+
+class FileFormatManifest:
+    """
+    Sniffed formats of the data files, cached on disk under each file's
+    content hash. As in the catalog manifest, the hash of a file is only
+    recomputed when its size or mtime changed, and a file is only sniffed
+    when its contents are new.
+    """
+
+    def __init__(self, manifest_file=file_formats_file):
+        self.manifest_file = manifest_file
+        self.files = {}  # path -> size, mtime and hash
+        self.formats = {}  # hash -> sniffed format
+        if os.path.exists(manifest_file):
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.files = manifest.get("files", {})
+            self.formats = manifest.get("formats", {})
+
+    def format_of(self, file_path):
+        stat = os.stat(file_path)
+        entry = self.files.get(file_path)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime
+        ):
+            content_hash = entry["hash"]
+        else:
+            content_hash = file_content_hash(file_path)
+            self.files[file_path] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "hash": content_hash,
+            }
+        if content_hash not in self.formats:
+            self.formats[content_hash] = sniff_file(file_path)
+        return self.formats[content_hash]
+
+    def save(self):
+        """Write the manifest, dropping files that no longer exist"""
+        self.files = {
+            path: entry for path, entry in self.files.items() if os.path.exists(path)
+        }
+        live_hashes = {entry["hash"] for entry in self.files.values()}
+        self.formats = {
+            content_hash: file_format
+            for content_hash, file_format in self.formats.items()
+            if content_hash in live_hashes
+        }
+        os.makedirs(os.path.dirname(self.manifest_file) or ".", exist_ok=True)
+        with open(self.manifest_file, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files, "formats": self.formats}, f, indent=2)
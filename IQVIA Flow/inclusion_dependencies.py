@@ -0,0 +1,122 @@
+import numpy as np
+
+# Leading day/month/year group of a date stored as text
+date_like_pattern = r"^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"
+
+# Data types that can hold keys; dates, booleans and fractional floats are
+# never looked up
+key_types = ["int", "string"]
+
+
+def key_type(profile):
+    """
+    Data type a column is compared as: a float column of whole numbers is an
+    int key, since pandas reads an integer ID column holding nulls as float
+    """
+    data_type = profile.data_type()
+    if data_type == "float" and profile.holds_whole_numbers():
+        return "int"
+    return data_type
+
+
+class InclusionDependencyFinder:
+    """
+    Find columns whose values are contained in another column (foreign key
+    candidates) across every profiled file.
+
+    A dependency holds when at least `min_containment` of the distinct values
+    are found in the referenced column, so keys with a few orphan values (the
+    kind of issue the DQ reports exist to show) are still linked. Columns are
+    pruned by data type, distinct count and numeric range before any values
+    are compared, and the comparison itself uses the hash sets or MinHash
+    sketches built once per column by the column profiler.
+    """
+
+    def __init__(self, min_containment=0.8, min_distinct=2):
+        self.min_containment = min_containment
+        self.min_distinct = min_distinct
+        self.columns = []  # (source, file name, column name, profile)
+
+    def add_file(self, source_name, file_name, profiles):
+        """Register the column profiles of one file"""
+        for column, profile in profiles.items():
+            if key_type(profile) not in key_types:
+                continue
+            if profile.distinct_count() < self.min_distinct:
+                continue
+            if self.looks_like_dates(profile):
+                continue
+            self.columns.append((source_name, file_name, column, profile))
+
+    def find(self):
+        """Return {(source, file, column): [(source, file, column), ...]} of lookups"""
+        # Referenced columns sorted by distinct count so each dependent column
+        # only scans the ones large enough to contain it
+        by_type = {}
+        for entry in self.columns:
+            by_type.setdefault(key_type(entry[3]), []).append(entry)
+        for entries in by_type.values():
+            entries.sort(key=lambda entry: entry[3].distinct_count())
+
+        dependencies = {}
+        for dependent in self.columns:
+            profile = dependent[3]
+            candidates = by_type[key_type(profile)]
+            distinct_counts = [entry[3].distinct_count() for entry in candidates]
+            start = np.searchsorted(
+                distinct_counts, self.min_containment * profile.distinct_count()
+            )
+
+            lookups = []
+            for referenced in candidates[start:]:
+                if referenced[:3] == dependent[:3]:
+                    continue
+                if not self.range_contained(profile, referenced[3]):
+                    continue
+                containment = profile.contained_in(referenced[3])
+                if containment >= self.min_containment:
+                    lookups.append((referenced, containment))
+
+            # Columns holding the same values reference each other; keep the
+            # direction that points at the more unique column, and neither
+            # when nothing tells them apart
+            lookups = [
+                (referenced, containment)
+                for referenced, containment in lookups
+                if self.points_at_key(dependent, referenced)
+            ]
+            if lookups:
+                lookups.sort(key=lambda lookup: (-lookup[1], -self.uniqueness(lookup[0][3])))
+                dependencies[dependent[:3]] = [referenced[:3] for referenced, _ in lookups]
+        return dependencies
+
+    def looks_like_dates(self, profile):
+        """Dates stored as text share values by coincidence, not by reference"""
+        sample = profile.sample.dropna().astype(str)
+        if sample.empty:
+            return False
+        return sample.str.match(date_like_pattern).mean() >= 0.5
+
+    def range_contained(self, profile, referenced_profile):
+        """Numeric ranges must overlap for the values to be contained"""
+        if profile.min_value is None or referenced_profile.min_value is None:
+            return True
+        return (
+            referenced_profile.min_value <= profile.max_value
+            and profile.min_value <= referenced_profile.max_value
+        )
+
+    def points_at_key(self, dependent, referenced):
+        dependent_uniqueness = self.uniqueness(dependent[3])
+        referenced_uniqueness = self.uniqueness(referenced[3])
+        if referenced_uniqueness != dependent_uniqueness:
+            return referenced_uniqueness > dependent_uniqueness
+        if referenced[3].distinct_count() == dependent[3].distinct_count():
+            # Same values, equally unique: which side is the key is unknown
+            return False
+        return True
+
+    def uniqueness(self, profile):
+        """Share of the non-null rows that hold distinct values"""
+        non_null = profile.row_count - profile.null_count
+        return profile.distinct_count() / non_null if non_null else 0.0
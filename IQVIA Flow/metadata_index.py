@@ -0,0 +1,97 @@
+import os
+import re
+from typed_reader import catalog_column_types
+
+# Report check -> schema master flag column
+flag_columns = {
+    "mandatory": "Is Mandatory",
+    "unique": "Is Unique",
+    "sensitive": "Sensitive",
+    "encrypted": "Encrypted",
+    "currency": "Currency",
+}
+
+yes_values = {"YES", "Y", "TRUE", "1"}
+
+
+def normalize_file_name(file_name):
+    """ " Pharmacy  Sales.csv" -> "pharmacy sales" """
+    name = os.path.splitext(str(file_name).strip())[0]
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+
+def is_yes(value):
+    return re.sub(r"\s+", " ", str(value)).strip().upper() in yes_values
+
+
+class FileMetadata:
+    """Schema master rows of one file, with its column list per flag and data types"""
+
+    def __init__(self, source, file_name, rows):
+        self.source = source
+        self.file_name = file_name
+        self.rows = rows
+        self.expected_columns = rows["Column Name"].unique().tolist()
+        self.flags = {}
+        for check, flag in flag_columns.items():
+            if flag not in rows.columns:
+                self.flags[check] = []
+                continue
+            flagged = rows[rows[flag].map(is_yes)]["Column Name"]
+            self.flags[check] = flagged.unique().tolist()
+        self.data_types = {}
+        if "Data Type" in rows.columns:
+            self.data_types = catalog_column_types(
+                rows["Column Name"], rows["Data Type"]
+            )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def flagged(self, check, columns=None):
+        """Columns flagged 'Yes' for a check, only those in columns if given"""
+        if columns is None:
+            return list(self.flags[check])
+        columns = set(columns)
+        return [col for col in self.flags[check] if col in columns]
+
+
+class MetadataIndex:
+    """
+    Schema master rows grouped once per (source, normalized file name).
+
+    Files are looked up by their source folder and name; a file outside a
+    known source folder is found by name alone when only one source has it.
+    """
+
+    def __init__(self, metadata_df):
+        self.files = {}
+        self.sources_by_name = {}
+        if "Source Name" in metadata_df.columns:
+            source_names = metadata_df["Source Name"].astype(str).str.strip()
+        else:
+            source_names = ""
+        keys = metadata_df.assign(
+            _source=source_names,
+            _file=metadata_df["File Name"].map(normalize_file_name),
+        )
+        for (source, name), rows in keys.groupby(["_source", "_file"], sort=False):
+            rows = rows.drop(columns=["_source", "_file"])
+            self.files[(source.lower(), name)] = FileMetadata(
+                source, rows["File Name"].iloc[0].strip(), rows
+            )
+            self.sources_by_name.setdefault(name, []).append(source.lower())
+
+    def file_names(self):
+        return [entry.file_name for entry in self.files.values()]
+
+    def lookup(self, file_path):
+        """FileMetadata of a data file, or None if the catalog doesn't have it"""
+        source = os.path.basename(os.path.dirname(file_path)).strip().lower()
+        name = normalize_file_name(os.path.basename(file_path))
+        entry = self.files.get((source, name))
+        if entry is None:
+            sources = self.sources_by_name.get(name, [])
+            if len(sources) == 1:
+                entry = self.files[(sources[0], name)]
+        return entry
@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import networkx as nx
 import matplotlib.pyplot as plt
+from file_sniffer import FileFormatManifest, read_options
 
 # Path to the main directory containing subfolders
 main_folder_path = (
@@ -14,6 +15,9 @@ source_mapping_file = "C:/Environments/CV-PROJECTS-PERSONAL/CV-Projects/IQVIA V0
 # Load the Excel file into a DataFrame
 source_mapping_df = pd.read_excel(source_mapping_file)
 
+# Encoding and delimiter of each CSV, shared with the other stages
+file_formats = FileFormatManifest()
+
 # Create a directed graph
 G = nx.DiGraph()
 
@@ -74,10 +78,13 @@ for subdir, dirs, files in os.walk(main_folder_path):
         G.add_node(file_name_without_extension, node_type='file', file_id=file_id)
         G.add_edge(source_name, file_name_without_extension)
 
+        # Only the column names are drawn, so no rows are parsed
         if file_name.endswith(".csv"):
-            df = pd.read_csv(file_path, nrows=100)
+            df = pd.read_csv(
+                file_path, nrows=0, **read_options(file_formats.format_of(file_path))
+            )
         elif file_name.endswith(".xlsx"):
-            df = pd.read_excel(file_path, nrows=100)
+            df = pd.read_excel(file_path, nrows=0)
 
         for index, column in enumerate(df.columns, 1):
             if column not in column_sources:
@@ -95,6 +102,8 @@ for subdir, dirs, files in os.walk(main_folder_path):
                 "column_sequence": index,
             })
 
+file_formats.save()
+
 # Draw the network
 plt.figure(figsize=(15, 10))
 pos = nx.spring_layout(G)
@@ -0,0 +1,215 @@
+import os
+import time
+from contextlib import contextmanager
+import pandas as pd
+from file_sniffer import clean_header_name
+from metadata_index import MetadataIndex
+from typed_reader import read_typed_csv
+from date_normalizer import normalize_dates, describe_report
+
+
+@contextmanager
+def atomic_path(file_path):
+    """Path to write a file to next to its destination, moved into place once complete"""
+    temp_path = f"{file_path}.tmp"
+    try:
+        yield temp_path
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def write_csv_atomic(df, file_path):
+    with atomic_path(file_path) as temp_path:
+        df.to_csv(temp_path, index=False)
+
+
+def keeps_integers(minimum, maximum, lower, upper):
+    """
+    Whether an integer column stays integer once clipped: the values it has
+    are whole, so only a fence some value is clipped to can bring a fraction
+    """
+    return (minimum >= lower or lower % 1 == 0) and (maximum <= upper or upper % 1 == 0)
+
+
+def clip_column(values, lower, upper, integers):
+    """Clip a numeric column to its fences, as integers if `integers` else floats"""
+    clipped = values.clip(lower, upper)
+    if pd.api.types.is_integer_dtype(values):
+        clipped = clipped.astype(values.dtype if integers else "float64")
+    return clipped
+
+
+def timing_report(timings):
+    """One line with the time spent in each stage, e.g. added up across workers"""
+    total = sum(timings.values())
+    return "Repair time by stage: " + ", ".join(
+        f"{stage} {seconds:.2f}s ({seconds / total:.0%})" if total else stage
+        for stage, seconds in timings.items()
+    )
+
+
+class RepairPipeline:
+    """
+    Repairs of a Raw file, applied in order to the DataFrame read once and
+    written once to Curated: product names, dates, outliers, duplicates.
+
+    Each stage takes the DataFrame and the file being repaired and returns
+    the repaired DataFrame; `stages` can be reordered or extended. Time
+    spent in each stage (and in reading and writing) is added up across
+    files in `timings`.
+    """
+
+    def __init__(
+        self,
+        metadata_df,
+        drug_matcher=None,
+        date_column_names=(),
+        date_format="%m/%d/%Y",
+        outlier_multipliers=(1.5, 1.5),
+    ):
+        self.metadata_index = MetadataIndex(metadata_df)
+        self.drug_matcher = drug_matcher
+        self.date_column_names = list(date_column_names)
+        self.date_format = date_format
+        self.outlier_multipliers = outlier_multipliers
+
+        # Schema master rows by file name alone, as duplicates were always removed
+        file_names = metadata_df["File Name"].astype(str).str.strip().str.lower()
+        self.rows_by_name = {
+            name: rows for name, rows in metadata_df.groupby(file_names, sort=False)
+        }
+
+        self.stages = [
+            ("product names", self.correct_product_names),
+            ("dates", self.normalize_dates),
+            ("outliers", self.clip_outliers),
+            ("duplicates", self.remove_duplicates),
+        ]
+        self.timings = {}
+
+    def timed(self, stage, started):
+        elapsed = time.perf_counter() - started
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+    def file_info(self, file_path):
+        """What the stages know about a file: its name and catalog entry"""
+        file_metadata = self.metadata_index.lookup(file_path)
+        return {
+            "file_path": file_path,
+            "file_name": os.path.splitext(os.path.basename(file_path))[0],
+            "file_metadata": file_metadata,
+            "column_types": file_metadata.data_types if file_metadata else {},
+        }
+
+    def repair_file(self, file_path, save_path, file_format=None):
+        """Read a Raw file, run every stage over it and write it to save_path"""
+        file = self.file_info(file_path)
+
+        started = time.perf_counter()
+        df = read_typed_csv(file_path, file_format, file["column_types"] or None)
+        self.timed("read", started)
+
+        for stage, transform in self.stages:
+            started = time.perf_counter()
+            df = transform(df, file)
+            self.timed(stage, started)
+
+        started = time.perf_counter()
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        write_csv_atomic(df, save_path)
+        self.timed("write", started)
+        print(f"Saved corrected file to: {save_path}")
+        return df
+
+    def timing_report(self):
+        return timing_report(self.timings)
+
+    def correct_product_names(self, df, file):
+        """Replace each product name by its closest drug name when the match score is above 80"""
+        if self.drug_matcher is not None and "Product Name" in df.columns:
+            df["Product Name"] = self.drug_matcher.correct(df["Product Name"])
+        return df
+
+    def date_columns(self, columns, file):
+        return [
+            column
+            for column in columns
+            if column in self.date_column_names
+            or file["column_types"].get(clean_header_name(column)) == "date"
+        ]
+
+    def normalize_dates(self, df, file):
+        """Convert the date columns to one format, each from the formats inferred from its values"""
+        for column in self.date_columns(df.columns, file):
+            df[column], report = normalize_dates(df[column], self.date_format)
+            print(describe_report(column, report))
+        return df
+
+    def outlier_fences(self, q1, q3):
+        lower_multiplier, upper_multiplier = self.outlier_multipliers
+        iqr = q3 - q1
+        return q1 - lower_multiplier * iqr, q3 + upper_multiplier * iqr
+
+    def clip_outliers(self, df, file):
+        """Clip every numeric column to its IQR fences"""
+        for column in df.select_dtypes(include=["number"]).columns:
+            lower, upper = self.outlier_fences(
+                df[column].quantile(0.25), df[column].quantile(0.75)
+            )
+            integers = keeps_integers(df[column].min(), df[column].max(), lower, upper)
+            df[column] = clip_column(df[column], lower, upper, integers)
+        return df
+
+    def duplicate_subsets(self, columns, file):
+        """
+        Column sets duplicates are removed on, in order: the primary key, then
+        each column marked as unique in metadata. None (with the reason
+        printed) when there is nothing to remove duplicates on.
+        """
+        file_metadata = self.rows_by_name.get(file["file_name"].lower())
+        if file_metadata is None:
+            print(f"No metadata found for file {file['file_name']}")
+            return None
+
+        def flagged(flag):
+            if flag not in file_metadata.columns:
+                return []
+            rows = file_metadata[
+                file_metadata[flag].astype(str).str.strip().str.upper() == "YES"
+            ]
+            return [
+                column for column in rows["Column Name"].unique() if column in columns
+            ]
+
+        subsets = []
+        # Primary key columns (a composite key spans several rows)
+        primary_key_columns = flagged("Is Primary Key")
+        if primary_key_columns:
+            subsets.append((primary_key_columns, f"primary key {primary_key_columns}"))
+        subsets += [
+            ([column], f"column {column}")
+            for column in flagged("Is Unique")
+            if [column] != primary_key_columns
+        ]
+        if not subsets:
+            print(f"No unique columns defined in metadata for {file['file_name']}")
+            return None
+        return subsets
+
+    def remove_duplicates(self, df, file):
+        """Remove duplicates on the primary key, then on each column marked as unique"""
+        repaired = df
+        try:
+            subsets = self.duplicate_subsets(df.columns, file)
+            for subset, label in subsets or []:
+                # Remove duplicates keeping first occurrence
+                initial_count = len(df)
+                df = df.drop_duplicates(subset=subset, keep="first")
+                print(f"Removed {initial_count - len(df)} duplicate rows based on {label}")
+        except Exception as e:
+            # Leave the file as it was before this stage
+            print(f"Error removing duplicates from {file['file_path']}: {str(e)}")
+            return repaired
+        return df
@@ -0,0 +1,370 @@
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from file_sniffer import read_options, sniff_file
+from typed_reader import typed_read_options
+from streaming_profile import TDigest, merge_sorted
+from date_normalizer import date_lookup, lookup_report, format_dates, describe_report
+from repair_pipeline import atomic_path, keeps_integers, clip_column
+
+# Quantile ranges tried around each IQR quartile, as fractions of the rows,
+# before the values between the column's extremes are all gathered
+quartile_brackets = [0.01, 0.05, 0.25]
+
+# Distinct values gathered per quartile in a pass; a bracket holding more is
+# narrowed from their digest for the next pass, up to quartile_passes passes
+quartile_value_budget = 250_000
+quartile_passes = 10
+
+
+def sorted_contains(sorted_values, values):
+    """Mask of the values found in a sorted array"""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_values, values)
+    found = positions < len(sorted_values)
+    found[found] = sorted_values[positions[found]] == values[found]
+    return found
+
+
+class SpillableHashSet:
+    """
+    Set of 64-bit row hashes that spills to disk.
+
+    Hashes are kept as one sorted array in memory until it holds
+    `memory_limit` of them; it is then saved as a sorted run in `spill_dir`
+    and read back memory-mapped, so membership is a binary search in the
+    memory array and in every run.
+    """
+
+    def __init__(self, spill_dir, memory_limit=5_000_000):
+        self.spill_dir = spill_dir
+        self.memory_limit = memory_limit
+        self.memory = np.array([], dtype=np.uint64)
+        self.runs = []
+
+    def add_new(self, hashes):
+        """Add a batch of hashes; mask of the rows that add a new hash to the set"""
+        values, first = np.unique(hashes, return_index=True)
+        seen = sorted_contains(self.memory, values)
+        for run in self.runs:
+            seen |= sorted_contains(run, values)
+        new = np.zeros(len(hashes), dtype=bool)
+        new[first[~seen]] = True
+
+        self.memory = merge_sorted(self.memory, values[~seen])
+        if len(self.memory) >= self.memory_limit:
+            run_file = os.path.join(
+                self.spill_dir, f"hashes_{id(self)}_{len(self.runs)}.npy"
+            )
+            np.save(run_file, self.memory)
+            self.runs.append(np.load(run_file, mmap_mode="r"))
+            self.memory = np.array([], dtype=np.uint64)
+        return new
+
+
+def combined_dtype(dtypes):
+    """dtype of a column read whole, from the dtypes of its chunks"""
+    dtypes = list(dict.fromkeys(dtypes))
+    if len(dtypes) == 1:
+        return dtypes[0]
+    if all(
+        pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        for dtype in dtypes
+    ):
+        return np.result_type(*dtypes)
+    return np.dtype(object)
+
+
+def digest_bracket(digest, q, attempt):
+    """Bounds around quantile q from a column's digest, wider at each attempt"""
+    if attempt < len(quartile_brackets):
+        width = quartile_brackets[attempt]
+        return digest.quantile(max(q - width, 0)), digest.quantile(min(q + width, 1))
+    return digest.min, digest.max
+
+
+def exact_quartile(sorted_values, offset, count, q, weights=None):
+    """
+    Quantile q of `count` values, as Series.quantile interpolates it, from
+    sorted values (each repeated `weights` times, if given) holding the
+    ranks from offset onward; None if the two ranks around q * (count - 1)
+    are not among them
+    """
+    position = q * (count - 1)
+    ranks = np.array([np.floor(position), np.ceil(position)]) - offset
+    if weights is None:
+        weights = np.ones(len(sorted_values))
+    ends = np.cumsum(weights)
+    if ranks[0] < 0 or len(ends) == 0 or ranks[1] >= ends[-1]:
+        return None
+    pair = sorted_values[np.searchsorted(ends, ranks, side="right")]
+    return float(np.quantile(pair, position - np.floor(position)))
+
+
+class StreamingRepair:
+    """
+    The repairs of a RepairPipeline applied chunk by chunk, for files too
+    large to hold in memory, with the same result as the in-memory path.
+
+    The first pass reads the chunk dtypes of every column (settling the
+    dtype the whole column would have), the distinct values of the date
+    columns with their row counts, and a t-digest of every numeric column.
+    Quartiles are read exactly from a digest that still holds every
+    distinct value; otherwise later passes gather the distinct values (with
+    their counts) between two digest quantiles around each quartile and take
+    the exact ranks there, narrowing a bracket that holds too many values.
+    The last pass runs the stages on each chunk and appends it to Curated,
+    removing duplicates against every earlier chunk through a spillable
+    hash set, and moves the file into place once complete.
+    """
+
+    def __init__(self, pipeline, chunksize=200_000, hash_memory_limit=5_000_000):
+        self.pipeline = pipeline
+        self.chunksize = chunksize
+        self.hash_memory_limit = hash_memory_limit
+
+    def chunks(self, file_path, file_format, dtype, na_values=None):
+        return pd.read_csv(
+            file_path,
+            chunksize=self.chunksize,
+            dtype=dtype,
+            na_values=na_values,
+            **read_options(file_format),
+        )
+
+    def first_pass(self, file_path, file_format, file):
+        """
+        Whole-column dtypes, the na_values they were read with, date value
+        counts and numeric digests
+        """
+        typed = {}
+        if file["column_types"]:
+            typed = typed_read_options(file["column_types"], file_format["header"])
+        attempts = [(None, None)]
+        if typed.get("dtype"):
+            attempts.insert(0, (typed["dtype"], typed["na_values"]))
+        for dtype, na_values in attempts:
+            chunk_dtypes = {}
+            date_counts = {}
+            digests = {}
+            try:
+                for chunk in self.chunks(file_path, file_format, dtype, na_values):
+                    for column in chunk.columns:
+                        chunk_dtypes.setdefault(column, []).append(
+                            chunk[column].dtype
+                        )
+                    for column in self.pipeline.date_columns(chunk.columns, file):
+                        counts = date_counts.setdefault(column, {})
+                        value_counts = chunk[column].value_counts(sort=False)
+                        for value, count in zip(value_counts.index, value_counts):
+                            counts[value] = counts.get(value, 0) + int(count)
+                    for column in chunk.select_dtypes(include=["number"]).columns:
+                        digests.setdefault(column, TDigest()).update(
+                            chunk[column].to_numpy(dtype=float)
+                        )
+                break
+            except UnicodeDecodeError:
+                raise
+            except (ValueError, TypeError) as e:
+                if dtype is None:
+                    raise
+                print(f"Repairing {file['file_name']} without catalog types ({e})")
+
+        dtypes = {
+            column: combined_dtype(found) for column, found in chunk_dtypes.items()
+        }
+        numeric = [
+            column
+            for column, column_dtype in dtypes.items()
+            if pd.api.types.is_numeric_dtype(column_dtype)
+            and not pd.api.types.is_bool_dtype(column_dtype)
+        ]
+        numeric_digests = {column: digests[column] for column in numeric}
+        return dtypes, na_values, date_counts, numeric_digests
+
+    def quartiles(self, file_path, file_format, dtypes, digests, na_values=None):
+        """
+        Exact first and third quartiles of every numeric column, holding no
+        more than quartile_value_budget distinct values per quartile
+        """
+        quartiles = {}
+        brackets = {}  # (column, q) -> (low, high) gathered in the next pass
+        widened = {}  # (column, q) -> position in quartile_brackets
+        holding = {}  # (column, q) -> (digest, rows below, margin) of a full bracket
+        for column, digest in digests.items():
+            count = int(digest.weights.sum())
+            for q in (0.25, 0.75):
+                if count == 0:
+                    quartiles[(column, q)] = np.nan
+                elif digest.exact:
+                    # Every distinct value is still there with its row count
+                    values, inverse = np.unique(digest.means, return_inverse=True)
+                    weights = np.bincount(inverse, weights=digest.weights)
+                    quartiles[(column, q)] = exact_quartile(
+                        values, 0, count, q, weights
+                    )
+                else:
+                    widened[(column, q)] = 0
+                    brackets[(column, q)] = digest_bracket(digest, q, 0)
+
+        passes = 0
+        while brackets:
+            passes += 1
+            if passes > quartile_passes:
+                raise RuntimeError(
+                    f"Quartiles of {sorted({column for column, _ in brackets})} not "
+                    f"found within {quartile_value_budget} values in "
+                    f"{quartile_passes} passes over {file_path}"
+                )
+            below = dict.fromkeys(brackets, 0)
+            inside = {
+                key: TDigest(buffer_size=quartile_value_budget) for key in brackets
+            }
+            for chunk in self.chunks(file_path, file_format, dtypes, na_values):
+                for (column, q), (low, high) in brackets.items():
+                    values = chunk[column].to_numpy(dtype=float)
+                    values = values[~np.isnan(values)]
+                    below[(column, q)] += int((values < low).sum())
+                    inside[(column, q)].update(
+                        values[(values >= low) & (values <= high)]
+                    )
+
+            for key in list(brackets):
+                column, q = key
+                count = int(digests[column].weights.sum())
+                position = q * (count - 1)
+                rows = int(inside[key].weights.sum())
+                if below[key] <= np.floor(position) and np.ceil(position) < (
+                    below[key] + rows
+                ):
+                    if inside[key].exact:
+                        values, inverse = np.unique(
+                            inside[key].means, return_inverse=True
+                        )
+                        weights = np.bincount(inverse, weights=inside[key].weights)
+                        quartiles[key] = exact_quartile(
+                            values, below[key], count, q, weights
+                        )
+                        del brackets[key]
+                        continue
+                    # Too many values between the bounds: narrow them around
+                    # the ranks, from the digest of this bracket
+                    holding[key] = (
+                        inside[key],
+                        below[key],
+                        quartile_value_budget / (4 * rows),
+                    )
+                elif key in holding:
+                    # The narrower bracket missed the ranks: widen it within the
+                    # last one that held them
+                    digest, rows_below, margin = holding[key]
+                    holding[key] = (digest, rows_below, margin * 2)
+                else:
+                    widened[key] += 1
+                    brackets[key] = digest_bracket(digests[column], q, widened[key])
+                    continue
+
+                digest, rows_below, margin = holding[key]
+                last = max(digest.weights.sum() - 1, 1)
+                first_rank = (np.floor(position) - rows_below) / last
+                second_rank = (np.ceil(position) - rows_below) / last
+                brackets[key] = (
+                    digest.quantile(max(first_rank - margin, 0)),
+                    digest.quantile(min(second_rank + margin, 1)),
+                )
+        return quartiles
+
+    def repair_file(self, file_path, save_path, file_format=None):
+        if file_format is None:
+            file_format = sniff_file(file_path)
+        pipeline = self.pipeline
+        file = pipeline.file_info(file_path)
+
+        started = time.perf_counter()
+        dtypes, na_values, date_counts, digests = self.first_pass(
+            file_path, file_format, file
+        )
+        quartiles = self.quartiles(file_path, file_format, dtypes, digests, na_values)
+        pipeline.timed("first passes", started)
+
+        # Every date column formatted from the distinct values of the whole column
+        formatted_dates = {}
+        for column, counts in date_counts.items():
+            value_counts = pd.Series(counts, dtype="int64")
+            if not len(counts):
+                value_counts = pd.Series([], dtype="int64")
+            lookup, used = date_lookup(pd.Series(list(counts), dtype=object))
+            formatted_dates[column] = lookup.dt.strftime(pipeline.date_format)
+            print(describe_report(column, lookup_report(value_counts, lookup, used)))
+
+        fences = {}
+        for column, digest in digests.items():
+            lower, upper = pipeline.outlier_fences(
+                quartiles[(column, 0.25)], quartiles[(column, 0.75)]
+            )
+            integers = keeps_integers(digest.min, digest.max, lower, upper)
+            fences[column] = (lower, upper, integers)
+
+        subsets = None
+        try:
+            subsets = pipeline.duplicate_subsets(list(dtypes), file)
+        except Exception as e:
+            print(f"Error removing duplicates from {file_path}: {str(e)}")
+        spill_dir = tempfile.mkdtemp(prefix="repair_hashes_")
+        seen = [
+            SpillableHashSet(spill_dir, self.hash_memory_limit) for _ in subsets or []
+        ]
+        removed = [0] * len(seen)
+
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        try:
+            with atomic_path(save_path) as temp_path:
+                with open(temp_path, "w", newline="", encoding="utf-8") as out:
+                    header = True
+                    started = time.perf_counter()
+                    for chunk in self.chunks(
+                        file_path, file_format, dtypes, na_values
+                    ):
+                        pipeline.timed("read", started)
+
+                        started = time.perf_counter()
+                        chunk = pipeline.correct_product_names(chunk, file)
+                        pipeline.timed("product names", started)
+
+                        started = time.perf_counter()
+                        for column, formatted in formatted_dates.items():
+                            chunk[column] = format_dates(chunk[column], formatted)
+                        pipeline.timed("dates", started)
+
+                        started = time.perf_counter()
+                        for column, (lower, upper, integers) in fences.items():
+                            chunk[column] = clip_column(
+                                chunk[column], lower, upper, integers
+                            )
+                        pipeline.timed("outliers", started)
+
+                        started = time.perf_counter()
+                        for position, (subset, _) in enumerate(subsets or []):
+                            hashes = pd.util.hash_pandas_object(
+                                chunk[subset], index=False
+                            ).to_numpy()
+                            new = seen[position].add_new(hashes)
+                            removed[position] += int((~new).sum())
+                            chunk = chunk[new]
+                        pipeline.timed("duplicates", started)
+
+                        started = time.perf_counter()
+                        chunk.to_csv(out, header=header, index=False)
+                        header = False
+                        pipeline.timed("write", started)
+                        started = time.perf_counter()
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+        for (_, label), count in zip(subsets or [], removed):
+            print(f"Removed {count} duplicate rows based on {label}")
+        print(f"Saved corrected file to: {save_path}")
@@ -0,0 +1,479 @@
+import json
+import math
+import numpy as np
+
+# Templates are plain format strings built once at import; a report is
+# written piece by piece to the file instead of being concatenated in memory.
+
+report_head = """
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>Data Quality Report</title>
+                <style>
+                    body { 
+                        font-family: Arial, sans-serif; 
+                        margin: 20px; 
+                        background-color: #f5f5f5;
+                    }
+                    .header { 
+                        background-color: #ffffff; 
+                        padding: 20px; 
+                        border-radius: 5px;
+                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                        margin-bottom: 20px;
+                    }
+                    .section-header { 
+                        margin-top: 20px; 
+                        padding: 10px; 
+                        background-color: #e9ecef;
+                        border-radius: 5px;
+                    }
+                    .data-table { 
+                        width: 100%; 
+                        border-collapse: collapse; 
+                        margin-top: 10px;
+                        background-color: #ffffff;
+                    }
+                    .data-table th, .data-table td { 
+                        border: 1px solid #dee2e6; 
+                        padding: 12px; 
+                        text-align: left; 
+                    }
+                    .data-table th { 
+                        background-color: #f8f9fa;
+                        color: #495057;
+                    }
+                    .data-table tr:nth-child(even) {
+                        background-color: #f8f9fa;
+                    }
+                    .no-data { 
+                        color: #6c757d; 
+                        font-style: italic;
+                        padding: 20px;
+                        text-align: center;
+                    }
+                    .column-list { 
+                        word-wrap: break-word; 
+                        max-width: 500px;
+                        color: #495057;
+                    }
+                    .score-container {
+                        padding: 20px;
+                        background-color: #ffffff;
+                        border-radius: 5px;
+                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                        margin: 20px 0;
+                    }
+                    .overall-score {
+                        text-align: center;
+                        font-size: 24px;
+                        color: #2c3e50;
+                        margin-bottom: 20px;
+                    }
+                    # .score-interpretation {
+                    #     font-style: italic;
+                    #     color: #6c757d;
+                    #     margin-bottom: 15px;
+                    #     text-align: center;
+                    # }
+                    .component-scores {
+                        margin-bottom: 20px;
+                    }
+                    .score-table {
+                        width: 100%;
+                        margin-bottom: 20px;
+                        border-collapse: collapse;
+                        background-color: #ffffff;
+                        table-layout: fixed;
+                    }
+                    .score-table th, .score-table td {
+                        border: 1px solid #dee2e6;
+                        padding: 12px;
+                        text-align: left;
+                    }
+                    .score-table th {
+                        background-color: #f8f9fa;
+                        color: #495057;
+                    }
+                    .score-table th:first-child {
+                        width: 40%;
+                    }
+                    .score-table th:last-child {
+                        width: 60%;
+                    }
+                    .overall-score {
+                        text-align: center;
+                        font-size: 24px;
+                        color: #2c3e50;
+                        margin: 20px 0;
+                        padding: 20px;
+                    }
+                    .component-scores h4 {
+                        margin-bottom: 15px;
+                        color: #2c3e50;
+                    }
+                    .recommendations-list {
+                        list-style-type: disc;
+                        margin-left: 20px;
+                        color: #495057;
+                    }
+                    .analysis-section {
+                        margin: 20px 0;
+                        padding: 20px;
+                        background-color: #ffffff;
+                        border-radius: 5px;
+                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                    }
+                    .section-title {
+                        color: #2c3e50;
+                        border-bottom: 2px solid #3498db;
+                        padding-bottom: 10px;
+                        margin-bottom: 20px;
+                    }
+                    h2 {
+                        color: #2c3e50;
+                        margin-top: 0;
+                    }
+                    h3 {
+                        color: #2c3e50;
+                        margin-top: 0;
+                    }
+                    h4 {
+                        color: #2c3e50;
+                        margin-top: 0;
+                    }
+                </style>
+            </head>
+            <body>
+            """
+
+report_header = """
+                <div class='header'>
+                    <h2>Data Quality Report</h2>
+                    <p>File: {file_name}</p>
+                    <p>Generated: {timestamp}</p>
+                    <table class='data-table'>
+                        <tr>
+                            <th>Total Rows</th>
+                            <td>{total_rows:,}</td>
+                        </tr>
+                        <tr>
+                            <th>Total Columns</th>
+                            <td>{total_columns:,}</td>
+                        </tr>
+                        <tr>
+                            <th>Missing Columns</th>
+                            <td class="column-list">{missing_columns}</td>
+                        </tr>
+                        <tr>
+                            <th>Additional Columns</th>
+                            <td class="column-list">{additional_columns}</td>
+                        </tr>
+                        <tr>
+                            <th>Mandatory Columns</th>
+                            <td class="column-list">{mandatory_columns}</td>
+                        </tr>
+                        <tr>
+                            <th>Unique Columns</th>
+                            <td class="column-list">{unique_columns}</td>
+                        </tr>
+                        <tr>
+                            <th>Sensitive Columns</th>
+                            <td class="column-list">{sensitive_columns}</td>
+                        </tr>
+                        <tr>
+                            <th>Encrypted Columns</th>
+                            <td class="column-list">{encrypted_columns}</td>
+                        </tr>
+                        <tr>
+                            <th>Currency Columns</th>
+                            <td class="column-list">{currency_columns}</td>
+                        </tr>
+                    </table>
+                </div>
+            """
+
+score_open = """
+                    <div class='analysis-section'>
+                        <h3 class='section-title'>Data Quality Score</h3>
+                        <div class='score-container'>
+                            <div class='overall-score'>
+                                Overall Score: {overall_score:.1f}
+                            </div>
+                            <div class='component-scores'>
+                                <h4>Component Scores:</h4>
+                                <table class='score-table'>
+                                    <thead>
+                                        <tr>
+                                            <th>Metric</th>
+                                            <th>Score</th>
+                                        </tr>
+                                    </thead>
+                                    <tbody>
+                """
+
+score_row = """
+                        <tr>
+                            <td>{metric}</td>
+                            <td>{score:.1f}</td>
+                        </tr>
+                    """
+
+score_close = """
+                                    </tbody>
+                                </table>
+                            </div>
+                        </div>
+                    </div>
+                """
+
+delta_open = """
+                    <div class='analysis-section'>
+                        <h3 class='section-title'>Changes Since Baseline</h3>
+                        <p>Baseline: {baseline_file}</p>
+                        """
+
+delta_close = """
+                    </div>
+                """
+
+check_section_open = """
+                        <div class='section-header'>
+                            <h3>{title}</h3>
+                        </div>
+                        """
+
+check_section_close = """
+                    """
+
+analysis_section_open = """
+                <div class='analysis-section'>
+                    <h3 class='section-title'>{title}</h3>
+                    """
+
+analysis_section_close = """
+                </div>
+"""
+
+report_close = """
+                    </body>
+                </html>
+            """
+
+
+class TableTemplate:
+    """Header, row template and empty-table message of one report table"""
+
+    def __init__(self, headers, row, empty_message):
+        self.header = (
+            """
+        <table class='data-table'>
+            <tr>
+"""
+            + "".join(f"                <th>{header}</th>\n" for header in headers)
+            + """            </tr>
+        """
+        )
+        self.row = row
+        self.empty = f"<p class='no-data'>{empty_message}</p>"
+
+    def write(self, out, rows):
+        """Stream rows (dicts of the row template's fields) as a table"""
+        first = next(rows, None)
+        if first is None:
+            out.write(self.empty)
+            return
+        out.write(self.header)
+        out.write(self.row.format_map(first))
+        for row in rows:
+            out.write(self.row.format_map(row))
+        out.write("</table>")
+
+
+def row_template(*cells):
+    return (
+        """
+            <tr>
+"""
+        + "".join(f"                <td>{cell}</td>\n" for cell in cells)
+        + """            </tr>
+            """
+    )
+
+
+check_table = TableTemplate(
+    ["Column Name", "Total Records", "Count", "Percentage", "Details"],
+    row_template(
+        "{column}", "{total_records:,}", "{count:,}", "{percentage:.2f}%", "{detail}"
+    ),
+    "No data available for this section",
+)
+
+stats_table = TableTemplate(
+    ["Column", "Mean", "Median", "Std Dev", "Min", "Max", "Q1", "Q3"],
+    row_template(
+        "{column}", "{mean}", "{median}", "{std}", "{min}", "{max}", "{q1}", "{q3}"
+    ),
+    "No numeric columns available for analysis",
+)
+
+outliers_table = TableTemplate(
+    ["Column", "Outlier Count", "Percentage", "Lower Bound", "Upper Bound"],
+    row_template(
+        "{column}", "{count}", "{percentage}%", "{lower_bound}", "{upper_bound}"
+    ),
+    "No numeric columns available for outlier analysis",
+)
+
+currency_table = TableTemplate(
+    ["Column Name", "Total Records", "Invalid Format", "Negative", "Zero"],
+    row_template(
+        "{column}",
+        "{total_records:,}",
+        "{invalid_format:,} ({invalid_percentage:.2f}%)",
+        "{negative_values:,} ({negative_percentage:.2f}%)",
+        "{zero_values:,} ({zero_percentage:.2f}%)",
+    ),
+    "No currency columns flagged for this file",
+)
+
+correlations_table = TableTemplate(
+    ["Column 1", "Column 2", "Correlation"],
+    row_template("{column1}", "{column2}", "{correlation}"),
+    "No significant correlations found",
+)
+
+delta_table = TableTemplate(
+    ["Metric", "Column", "Before", "After", "Change"],
+    row_template("{metric}", "{column}", "{before}", "{after}", "{change}"),
+    "No differences from the baseline file",
+)
+
+
+def column_list(columns):
+    return ", ".join(columns) if columns else "None"
+
+
+def by_column(stats):
+    """{column: {stat: value}} -> rows with the column name as a field"""
+    return ({"column": col, **values} for col, values in stats.items())
+
+
+def write_recommendations(out, recommendations):
+    if not recommendations:
+        out.write("<p class='no-data'>No specific recommendations generated</p>")
+        return
+    out.write("<ul class='recommendations-list'>")
+    for rec in recommendations:
+        out.write(f"<li>{rec}</li>")
+    out.write("</ul>")
+
+
+def write_html_report(out, report_data, timestamp):
+    """Write the HTML report of one file to an open text file"""
+    file_metadata = report_data["file_metadata"]
+    out.write(report_head)
+    out.write(
+        report_header.format(
+            file_name=report_data["file_name"],
+            timestamp=timestamp,
+            total_rows=report_data["total_rows"],
+            total_columns=report_data["total_columns"],
+            missing_columns=column_list(report_data.get("missing_columns", [])),
+            additional_columns=column_list(report_data.get("additional_columns", [])),
+            mandatory_columns=column_list(file_metadata.flagged("mandatory")),
+            unique_columns=column_list(file_metadata.flagged("unique")),
+            sensitive_columns=column_list(file_metadata.flagged("sensitive")),
+            encrypted_columns=column_list(file_metadata.flagged("encrypted")),
+            currency_columns=column_list(file_metadata.flagged("currency")),
+        )
+    )
+
+    if "quality_score" in report_data:
+        quality_score = report_data["quality_score"]
+        out.write(score_open.format(overall_score=quality_score["overall_score"]))
+        for metric, score in quality_score["component_scores"].items():
+            out.write(score_row.format(metric=metric.title(), score=score))
+        out.write(score_close)
+
+    if "delta" in report_data:
+        out.write(delta_open.format(baseline_file=report_data["baseline_file"]))
+        delta_table.write(out, iter(report_data["delta"]))
+        out.write(delta_close)
+
+    sections = [
+        ("Null Check", report_data.get("mandatory_stats", [])),
+        ("Duplicate Check", report_data.get("unique_stats", [])),
+        ("Sensitive Data Check", report_data.get("sensitive_stats", [])),
+        ("Encryption Check", report_data.get("encrypted_stats", [])),
+        ("Format Check", report_data.get("pattern_stats", [])),
+    ]
+    for title, stats in sections:
+        if stats:
+            out.write(check_section_open.format(title=title))
+            check_table.write(out, iter(stats))
+            out.write(check_section_close)
+
+    if report_data.get("currency_stats"):
+        out.write(check_section_open.format(title="Currency Check"))
+        currency_table.write(out, iter(report_data["currency_stats"]))
+        out.write(check_section_close)
+
+    analysis_sections = [
+        (
+            "Descriptive Statistics",
+            stats_table,
+            by_column(report_data.get("descriptive_stats", {})),
+        ),
+        ("Outlier Analysis", outliers_table, by_column(report_data.get("outliers", {}))),
+        (
+            "Correlation Analysis",
+            correlations_table,
+            iter(report_data.get("correlations", [])),
+        ),
+    ]
+    for title, table, rows in analysis_sections:
+        out.write(analysis_section_open.format(title=title))
+        table.write(out, rows)
+        out.write(analysis_section_close)
+    out.write(analysis_section_open.format(title="Recommendations"))
+    write_recommendations(out, report_data.get("recommendations", []))
+    out.write(analysis_section_close)
+    out.write(report_close)
+
+
+def to_json_value(value):
+    """Plain JSON types for report data: numpy scalars unwrapped, NaN -> null"""
+    if isinstance(value, dict):
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return None
+    return value
+
+
+def report_sidecar(report_data, timestamp):
+    """The report data as written next to the HTML report"""
+    file_metadata = report_data["file_metadata"]
+    sidecar = {
+        key: value for key, value in report_data.items() if key != "file_metadata"
+    }
+    sidecar["timestamp"] = timestamp
+    sidecar["source"] = file_metadata.source
+    sidecar["expected_columns"] = file_metadata.expected_columns
+    sidecar["flagged_columns"] = file_metadata.flags
+    return to_json_value(sidecar)
+
+
+def write_json_sidecar(out, report_data, timestamp):
+    json.dump(
+        report_sidecar(report_data, timestamp),
+        out,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        allow_nan=False,
+    )
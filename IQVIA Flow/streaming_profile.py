@@ -0,0 +1,335 @@
+import numpy as np
+import pandas as pd
+from column_profiler import hash_column
+from column_checks import check_column
+from column_stats import ColumnStatsPlan, quantile_levels
+
+
+class TDigest:
+    """
+    Merging t-digest for quantiles of a stream of values.
+
+    Values are buffered as they come and, once the buffer passes
+    `buffer_size`, collapsed into (value, count) pairs. As long as a column
+    has no more than `buffer_size` distinct values (quantities, prices, codes)
+    those pairs are kept and its quantiles stay exact. Past that, values are
+    merged into centroids sized with the arcsine scale function, which keeps
+    them small near the tails where the IQR fences and extremes are read.
+    """
+
+    def __init__(self, compression=200, buffer_size=50_000):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.array([], dtype=float)
+        self.weights = np.array([], dtype=float)
+        self.min = np.inf
+        self.max = -np.inf
+        self.exact = True  # Every centroid still holds a single value
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.means = np.concatenate([self.means, values])
+        self.weights = np.concatenate([self.weights, np.ones(len(values))])
+        if len(self.means) > self.buffer_size:
+            self.compress()
+
+    def merge(self, other):
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.exact = self.exact and other.exact
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        if len(self.means) > self.buffer_size:
+            self.compress()
+
+    def compress(self):
+        means, inverse = np.unique(self.means, return_inverse=True)
+        weights = np.bincount(inverse, weights=self.weights)
+        if self.exact and len(means) <= self.buffer_size:
+            self.means, self.weights = means, weights
+            return
+
+        q_left = (np.cumsum(weights) - weights) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        # Neighbouring values within one unit of the scale function share a centroid
+        clusters = np.floor(k - k[0]).astype(np.int64)
+        cluster_weights = np.bincount(clusters, weights=weights)
+        cluster_sums = np.bincount(clusters, weights=weights * means)
+        used = cluster_weights > 0
+        self.weights = cluster_weights[used]
+        self.means = cluster_sums[used] / self.weights
+        self.exact = False
+
+    def quantile(self, q):
+        """Quantile with the same linear interpolation as numpy/pandas"""
+        if len(self.means) == 0:
+            return np.nan
+        order = np.argsort(self.means, kind="stable")
+        means, weights = self.means[order], self.weights[order]
+        total = weights.sum()
+        if self.exact:
+            # Values at the two ranks around q * (n - 1), as np.quantile does
+            rank = q * (total - 1)
+            ends = np.cumsum(weights)
+            lower = means[np.searchsorted(ends, np.floor(rank), side="right")]
+            upper = means[np.searchsorted(ends, np.ceil(rank), side="right")]
+            return lower + (rank - np.floor(rank)) * (upper - lower)
+        positions = np.concatenate([[0.5], np.cumsum(weights) - weights / 2, [total - 0.5]])
+        values = np.concatenate([[self.min], means, [self.max]])
+        return np.interp(q * (total - 1) + 0.5, positions, values)
+
+
+class CoMoments:
+    """
+    Pairwise counts, means, sums of squares and co-moments of numeric columns,
+    merged chunk by chunk with the parallel Welford update (Chan et al.).
+
+    Entry [i, j] covers the rows where both columns i and j are non-null,
+    which is how pandas' DataFrame.corr handles nulls; the diagonal holds the
+    plain per-column count, mean and sum of squares.
+    """
+
+    def __init__(self, size):
+        self.n = np.zeros((size, size))
+        self.mean = np.zeros((size, size))  # Mean of column i where j is non-null
+        self.m2 = np.zeros((size, size))  # Sum of squares of column i where j is non-null
+        self.c = np.zeros((size, size))  # Co-moment of columns i and j
+
+    def update(self, block):
+        present = ~np.isnan(block)
+        weights = present.astype(float)
+        with np.errstate(all="ignore"):
+            # Centre each chunk on its own means to keep the sums small
+            shift = np.nan_to_num(np.nanmean(block, axis=0))
+            x = np.where(present, block - shift, 0.0)
+            n = weights.T @ weights
+            sums = x.T @ weights
+            chunk_mean = np.where(n > 0, sums / n, 0.0)
+            m2 = (x * x).T @ weights - sums * chunk_mean
+            c = x.T @ x - sums * chunk_mean.T
+        self.merge_moments(n, chunk_mean + shift[:, None], m2, c)
+
+    def merge(self, other):
+        self.merge_moments(other.n, other.mean, other.m2, other.c)
+
+    def merge_moments(self, n, mean, m2, c):
+        total = self.n + n
+        with np.errstate(all="ignore"):
+            delta = np.where(total > 0, mean - self.mean, 0.0)
+            factor = np.where(total > 0, self.n * n / total, 0.0)
+            self.c = self.c + c + delta * delta.T * factor
+            self.m2 = self.m2 + m2 + delta**2 * factor
+            self.mean = self.mean + np.where(total > 0, delta * n / total, 0.0)
+        self.n = total
+
+    def column_mean(self):
+        return np.diag(self.mean).copy()
+
+    def column_std(self):
+        n = np.diag(self.n)
+        with np.errstate(all="ignore"):
+            return np.where(n > 1, np.sqrt(np.diag(self.m2) / (n - 1)), np.nan)
+
+    def correlation(self):
+        with np.errstate(all="ignore"):
+            return self.c / np.sqrt(self.m2 * self.m2.T)
+
+
+def merge_sorted(first, second):
+    """Union of two disjoint sorted arrays; timsort merges the two runs in linear time"""
+    merged = np.concatenate([first, second])
+    merged.sort(kind="stable")
+    return merged
+
+
+class DuplicateCounter:
+    """
+    Exact duplicate counts of a column from its 64-bit value hashes: rows
+    whose value occurs more than once, and how many values that is.
+
+    Memory grows with the distinct values of the column, not with its rows.
+    With `stop_at_duplicate` the counter only answers whether the column has
+    a duplicate and frees its hashes as soon as it finds one.
+    """
+
+    def __init__(self, stop_at_duplicate=False):
+        self.stop_at_duplicate = stop_at_duplicate
+        self.seen = np.array([], dtype=np.uint64)
+        self.duplicated = np.array([], dtype=np.uint64)
+        self.duplicate_rows = 0
+
+    @property
+    def has_duplicates(self):
+        return self.duplicate_rows > 0
+
+    def update(self, hashes):
+        if self.stop_at_duplicate and self.has_duplicates:
+            return
+        values, counts = np.unique(hashes, return_counts=True)
+        in_seen = np.isin(values, self.seen, assume_unique=True)
+        in_duplicated = np.isin(values, self.duplicated, assume_unique=True)
+        # A value seen in an earlier chunk also turns that first row into a duplicate
+        newly_repeated = in_seen & ~in_duplicated
+        repeated_here = ~in_seen & (counts > 1)
+        self.duplicate_rows += int(
+            counts[in_duplicated].sum()
+            + (counts[newly_repeated] + 1).sum()
+            + counts[repeated_here].sum()
+        )
+        if self.stop_at_duplicate and self.has_duplicates:
+            self.seen = self.duplicated = np.array([], dtype=np.uint64)
+            return
+        self.duplicated = merge_sorted(
+            self.duplicated, values[newly_repeated | repeated_here]
+        )
+        self.seen = merge_sorted(self.seen, values[~in_seen])
+
+    def merge(self, other):
+        common = np.intersect1d(self.seen, other.seen, assume_unique=True)
+        repeated_here = np.isin(common, self.duplicated, assume_unique=True)
+        repeated_there = np.isin(common, other.duplicated, assume_unique=True)
+        # Rows not yet counted: both rows of a value seen once on each side,
+        # or the single row on the side where the value was not repeated
+        self.duplicate_rows += (
+            other.duplicate_rows
+            + 2 * int((~repeated_here & ~repeated_there).sum())
+            + int((repeated_here ^ repeated_there).sum())
+        )
+        if self.stop_at_duplicate and self.has_duplicates:
+            self.seen = self.duplicated = np.array([], dtype=np.uint64)
+            return
+        self.duplicated = np.union1d(np.union1d(self.duplicated, other.duplicated), common)
+        self.seen = merge_sorted(
+            self.seen, other.seen[~np.isin(other.seen, common, assume_unique=True)]
+        )
+
+    @property
+    def duplicate_values(self):
+        return len(self.duplicated)
+
+
+class StreamingFileProfile:
+    """
+    Everything a DQ report needs from one file, accumulated chunk by chunk:
+    null-like/sensitive/encrypted counts, duplicate counts, value shapes,
+    and the moments, t-digests and co-moments of the numeric candidates.
+
+    A numeric candidate stays numeric only if every chunk parsed it as a
+    number, and is analyzable unless its values are all distinct, as in the
+    in-memory profile. Outliers need the final IQR fences, so they are
+    counted in a second pass with `count_outliers`.
+    """
+
+    def __init__(self, check_columns, duplicate_columns, numeric_candidates, pattern_miner):
+        self.check_columns = list(check_columns)
+        self.numeric_candidates = list(numeric_candidates)
+        self.pattern_miner = pattern_miner
+        self.row_count = 0
+        self.column_checks = {}
+        self.duplicates = {col: DuplicateCounter() for col in duplicate_columns}
+        self.uniqueness = {
+            col: DuplicateCounter(stop_at_duplicate=True)
+            for col in self.numeric_candidates
+        }
+        self.non_numeric = set()
+        self.non_integer = set()
+        self.digests = {col: TDigest() for col in self.numeric_candidates}
+        self.moments = CoMoments(len(self.numeric_candidates))
+        self.shapes = {}
+        self.text_columns = set()
+
+    def update(self, chunk):
+        self.row_count += len(chunk)
+
+        for col in self.check_columns:
+            counts = check_column(chunk[col])
+            if col in self.column_checks:
+                counts = {
+                    check: self.column_checks[col][check] + count
+                    for check, count in counts.items()
+                }
+            self.column_checks[col] = counts
+
+        for col, counter in self.duplicates.items():
+            counter.update(hash_column(chunk[col]))
+
+        for col in chunk.columns:
+            if chunk[col].dtype != object:
+                continue
+            self.text_columns.add(col)
+            counts = self.pattern_miner.shape_counts(chunk[col])
+            if col in self.shapes:
+                counts = self.pattern_miner.merge_counts(self.shapes[col], counts)
+            self.shapes[col] = counts
+
+        if self.numeric_candidates:
+            columns = []
+            for col in self.numeric_candidates:
+                dtype = chunk[col].dtype
+                if not np.issubdtype(dtype, np.number):
+                    self.non_numeric.add(col)
+                    columns.append(pd.Series(np.nan, index=chunk.index))
+                    continue
+                if not pd.api.types.is_integer_dtype(dtype):
+                    self.non_integer.add(col)
+                columns.append(chunk[col])
+                self.uniqueness[col].update(hash_column(chunk[col]))
+            block = np.column_stack([column.to_numpy(dtype=float) for column in columns])
+            self.moments.update(block)
+            for i, col in enumerate(self.numeric_candidates):
+                self.digests[col].update(block[:, i])
+
+    def numeric_columns(self):
+        """Numeric candidates that pass the in-memory analyzable checks"""
+        counts = np.diag(self.moments.n)
+        columns = []
+        for i, col in enumerate(self.numeric_candidates):
+            if col in self.non_numeric:
+                continue
+            all_distinct = (
+                counts[i] == self.row_count and not self.uniqueness[col].has_duplicates
+            )
+            if not all_distinct:
+                columns.append(col)
+        return columns
+
+    def stats_plan(self):
+        columns = self.numeric_columns()
+        positions = [self.numeric_candidates.index(col) for col in columns]
+        quantiles = np.array(
+            [[self.digests[col].quantile(q) for col in columns] for q in quantile_levels]
+        ).reshape(len(quantile_levels), len(columns))
+        summary = {
+            "mean": self.moments.column_mean()[positions],
+            "std": self.moments.column_std()[positions],
+            "min": np.array([self.digests[col].min for col in columns], dtype=float),
+            "max": np.array([self.digests[col].max for col in columns], dtype=float),
+            "q1": quantiles[0],
+            "median": quantiles[1],
+            "q3": quantiles[2],
+        }
+        # Columns without a single value have no extremes
+        for key in ["min", "max"]:
+            summary[key][~np.isfinite(summary[key])] = np.nan
+        integer_columns = [col for col in columns if col not in self.non_integer]
+        return ColumnStatsPlan(columns, self.row_count, integer_columns, summary)
+
+    def correlation_matrix(self, columns):
+        positions = [self.numeric_candidates.index(col) for col in columns]
+        corr = self.moments.correlation()[np.ix_(positions, positions)]
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def count_outliers(self, plan, chunks):
+        """Second pass: values outside the plan's IQR fences per numeric column"""
+        lower_bounds, upper_bounds = plan.iqr_bounds()
+        counts = np.zeros(len(plan.numeric_columns), dtype=np.int64)
+        for chunk in chunks:
+            block = chunk[plan.numeric_columns].to_numpy(dtype=float)
+            with np.errstate(invalid="ignore"):
+                counts += ((block < lower_bounds) | (block > upper_bounds)).sum(axis=0)
+        plan.outlier_rows = counts
+        return counts
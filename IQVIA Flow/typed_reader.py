@@ -0,0 +1,145 @@
+import os
+import importlib.util
+import pandas as pd
+from file_sniffer import clean_header_name, read_options, sniff_file
+
+# Catalog "Data Type" -> dtype the column is read with. Booleans are left to
+# pandas, and dates are read as text: the stages check and normalize their
+# formats themselves.
+catalog_dtypes = {
+    "int": "int64",
+    "float": "float64",
+    "string": "object",
+    "date": "object",
+}
+
+# Null spellings pandas doesn't know ("Null", "NONE", "NaT"), read as missing in
+# int, float and date columns only, where no real value is spelled that way
+typed_null_tokens = sorted(
+    {
+        spelling
+        for token in ["null", "none", "nan", "na", "nat", "n/a"]
+        for spelling in [token, token.upper(), token.title()]
+    }
+    | {"NaT"}
+)
+
+# read_csv options the pyarrow engine can't honour; low_memory is just dropped
+pyarrow_unsupported = {"chunksize", "iterator", "nrows", "thousands", "comment"}
+
+has_pyarrow = importlib.util.find_spec("pyarrow") is not None
+
+
+def catalog_column_types(column_names, data_types):
+    """{clean column name: catalog data type} from schema master columns"""
+    return {
+        clean_header_name(column): str(data_type).strip().lower()
+        for column, data_type in zip(column_names, data_types)
+        if pd.notna(data_type)
+    }
+
+
+def typed_read_options(column_types, header, usecols=None, na_values=None):
+    """
+    dtype, na_values (and usecols) read_csv arguments for a file whose raw
+    header was sniffed, matching catalog columns by their cleaned names.
+    Every column gets the given na_values; int, float and date columns also
+    get the null spellings pandas misses.
+    """
+    counts = pd.Series([clean_header_name(name) for name in header]).value_counts()
+    dtype = {}
+    column_na_values = {}
+    for name in header:
+        column_na_values[name] = list(na_values or [])
+        data_type = column_types.get(clean_header_name(name))
+        if counts[clean_header_name(name)] > 1 or data_type not in catalog_dtypes:
+            continue  # Ambiguous after clean-up, or left to pandas
+        dtype[name] = catalog_dtypes[data_type]
+        if data_type != "string":
+            column_na_values[name] += typed_null_tokens
+
+    options = {"dtype": dtype, "na_values": column_na_values} if dtype else {}
+    if usecols is not None:
+        wanted = {clean_header_name(col) for col in usecols}
+        options["usecols"] = [
+            name for name in header if clean_header_name(name) in wanted
+        ]
+        options["dtype"] = {
+            name: value for name, value in dtype.items() if name in options["usecols"]
+        }
+    return options
+
+
+def read_typed_csv(
+    file_path,
+    file_format=None,
+    column_types=None,
+    usecols=None,
+    **kwargs,
+):
+    """
+    Read a CSV with the dtypes recorded in the catalog.
+
+    The multithreaded pyarrow engine is used when it is installed. A value
+    that doesn't fit its catalog type (the file changed since it was
+    cataloged) makes the read fall back to the C engine with the same
+    types, then to plain type inference, so a stale catalog costs one more
+    read but never fails the stage. Encoding errors are left to the caller.
+    Null spellings like "Null" or "NaT" are read as missing in int, float
+    and date columns, so they don't break the typed read.
+    """
+    if file_format is None:
+        file_format = sniff_file(file_path)
+    options = {**read_options(file_format), **kwargs}
+
+    typed = {}
+    if column_types:
+        typed = typed_read_options(
+            column_types, file_format["header"], usecols, options.get("na_values")
+        )
+    elif usecols is not None:
+        typed = {"usecols": usecols}
+    untyped = {
+        key: value for key, value in typed.items() if key not in ("dtype", "na_values")
+    }
+
+    # The pyarrow engine only takes one na_values list for all columns
+    na_lists = {tuple(tokens) for tokens in typed.get("na_values", {}).values()}
+
+    # With every column typed the parser has nothing to infer: pyarrow can't
+    # infer differently (e.g. dates), and the C parser can tokenize in chunks
+    # without producing mixed-type columns
+    read_columns = typed.get("usecols", file_format["header"])
+    fully_typed = len(typed.get("dtype", {})) == len(read_columns)
+
+    attempts = []
+    if (
+        fully_typed
+        and len(na_lists) <= 1
+        and has_pyarrow
+        and not pyarrow_unsupported & set(options)
+    ):
+        pyarrow_options = {
+            key: value for key, value in options.items() if key != "low_memory"
+        }
+        pyarrow_typed = {**typed, "na_values": list(next(iter(na_lists), ()))}
+        attempts.append(("pyarrow", {**pyarrow_options, **pyarrow_typed}))
+    if typed.get("dtype"):
+        typed_options = {**options, **typed}
+        if fully_typed:
+            typed_options["low_memory"] = True
+        attempts.append(("c", typed_options))
+    attempts.append(("c", {**options, **untyped}))
+
+    file_name = os.path.basename(file_path)
+    for position, (engine, attempt) in enumerate(attempts):
+        try:
+            df = pd.read_csv(file_path, engine=engine, **attempt)
+            break
+        except UnicodeDecodeError:
+            raise
+        except (ValueError, TypeError, OverflowError) as e:
+            if position == len(attempts) - 1:
+                raise
+            print(f"Typed read of {file_name} with {engine} failed ({e}); retrying")
+    return df
@@ -0,0 +1,94 @@
+import string
+import pandas as pd
+
+# Upper-case letters -> "A", lower-case -> "a", digits -> "9"; everything else
+# (separators, symbols, spaces) is kept as is, so "S001" -> "A999" and
+# "03-12-2024" -> "99-99-9999"
+shape_table = str.maketrans(
+    string.ascii_uppercase + string.ascii_lowercase + string.digits,
+    "A" * 26 + "a" * 26 + "9" * 10,
+)
+
+
+def value_shapes(values):
+    """Shape signature of every value in a Series of strings"""
+    shapes = values.str.translate(shape_table)
+    # Letters and digits outside ASCII are rare; map them with a regex
+    non_ascii = shapes.str.contains(r"[^\W_Aa9]", regex=True)
+    if non_ascii.any():
+        shapes[non_ascii] = (
+            shapes[non_ascii]
+            .str.replace(r"\d", "9", regex=True)
+            .str.replace(r"[^\W\d_Aa]", "A", regex=True)
+        )
+    return shapes
+
+
+class ValuePatternMiner:
+    """
+    Mine the value shapes of text columns and flag values in minority shapes.
+
+    Values are counted once per column, and only the distinct values are
+    translated to shapes, whose counts are then summed by shape. A column
+    has a format when one shape covers at least `min_dominant_share` of its
+    non-null values (free text such as names never does); shapes below
+    `max_violation_share` are then reported as format violations.
+    """
+
+    def __init__(self, min_dominant_share=0.6, max_violation_share=0.2, max_examples=3):
+        self.min_dominant_share = min_dominant_share
+        self.max_violation_share = max_violation_share
+        self.max_examples = max_examples
+
+    def shape_counts(self, series):
+        """Return (shape frequency table, distinct values with their shape and count)"""
+        value_counts = series.dropna().astype(str).value_counts(sort=False)
+        distinct = pd.DataFrame(
+            {
+                "value": value_counts.index,
+                "shape": value_shapes(pd.Series(value_counts.index, dtype=object)),
+                "count": value_counts.to_numpy(),
+            }
+        )
+        shape_counts = distinct.groupby("shape", sort=False)["count"].sum()
+        return shape_counts, distinct
+
+    def merge_counts(self, counts, other):
+        """Merge two shape_counts results, e.g. from consecutive chunks of a file"""
+        shape_counts = pd.concat([counts[0], other[0]]).groupby(level=0, sort=False).sum()
+        # A few examples per shape are all a report ever shows
+        distinct = (
+            pd.concat([counts[1], other[1]], ignore_index=True)
+            .drop_duplicates("value")
+            .groupby("shape", sort=False)
+            .head(self.max_examples)
+        )
+        return shape_counts, distinct
+
+    def check_column(self, series):
+        """Return the dominant shape and its violations, or None without a format"""
+        if series.dtype != object:
+            return None
+        return self.check_counts(*self.shape_counts(series))
+
+    def check_counts(self, shape_counts, distinct):
+        shape_counts = shape_counts.sort_values(ascending=False, kind="stable")
+        non_null = int(shape_counts.sum())
+        if non_null == 0 or len(shape_counts) < 2:
+            return None
+
+        dominant = shape_counts.index[0]
+        if shape_counts.iloc[0] / non_null < self.min_dominant_share:
+            return None
+        violations = shape_counts[shape_counts / non_null <= self.max_violation_share]
+        if violations.empty:
+            return None
+
+        examples = distinct[distinct["shape"].isin(violations.index)]["value"]
+        return {
+            "dominant_pattern": dominant,
+            "dominant_count": int(shape_counts.iloc[0]),
+            "violation_count": int(violations.sum()),
+            "violation_patterns": violations.index.tolist(),
+            "examples": examples.head(self.max_examples).tolist(),
+        }
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The agents and their helper modules are flat scripts in "IQVIA Flow"
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "IQVIA Flow")
+)
@@ -0,0 +1,60 @@
+from candidate_keys import CandidateKeyMiner
+from column_profiler import profile_file, catalog_dtype
+from file_sniffer import sniff_file
+
+
+def mine(tmp_path, text, **options):
+    path = tmp_path / "file.csv"
+    path.write_text(text)
+    profiles = profile_file(str(path))
+    miner = CandidateKeyMiner(**options)
+    keys = miner.find_keys(str(path), profiles)
+    return profiles, keys, miner.primary_key(keys, list(profiles))
+
+
+def test_single_column_key(tmp_path):
+    _, keys, primary_key = mine(
+        tmp_path, "Name,Customer ID,City\na,1,x\nb,2,x\nc,3,y\n"
+    )
+    assert set(keys) == {("Name",), ("Customer ID",)}
+    assert primary_key == ("Customer ID",)
+
+
+def test_composite_key(tmp_path):
+    _, keys, primary_key = mine(
+        tmp_path,
+        "Store,Product,Quantity\n1,a,5\n1,b,5\n2,a,7\n2,b,9\n",
+    )
+    assert ("Store", "Product") in keys
+    assert primary_key == ("Store", "Product")
+
+
+def test_duplicated_row_breaks_the_key(tmp_path):
+    profiles, keys, primary_key = mine(
+        tmp_path,
+        "Prescription ID,Patient\n1,a\n2,b\n2,b\n3,c\n",
+    )
+    assert not profiles["Prescription ID"].is_unique()
+    assert ("Prescription ID",) not in keys
+    assert "Prescription ID" not in primary_key
+
+
+def test_keys_verified_past_the_sample(tmp_path):
+    rows = "".join(f"{i},{i % 3}\n" for i in range(1, 11)) + "5,9\n"
+    _, keys, _ = mine(tmp_path, "ID,Group\n" + rows, sample_rows=4)
+    assert ("ID",) not in keys
+    assert ("ID", "Group") in keys
+
+
+def test_sniffed_format_and_catalog_types(tmp_path):
+    path = tmp_path / "latin1.csv"
+    path.write_bytes(
+        "Code;Région;Amount\n1;Île;2.5\n2;Orléans;3\n3;Île;4\n".encode("latin1")
+    )
+    file_format = sniff_file(str(path))
+    dtype = catalog_dtype(str(path), file_format, {"Code": "int", "Amount": "float"})
+    profiles = profile_file(str(path), file_format=file_format)
+    miner = CandidateKeyMiner(sample_rows=2)
+    keys = miner.find_keys(str(path), profiles, file_format, dtype)
+    assert ("Code",) in keys
+    assert miner.primary_key(keys, list(profiles)) == ("Code",)
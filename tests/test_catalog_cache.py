@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+import Catalog_Agent
+import file_sniffer
+from catalog_manifest import CatalogManifest
+
+source_mapping = {
+    "HealthMart": {"Source ID": 1, "Source Type": "File", "File Type": "CSV Files"},
+    "WalGreen": {"Source ID": 2, "Source Type": "File", "File Type": "CSV Files"},
+}
+
+clients = "Client ID,Client Name\n1,Ann\n2,Bob\n3,Cy\n"
+
+
+def test_identical_files_keep_their_own_cache(tmp_path):
+    paths = []
+    for source in ["HealthMart", "WalGreen"]:
+        (tmp_path / source).mkdir()
+        path = tmp_path / source / "Clients.csv"
+        path.write_text(clients)
+        paths.append(str(path))
+
+    manifest = CatalogManifest(str(tmp_path / "m.json"), str(tmp_path / "cache"))
+    for path in paths:
+        manifest.store(path, [{"Source Name": path}], {})
+    manifest.save()
+
+    manifest = CatalogManifest(str(tmp_path / "m.json"), str(tmp_path / "cache"))
+    for path in paths:
+        assert manifest.load_cached(path)["rows"] == [{"Source Name": path}]
+
+
+def run_catalog(monkeypatch, tmp_path):
+    monkeypatch.setattr(Catalog_Agent, "main_folder_path", str(tmp_path / "Raw"))
+    monkeypatch.setattr(Catalog_Agent, "load_source_mapping", lambda f: source_mapping)
+    monkeypatch.setattr(Catalog_Agent, "catalog_workers", 1)
+    monkeypatch.setattr(Catalog_Agent, "incremental_catalog", True)
+    monkeypatch.setattr(
+        Catalog_Agent, "schema_master_file", str(tmp_path / "schemaMaster.csv")
+    )
+    monkeypatch.setattr(
+        Catalog_Agent, "catalog_manifest_file", str(tmp_path / "manifest.json")
+    )
+    monkeypatch.setattr(Catalog_Agent, "profile_cache_dir", str(tmp_path / "Profiles"))
+    monkeypatch.setattr(
+        Catalog_Agent,
+        "FileFormatManifest",
+        lambda: file_sniffer.FileFormatManifest(str(tmp_path / "formats.json")),
+    )
+    Catalog_Agent.main()
+    return pd.read_csv(tmp_path / "schemaMaster.csv")
+
+
+def test_reused_rows_keep_their_source(monkeypatch, tmp_path):
+    # Text columns reach the spaCy tier of the entity detector
+    pytest.importorskip("spacy")
+    for source in ["HealthMart", "WalGreen"]:
+        (tmp_path / "Raw" / source).mkdir(parents=True)
+        (tmp_path / "Raw" / source / "Clients.csv").write_text(clients)
+
+    first = run_catalog(monkeypatch, tmp_path)
+    second = run_catalog(monkeypatch, tmp_path)
+
+    columns = ["Source ID", "Source Name", "File ID", "File Name", "Column Name"]
+    assert second[columns].equals(first[columns])
+    for source, rows in second.groupby("Source Name"):
+        assert (rows["Source ID"] == source_mapping[source]["Source ID"]).all()
@@ -0,0 +1,104 @@
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from column_profiler import HyperLogLog, ColumnProfile, hash_column, profile_file
+
+
+def write_csv(tmp_path, text, name="file.csv"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def summary(profile):
+    return (
+        profile.row_count,
+        profile.null_count,
+        profile.distinct_count(),
+        profile.is_unique(),
+        profile.is_numeric(),
+        profile.is_auto_gen(),
+        profile.data_type(),
+        profile.min_value,
+        profile.max_value,
+    )
+
+
+def test_hash_column_ignores_chunk_dtype():
+    as_numbers = hash_column(pd.Series([1, 2, 3]))
+    as_floats = hash_column(pd.Series([1.0, 2.0, 3.0]))
+    as_text = hash_column(pd.Series(["1", "2", "3"]))
+    assert (as_numbers == as_floats).all()
+    assert (as_numbers == as_text).all()
+    assert hash_column(pd.Series([2.5]))[0] == hash_column(pd.Series(["2.5"]))[0]
+
+
+def test_dtype_changing_between_chunks(tmp_path):
+    path = write_csv(tmp_path, "K\n1\n2\n3\nx\n1\n")
+    streamed = profile_file(path, chunksize=3)["K"]
+    assert not streamed.is_unique()
+    assert streamed.distinct_count() == 4
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 7])
+def test_streaming_matches_whole_file(tmp_path, chunksize):
+    path = write_csv(
+        tmp_path,
+        "ID,Code,Price,Name,Note\n"
+        "1,10,2.5,a,\n"
+        "2,11,3,b,x\n"
+        "3,10,,c,\n"
+        "4,12,7.25,d,y\n"
+        "5,13,1,a,\n"
+        "6,14,9.5,e,z\n",
+    )
+    whole = profile_file(path, chunksize=100)
+    streamed = profile_file(path, chunksize=chunksize)
+    assert list(streamed) == list(whole)
+    for column in whole:
+        assert summary(streamed[column]) == summary(whole[column]), column
+
+
+def test_merge_matches_single_profile():
+    values = pd.Series(np.arange(1, 11))
+    whole = ColumnProfile("x")
+    whole.update(values)
+    first, second = ColumnProfile("x"), ColumnProfile("x")
+    first.update(values[:4])
+    second.update(values[4:])
+    merged = first.merge(second)
+    assert summary(merged) == summary(whole)
+    assert merged.is_auto_gen()
+
+
+def test_hyperloglog_estimate():
+    hll = HyperLogLog()
+    hll.add_hashes(hash_column(pd.Series(np.arange(200_000))))
+    assert abs(hll.count() - 200_000) < 200_000 * 3 * hll.relative_error()
+
+
+def test_distinct_count_falls_back_to_sketch():
+    profile = ColumnProfile("x", exact_limit=1_000)
+    profile.update(pd.Series(np.arange(50_000)))
+    assert profile.exact_hashes is None
+    assert profile.is_unique()
+    assert abs(profile.distinct_count() - 50_000) < 50_000 * 0.05
+
+
+def test_minhash_containment():
+    small, large = ColumnProfile("a", exact_limit=10), ColumnProfile("b", exact_limit=10)
+    small.update(pd.Series(np.arange(0, 5_000)))
+    large.update(pd.Series(np.arange(0, 20_000)))
+    assert small.contained_in(large) == 1.0
+    assert large.contained_in(small) == pytest.approx(0.25, abs=0.1)
+
+
+def test_date_types_without_format_warnings():
+    profile = ColumnProfile("x")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        profile.update(pd.Series(["Aspirin", "Ibuprofen", "Aspirin", "2024-01-05"]))
+        profile.update(pd.Series(["NaT", "2024-01-05", "2024-02-30", "note"]))
+    assert profile.type_counts["date"] == 2
+    assert profile.type_counts["string"] == 6
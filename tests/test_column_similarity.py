@@ -0,0 +1,40 @@
+import pandas as pd
+from column_profiler import ColumnProfile
+from column_similarity import SimilarColumnMatcher, normalize_column_name
+
+
+def profile_of(values):
+    profile = ColumnProfile("column")
+    profile.update(pd.Series(values))
+    return profile
+
+
+def find(columns):
+    matcher = SimilarColumnMatcher()
+    for key, values in columns.items():
+        matcher.add_column(key, key[1], profile_of(values))
+    return matcher.find()
+
+
+def test_synonyms_are_unified():
+    assert normalize_column_name(" Med Name ") == "drug name"
+    assert normalize_column_name("Phone No") == "contact number"
+
+
+def test_similar_names():
+    matches = find({("a", "Price"): [1.5, 2.5, 9.0], ("b", "Price ($)"): [3.0, 4.5]})
+    assert matches[("a", "Price")] == [(("b", "Price ($)"), 1.0)]
+
+
+def test_similar_values_with_related_names():
+    dates = ["01/02/2024", "03/04/2024", "05/06/2024", "07/08/2024"]
+    matches = find({("a", "Expiry Date"): dates, ("b", "Date"): dates})
+    assert matches[("a", "Expiry Date")] == [(("b", "Date"), 1.0)]
+
+
+def test_codes_with_unrelated_names_are_not_linked():
+    codes = [f"S{i:03}" for i in range(1, 21)]
+    matches = find({("a", "Supplier ID"): codes, ("b", "Sale ID"): codes})
+    assert matches == {}
+    numbers = list(range(1, 51))
+    assert find({("a", "Item ID"): numbers, ("b", "Customer Age"): numbers}) == {}
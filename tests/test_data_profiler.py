@@ -0,0 +1,40 @@
+import pandas as pd
+from Pattern_Mining_Agent import DataProfiler
+
+
+def profile_stock(tmp_path, streaming, **options):
+    raw = tmp_path / "Shop" / "Stock.csv"
+    raw.parent.mkdir(exist_ok=True)
+    quantity = [i % 17 for i in range(200)]
+    pd.DataFrame(
+        {"Quantity": quantity, "Price": [q * 2 + (q % 3) for q in quantity]}
+    ).to_csv(raw, index=False)
+    profiler = DataProfiler(output_dir=str(tmp_path / "out"), **options)
+    profiler.set_metadata(
+        pd.DataFrame(
+            {
+                "Source Name": "Shop",
+                "File Name": "Stock",
+                "Column Name": ["Quantity", "Price"],
+                "Data Type": ["int", "int"],
+            }
+        )
+    )
+    if streaming:
+        profiler.streaming_file_size = -1
+        profiler.stream_chunksize = 50
+    return profiler.process_file(str(raw))
+
+
+def test_correlation_method_option(tmp_path):
+    profiler = DataProfiler(output_dir=str(tmp_path), correlation_method="kendall")
+    assert profiler.correlation_finder.method == "kendall"
+    assert profiler.correlation_finder.sample_rows == 5_000
+    report = profile_stock(tmp_path, False, correlation_method="spearman")
+    assert len(report["correlations"]) == 1
+
+
+def test_streaming_logs_pearson_fallback(tmp_path, capsys):
+    report = profile_stock(tmp_path, True, correlation_method="spearman")
+    assert "Spearman correlations need the whole file" in capsys.readouterr().out
+    assert len(report["correlations"]) == 1
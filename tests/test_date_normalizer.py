@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from date_normalizer import (
+    leftover_cache_size,
+    normalize_dates,
+    parse_leftover,
+    parse_dates,
+    reads_day_first,
+)
+
+
+def test_dominant_format_reads_day_first():
+    values = pd.Series(["31-12-2025", "15-01-2026", "01-02-2026", None])
+    normalized, report = normalize_dates(values)
+    assert normalized.tolist()[:3] == ["12/31/2025", "01/15/2026", "02/01/2026"]
+    assert pd.isna(normalized[3])
+    assert report["rows"] == 3
+    assert report["unparsed_rows"] == 0
+
+
+def test_mixed_formats_and_unparsed_values():
+    values = pd.Series(["2025/12/31", "31-12-2025", "not a date", "2026/01/15"])
+    normalized, report = normalize_dates(values)
+    assert normalized.tolist() == [
+        "12/31/2025",
+        "12/31/2025",
+        "not a date",
+        "01/15/2026",
+    ]
+    assert report["unparsed_rows"] == 1
+    assert report["unparsed_examples"] == ["not a date"]
+
+
+def test_parse_dates_keeps_missing_values():
+    parsed, _ = parse_dates(pd.Series(["2025-01-02", np.nan]))
+    assert parsed[0] == pd.Timestamp("2025-01-02")
+    assert pd.isna(parsed[1])
+
+
+def test_leftover_cache_is_bounded():
+    parse_leftover.cache_clear()
+    for day in range(leftover_cache_size + 100):
+        parse_leftover(f"garbage {day}", False)
+    assert parse_leftover.cache_info().currsize == leftover_cache_size
+
+
+def test_reads_day_first_needs_day_and_month():
+    assert reads_day_first("%d-%m-%Y")
+    assert not reads_day_first("%m/%d/%Y")
+    assert not reads_day_first("%Y-%m")
+    assert not reads_day_first("%d %B %Y")
+    assert not reads_day_first(None)
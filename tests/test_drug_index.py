@@ -0,0 +1,36 @@
+import numpy as np
+from drug_index import TrigramIndex, name_trigrams
+
+
+def test_name_trigrams():
+    assert name_trigrams("Abc") == {" ab", "abc", "bc "}
+    assert name_trigrams("Vitamin-C") == name_trigrams("vitamin c")
+
+
+def test_candidates_rank_by_shared_trigrams():
+    names = ["Amoxicillin", "Ampicillin", "Ibuprofen", "Paracetamol"]
+    index = TrigramIndex.build(names)
+    assert list(index.candidates("amoxicilin", limit=1)) == [0]
+    assert set(index.candidates("ibuprofn", limit=2)) >= {2}
+
+
+def test_common_trigrams_are_skipped():
+    names = [
+        f"Drug{letter}{other}ine" for letter in "abcdefghij" for other in "klmnopqrst"
+    ]
+    index = TrigramIndex.build(names)
+    # "ine" is in every name: its postings are not scanned for a rarer name
+    candidates = index.candidates("Drugakine", limit=5)
+    assert names.index("Drugakine") in candidates
+    assert len(candidates) <= 5
+    # A name made of common trigrams only still gets candidates
+    assert len(index.candidates("ine", limit=5)) == 5
+
+
+def test_save_and_load(tmp_path):
+    names = ["Amoxicillin", "Ibuprofen"]
+    index_file = str(tmp_path / "index.npz")
+    TrigramIndex.build(names).save(index_file, "v1")
+    loaded = TrigramIndex.load(index_file, names, "v1")
+    assert np.array_equal(loaded.postings, TrigramIndex.build(names).postings)
+    assert list(loaded.candidates("ibuprofen", limit=1)) == [1]
@@ -0,0 +1,53 @@
+import importlib.util
+import pandas as pd
+import pytest
+from drug_matcher import DrugNameMatcher, normalize_drug_name
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("rapidfuzz") is None
+    and importlib.util.find_spec("fuzzywuzzy") is None,
+    reason="needs rapidfuzz or fuzzywuzzy",
+)
+
+drug_names = ["Amoxicillin", "Ibuprofen", "Paracetamol"]
+
+
+def test_normalize_drug_name():
+    assert normalize_drug_name(" Vitamin-C") == "vitamin c"
+
+
+def test_correct_keeps_missing_and_unmatched_names():
+    matcher = DrugNameMatcher(drug_names, workers=1)
+    corrected = matcher.correct(pd.Series(["amoxicilin", None, "Zzzz", "Ibuprofen"]))
+    assert corrected[0] == "Amoxicillin"
+    assert pd.isna(corrected[1])
+    assert corrected[2] == "Zzzz"
+    assert corrected[3] == "Ibuprofen"
+
+
+def test_cache_is_reused_and_merged(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    worker = DrugNameMatcher(drug_names, cache_file, workers=1)
+    worker.correct(pd.Series(["paracetamoll"]))
+    assert list(worker.new_matches) == ["paracetamoll"]
+
+    parent = DrugNameMatcher(drug_names, cache_file, workers=1)
+    parent.merge_matches(worker.new_matches)
+    parent.save()
+    reloaded = DrugNameMatcher(drug_names, cache_file, workers=1)
+    assert reloaded.matches["paracetamoll"][0] == "Paracetamol"
+    # A different drug list starts a new cache
+    assert DrugNameMatcher(drug_names[:2], cache_file, workers=1).matches == {}
+
+
+def test_rapidfuzz_scores_close_to_fuzzywuzzy():
+    pytest.importorskip("rapidfuzz")
+    fuzzywuzzy_process = pytest.importorskip("fuzzywuzzy.process")
+    from drug_matcher import rapidfuzz_best_matches
+
+    choices = drug_names + ["Amlodipine", "Atorvastatin", "Ibuprofen Lysine"]
+    names = ["amoxicilin", "IBUPROFEN 200mg", "para-cetamol", "atorvastatine"]
+    for name, (drug, score) in zip(names, rapidfuzz_best_matches(names, choices, 1)):
+        expected_drug, expected_score = fuzzywuzzy_process.extractOne(name, choices)
+        assert drug == expected_drug
+        assert abs(score - expected_score) <= 5
@@ -0,0 +1,87 @@
+import re
+import pandas as pd
+from entity_detection import EntityDetector
+
+
+class Entity:
+    def __init__(self, label, text):
+        self.label_ = label
+        self.text = text
+
+
+class Doc:
+    def __init__(self, ents):
+        self.ents = ents
+
+
+class StubModel:
+    """Tags capitalized word pairs as PERSON and "$<number>" as MONEY"""
+
+    def __init__(self):
+        self.texts = []
+
+    def pipe(self, texts, batch_size=None, n_process=1):
+        for text in texts:
+            self.texts.append(text)
+            ents = [Entity("PERSON", m) for m in re.findall(r"[A-Z]\w+ \w+", text)]
+            ents += [Entity("MONEY", m) for m in re.findall(r"\$\d+", text)]
+            yield Doc(ents)
+
+
+def detect(columns):
+    model = StubModel()
+    flags = EntityDetector(nlp=model).detect(
+        {name: pd.Series(values) for name, values in columns.items()}
+    )
+    return flags, model
+
+
+def test_person_names_and_addresses_are_not_measurements():
+    flags, _ = detect(
+        {
+            "Doctor": ["John M Smith", "Ann Lee"],
+            "Address": ["3 km north", "12 Main St"],
+        }
+    )
+    assert flags["Doctor"]["Measurement"] == "No"
+    assert flags["Address"]["Measurement"] == "No"
+
+
+def test_numbers_with_units_are_measurements():
+    flags, model = detect({"Dose": ["5 kg", "1,200m", "0.5 KG"]})
+    assert flags["Dose"]["Measurement"] == "Yes"
+    assert flags["Dose"]["Measurement Detected By"] == "regex"
+
+
+def test_currency_symbols_are_currency():
+    flags, _ = detect({"Total": ["$5.00", "$7.25"]})
+    assert flags["Total"]["Currency"] == "Yes"
+    assert flags["Total"]["Currency Detected By"] == "regex"
+
+
+def test_plain_numbers_settle_without_the_model():
+    flags, model = detect({"Quantity": ["5", "7", "nan"], "Code": ["C001", "C002"]})
+    assert flags["Quantity"] == {
+        "Currency": "No",
+        "Currency Detected By": "regex",
+        "Measurement": "No",
+        "Measurement Detected By": "regex",
+    }
+    assert flags["Code"]["Currency"] == "No"
+    assert model.texts == []
+
+
+def test_column_name_alone_does_not_set_a_flag():
+    # A currency/measurement name sends plain numbers on to the model,
+    # which finds no entity in them
+    flags, model = detect({"Unit Price": ["2.5", "3"], "Weight": ["70", "82"]})
+    assert flags["Unit Price"]["Currency"] == "No"
+    assert flags["Unit Price"]["Currency Detected By"] == "nlp"
+    assert flags["Weight"]["Measurement"] == "No"
+    assert flags["Weight"]["Measurement Detected By"] == "nlp"
+    assert "2.5" in model.texts
+
+
+def test_dtype_tier():
+    flags, _ = detect({"Active": [True, False]})
+    assert flags["Active"]["Currency Detected By"] == "dtype"
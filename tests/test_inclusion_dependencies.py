@@ -0,0 +1,54 @@
+from column_profiler import profile_file
+from inclusion_dependencies import InclusionDependencyFinder
+
+
+def profiles_of(tmp_path, name, text):
+    path = tmp_path / f"{name}.csv"
+    path.write_text(text)
+    return profile_file(str(path))
+
+
+def find(tmp_path, files):
+    finder = InclusionDependencyFinder()
+    for name, text in files.items():
+        finder.add_file("Source", name, profiles_of(tmp_path, name, text))
+    return finder.find()
+
+
+inventory = "Item ID,Product\n" + "".join(f"{i},P{i}\n" for i in range(1, 11))
+
+
+def test_nullable_integer_foreign_key(tmp_path):
+    prescriptions = "Prescription ID,Medication ID\n" + "".join(
+        f"{i},{'' if i == 4 else i % 7 + 1}\n" for i in range(1, 21)
+    )
+    dependencies = find(tmp_path, {"Inventory": inventory, "Prescriptions": prescriptions})
+    assert ("Source", "Inventory", "Item ID") in dependencies[
+        ("Source", "Prescriptions", "Medication ID")
+    ]
+
+
+def test_fractional_floats_are_not_keys(tmp_path):
+    prices = "Price\n" + "".join(f"{i}.5\n" for i in range(1, 11))
+    finder = InclusionDependencyFinder()
+    finder.add_file("Source", "Prices", profiles_of(tmp_path, "Prices", prices))
+    assert finder.columns == []
+
+
+def test_equal_sets_are_not_linked(tmp_path):
+    suppliers = "Supplier ID\n" + "".join(f"S{i:03}\n" for i in range(1, 9))
+    sales = "Sale ID,Amount\n" + "".join(f"S{i:03},{i * 3}\n" for i in range(1, 9))
+    dependencies = find(tmp_path, {"Supplier Information": suppliers, "Sales": sales})
+    assert ("Source", "Supplier Information", "Supplier ID") not in dependencies
+    assert ("Source", "Sales", "Sale ID") not in dependencies
+
+
+def test_duplicated_values_point_at_the_unique_column(tmp_path):
+    orders = "Order ID,Item ID\n" + "".join(
+        f"{1000 + i},{i % 10 + 1}\n" for i in range(1, 31)
+    )
+    dependencies = find(tmp_path, {"Inventory": inventory, "Orders": orders})
+    assert ("Source", "Inventory", "Item ID") in dependencies[
+        ("Source", "Orders", "Item ID")
+    ]
+    assert ("Source", "Inventory", "Item ID") not in dependencies
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+import repair_streaming
+from repair_pipeline import RepairPipeline
+from repair_streaming import SpillableHashSet, StreamingRepair
+
+columns = ["Item ID", "Batch", "Quantity", "Price", "Expiry Date", "Code"]
+
+
+def schema_master(primary_key):
+    return pd.DataFrame(
+        {
+            "Source Name": "Shop",
+            "File Name": "Stock",
+            "Column Name": columns,
+            "Data Type": ["int", "int", "int", "float", "date", "string"],
+            "Is Primary Key": ["Yes" if c in primary_key else "No" for c in columns],
+            "Is Unique": ["Yes" if c == "Code" else "No" for c in columns],
+        }
+    )
+
+
+def write_stock(path, rows):
+    rng = np.random.default_rng(7)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        rng.integers(0, 900, rows), "D"
+    )
+    expiry = np.where(
+        rng.random(rows) < 0.5, dates.strftime("%d-%m-%Y"), dates.strftime("%Y/%m/%d")
+    ).astype(object)
+    expiry[::97] = "unknown"
+    quantity = rng.integers(1, 60, rows)
+    quantity[::501] = 10_000
+    price = np.round(rng.lognormal(2, 1, rows), 6)
+    price[::13] = np.nan
+    pd.DataFrame(
+        {
+            "Item ID": rng.integers(1, rows // 2, rows),
+            "Batch": rng.integers(1, 4, rows),
+            "Quantity": quantity,
+            "Price": price,
+            "Expiry Date": expiry,
+            "Code": [f"C{i % (rows - 300)}" for i in range(rows)],
+        }
+    ).to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("primary_key", [["Item ID", "Batch"], []])
+def test_streaming_matches_in_memory(tmp_path, monkeypatch, primary_key):
+    raw = tmp_path / "Shop" / "Stock.csv"
+    raw.parent.mkdir()
+    # More distinct prices than a digest keeps exactly
+    write_stock(raw, 60_000)
+    # A small budget makes the quartile passes narrow their brackets
+    monkeypatch.setattr(repair_streaming, "quartile_value_budget", 500)
+
+    metadata_df = schema_master(primary_key)
+    in_memory = RepairPipeline(metadata_df, date_column_names=["Expiry Date"])
+    in_memory.repair_file(str(raw), str(tmp_path / "memory.csv"))
+    streaming = StreamingRepair(
+        RepairPipeline(metadata_df, date_column_names=["Expiry Date"]),
+        chunksize=7_000,
+        hash_memory_limit=2_000,
+    )
+    streaming.repair_file(str(raw), str(tmp_path / "streaming.csv"), None)
+
+    expected = (tmp_path / "memory.csv").read_bytes()
+    assert (tmp_path / "streaming.csv").read_bytes() == expected
+
+
+def test_duplicates_removed_on_primary_key_and_unique_columns():
+    pipeline = RepairPipeline(schema_master(["Item ID", "Batch"]))
+    file = {"file_name": "Stock", "column_types": {}}
+    assert pipeline.duplicate_subsets(columns, file) == [
+        (["Item ID", "Batch"], "primary key ['Item ID', 'Batch']"),
+        (["Code"], "column Code"),
+    ]
+    df = pd.DataFrame(
+        {
+            "Item ID": [1, 1, 2, 3],
+            "Batch": [1, 1, 1, 1],
+            "Code": ["C1", "C2", "C3", "C3"],
+        }
+    )
+    repaired = pipeline.remove_duplicates(df, file)
+    assert repaired["Item ID"].tolist() == [1, 2]
+
+
+def test_streaming_header_only_file(tmp_path):
+    raw = tmp_path / "Stock.csv"
+    raw.write_text(",".join(columns) + "\n")
+    pipeline = RepairPipeline(schema_master([]))
+    StreamingRepair(pipeline).repair_file(str(raw), str(tmp_path / "out.csv"), None)
+    assert (tmp_path / "out.csv").read_text() == ",".join(columns) + "\n"
+
+
+def test_spillable_hash_set(tmp_path):
+    hashes = SpillableHashSet(str(tmp_path), memory_limit=3)
+    first = hashes.add_new(np.array([5, 1, 5, 2], dtype=np.uint64))
+    second = hashes.add_new(np.array([2, 7, 1, 8, 9], dtype=np.uint64))
+    assert first.tolist() == [True, True, False, True]
+    assert second.tolist() == [False, True, False, True, True]
+    assert len(hashes.runs) == 2
+
+
+def test_quartile_passes_are_bounded(tmp_path, monkeypatch):
+    raw = tmp_path / "Stock.csv"
+    write_stock(raw, 60_000)
+    monkeypatch.setattr(repair_streaming, "quartile_passes", 1)
+    monkeypatch.setattr(repair_streaming, "quartile_value_budget", 10)
+    streaming = StreamingRepair(RepairPipeline(schema_master([])), chunksize=7_000)
+    with pytest.raises(RuntimeError, match="Quartiles"):
+        streaming.repair_file(str(raw), str(tmp_path / "out.csv"), None)
+    assert not (tmp_path / "out.csv").exists()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from column_profiler import hash_column
+from streaming_profile import CoMoments, DuplicateCounter, TDigest
+
+
+def test_tdigest_exact_while_values_are_few():
+    values = np.random.default_rng(1).integers(0, 500, 100_000).astype(float)
+    digest = TDigest(buffer_size=1_000)
+    for chunk in np.array_split(values, 7):
+        digest.update(chunk)
+    assert digest.exact
+    for q in (0.0, 0.25, 0.5, 0.75, 1.0):
+        assert digest.quantile(q) == pd.Series(values).quantile(q)
+
+
+def test_tdigest_estimate_and_merge():
+    values = np.random.default_rng(2).lognormal(0, 1, 200_000)
+    first, second = TDigest(buffer_size=5_000), TDigest(buffer_size=5_000)
+    first.update(values[:120_000])
+    second.update(values[120_000:])
+    first.merge(second)
+    assert not first.exact
+    assert first.min == values.min() and first.max == values.max()
+    for q in (0.01, 0.25, 0.75, 0.99):
+        # Error measured in ranks, as t-digest bounds it
+        rank = (values < first.quantile(q)).mean()
+        assert rank == pytest.approx(q, abs=0.005)
+
+
+def test_duplicate_counter_across_chunks_and_merge():
+    values = pd.Series([1, 2, 3, 2, 4, 5, 1, 1, 6, 7])
+    whole = DuplicateCounter()
+    whole.update(hash_column(values))
+    assert whole.duplicate_rows == int(values.duplicated(keep=False).sum())
+
+    chunked = DuplicateCounter()
+    for start in range(0, len(values), 3):
+        chunked.update(hash_column(values[start : start + 3]))
+    first, second = DuplicateCounter(), DuplicateCounter()
+    first.update(hash_column(values[:5]))
+    second.update(hash_column(values[5:]))
+    first.merge(second)
+    assert chunked.duplicate_rows == first.duplicate_rows == whole.duplicate_rows
+
+
+def test_comoments_match_pandas():
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame(rng.normal(size=(1_000, 3)), columns=["a", "b", "c"])
+    frame.loc[::7, "b"] = np.nan
+    moments = CoMoments(3)
+    for block in np.array_split(frame.to_numpy(), 4):
+        moments.update(block)
+    assert np.allclose(moments.correlation(), frame.corr().to_numpy())
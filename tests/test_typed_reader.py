@@ -0,0 +1,49 @@
+import pandas as pd
+from typed_reader import catalog_column_types, read_typed_csv
+
+column_types = catalog_column_types(
+    ["ID", "Price", "Sold", "Note"], ["int", "float", "date", "string"]
+)
+
+
+def write(path, rows):
+    pd.DataFrame(rows, columns=["ID", "Price", "Sold", "Note"]).to_csv(
+        path, index=False
+    )
+    return str(path)
+
+
+def test_reads_with_catalog_types(tmp_path):
+    path = write(tmp_path / "sales.csv", [[1, "2.5", "01/02/2024", "7"]])
+    df = read_typed_csv(path, column_types=column_types)
+    assert df.dtypes.to_dict() == {
+        "ID": "int64",
+        "Price": "float64",
+        "Sold": "object",
+        "Note": "object",
+    }
+    assert df.loc[0, "Note"] == "7"
+
+
+def test_null_spellings_in_typed_columns(tmp_path):
+    path = write(
+        tmp_path / "sales.csv",
+        [[1, "Null", "NaT", "Null"], [2, "NONE", "01/02/2024", "NONE"]],
+    )
+    df = read_typed_csv(path, column_types=column_types)
+    assert df["Price"].dtype == "float64"
+    assert df["Price"].isna().all()
+    assert pd.isna(df.loc[0, "Sold"])
+    # Text columns keep what pandas doesn't read as missing by itself
+    assert df["Note"].tolist() == ["Null", "NONE"]
+
+
+def test_value_that_no_longer_fits_falls_back_to_inference(tmp_path, capsys):
+    path = write(
+        tmp_path / "sales.csv",
+        [[1, "2.5", "01/02/2024", "a"], ["A-2", "n/a price", "01/03/2024", "b"]],
+    )
+    df = read_typed_csv(path, column_types=column_types)
+    assert df["ID"].tolist() == ["1", "A-2"]
+    assert df["Price"].tolist() == ["2.5", "n/a price"]
+    assert "retrying" in capsys.readouterr().out